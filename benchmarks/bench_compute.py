@@ -0,0 +1,145 @@
+"""Benchmark every stage of the configuration computation.
+
+Stages are measured separately: metamodel loading, each template group, yang templates, yang
+serialization and the whole YangController.compute_all. Templates reaching the workstation or the
+switches are disabled. Wall time comes from a first pass, allocations are traced on a second pass.
+
+Usage:
+    python -m benchmarks.generate_fabric fabric.yaml --sites 8 --leaves 16
+    python -m benchmarks.bench_compute fabric.yaml
+"""
+
+import json
+import time
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Self
+
+from pydantic_core import to_json
+
+from yang_srlab.compute.compute import YangController
+from yang_srlab.compute.container import ComputeContainer
+from yang_srlab.compute.template_scanner import get_func_from_group
+from yang_srlab.metamodel import get_model
+from yang_srlab.yang_model import model_from_kind
+
+from .common import scan_offline_templates, switch_groups
+
+
+@dataclass
+class StageResult:
+    """Measures of a stage, summed over every switch."""
+
+    name: str
+    seconds: float = 0.0
+    peak_bytes: int = 0
+    output_bytes: int = 0
+
+
+class StageRecorder:
+    """Record stage measures, in execution order."""
+
+    def __init__(self: Self, *, trace: bool) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            trace (bool): trace allocations instead of measuring wall time
+        """
+        self.trace = trace
+        self.results: dict[str, StageResult] = {}
+
+    @contextmanager
+    def stage(self: Self, name: str) -> Iterator[StageResult]:
+        """Measure a stage.
+
+        Args:
+            self (Self): self
+            name (str): stage name
+
+        Yields:
+            Iterator[StageResult]: stage measures
+        """
+        result = self.results.setdefault(name, StageResult(name))
+        if self.trace:
+            current, _peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            yield result
+            _current, peak = tracemalloc.get_traced_memory()
+            result.peak_bytes = max(result.peak_bytes, peak - current)
+            return
+        start = time.perf_counter()
+        yield result
+        result.seconds += time.perf_counter() - start
+
+
+def run_stages(configfile: str, recorder: StageRecorder) -> None:
+    """Run every stage once.
+
+    Args:
+        configfile (str): configuration file
+        recorder (StageRecorder): stage recorder
+    """
+    with recorder.stage("get_model"):
+        model = get_model(configfile)
+
+    for switch, groups in switch_groups(model):
+        sto = ComputeContainer(groups, switch)
+        for group in groups:
+            with recorder.stage(f"group {group}"):
+                for callback in get_func_from_group(group):
+                    callback(sto)
+        yang = model_from_kind(switch.kind.value)(sto.container)
+        with recorder.stage("yang templates"):
+            yang.run()
+        with recorder.stage("to_yang") as result:
+            config = yang.to_yang()
+        result.output_bytes += len(to_json(config))
+
+    with recorder.stage("compute_all") as result:
+        computed = YangController(model).compute_all([])
+    result.output_bytes = sum(len(to_json(config)) for _switch, config in computed)
+
+
+def parse_args() -> Namespace:
+    """Parse configuration.
+
+    Returns:
+        Namespace: parsed config.
+    """
+    args = ArgumentParser("compute benchmark")
+    args.add_argument("configfile", help="Configuration file")
+    args.add_argument("--json", action="store_true", default=False, help="Print results as JSON")
+    return args.parse_args()
+
+
+def main() -> None:
+    """Run benchmark."""
+    args = parse_args()
+    scan_offline_templates()
+
+    timed = StageRecorder(trace=False)
+    run_stages(args.configfile, timed)
+    traced = StageRecorder(trace=True)
+    tracemalloc.start()
+    run_stages(args.configfile, traced)
+    tracemalloc.stop()
+    for name, result in timed.results.items():
+        result.peak_bytes = traced.results[name].peak_bytes
+
+    if args.json:
+        print(json.dumps([asdict(result) for result in timed.results.values()], indent=2))  # noqa: T201
+        return
+    print(f"{'stage':<24} {'wall':>12} {'peak memory':>14} {'output':>14}")  # noqa: T201
+    for result in timed.results.values():
+        print(  # noqa: T201
+            f"{result.name:<24} {result.seconds * 1000:10.1f}ms {result.peak_bytes / 1024:12.1f}kB "
+            f"{result.output_bytes / 1024:12.1f}kB",
+        )
+
+
+if __name__ == "__main__":
+    main()
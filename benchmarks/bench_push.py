@@ -0,0 +1,186 @@
+"""Benchmark the push pipeline against simulated switches.
+
+Configurations are computed offline, then pushed to one simulated device per switch. A first round
+pushes onto empty devices, the next ones push again the same configurations, as a converged fabric
+does. Each phase of IdempotencyManager is timed, along with the switch and request throughput.
+
+Usage:
+    python -m benchmarks.generate_fabric fabric.yaml --sites 8 --leaves 16
+    python -m benchmarks.bench_push fabric.yaml --parallel 16 --latency 0.02 --rounds 3
+"""
+
+import json
+from argparse import ArgumentParser, Namespace
+from dataclasses import asdict, dataclass, field
+from ipaddress import IPv4Address
+from time import perf_counter
+from typing import TYPE_CHECKING, Self
+
+from rich.console import Console
+
+from yang_srlab.compute.compute import YangController
+from yang_srlab.idempotency import IdempotencyManager
+from yang_srlab.metamodel import Switch, get_model
+from yang_srlab.simulator import FaultProfile, Simulator
+from yang_srlab.yang import AsyncSRSession, srclients
+
+from .common import scan_offline_templates
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@dataclass
+class RoundResult:
+    """Measures of a push round."""
+
+    round: int
+    switches: int
+    phases: dict[str, float] = field(default_factory=dict)
+    seconds: float = 0.0
+    requests: int = 0
+    commits: int = 0
+
+    @property
+    def switches_per_second(self: Self) -> float:
+        """Get number of switches pushed per second.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            float: switch throughput
+        """
+        return self.switches / self.seconds if self.seconds else 0.0
+
+    @property
+    def requests_per_second(self: Self) -> float:
+        """Get number of HTTP requests per second.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            float: request throughput
+        """
+        return self.requests / self.seconds if self.seconds else 0.0
+
+
+def _sent_requests() -> int:
+    """Get number of requests sent by every switch client.
+
+    Returns:
+        int: number of requests
+    """
+    return sum(stats.requests for stats in srclients.stats().values())
+
+
+def push_round(index: int, computed: list[tuple[Switch, dict]], simulator: Simulator, args: Namespace) -> RoundResult:
+    """Push configurations once, timing each phase.
+
+    Args:
+        index (int): round number
+        computed (list[tuple[Switch, dict]]): switches and their configuration
+        simulator (Simulator): simulated devices
+        args (Namespace): benchmark configuration
+
+    Returns:
+        RoundResult: round measures
+    """
+    session = AsyncSRSession() if args.async_io else None
+    manager = IdempotencyManager(
+        computed,
+        Console(quiet=True),
+        with_commit=True,
+        parallel=args.parallel,
+        two_phase=args.two_phase,
+        delta=args.delta,
+        local_diff=args.local_diff,
+        session=session,
+    )
+    result = RoundResult(index, len(computed))
+    phases: list[tuple[str, Callable[[], object]]] = [
+        ("collect", manager.collect_running_config),
+        ("diff", manager.generate_diff),
+    ]
+    if args.two_phase:
+        phases.append(("two phase commit", manager.two_phase_commit))
+    else:
+        phases += [("validate", manager.valitate_config), ("commit", manager.commit_config)]
+
+    requests = _sent_requests()
+    commits = sum(device.commits for device in simulator.devices)
+    try:
+        for name, phase in phases:
+            start = perf_counter()
+            phase()
+            result.phases[name] = perf_counter() - start
+    finally:
+        manager.close()
+    result.seconds = sum(result.phases.values())
+    result.requests = _sent_requests() - requests + (session.requests if session is not None else 0)
+    result.commits = sum(device.commits for device in simulator.devices) - commits
+    return result
+
+
+def parse_args() -> Namespace:
+    """Parse configuration.
+
+    Returns:
+        Namespace: parsed config.
+    """
+    args = ArgumentParser("push benchmark")
+    args.add_argument("configfile", help="Configuration file")
+    args.add_argument("--rounds", type=int, default=2, help="Number of push rounds")
+    args.add_argument("--parallel", type=int, default=8, help="Number of switches processed concurrently")
+    args.add_argument("--two-phase", action="store_true", default=False, help="Use the two phase commit")
+    args.add_argument("--delta", action="store_true", default=False, help="Push changed paths only")
+    args.add_argument(
+        "--async",
+        dest="async_io",
+        action="store_true",
+        default=False,
+        help="Drive every switch from a single event loop",
+    )
+    args.add_argument("--local-diff", action="store_true", default=False, help="Skip unchanged switches")
+    args.add_argument("--latency", type=float, default=0.0, help="Added latency per request, in seconds")
+    args.add_argument("--jitter", type=float, default=0.0, help="Random latency added on top, in seconds")
+    args.add_argument("--error-rate", type=float, default=0.0, help="Probability of a query to fail")
+    args.add_argument("--commit-delay", type=float, default=0.0, help="Duration of a commit, in seconds")
+    args.add_argument("--seed", type=int, default=0, help="Seed of the fault injection")
+    args.add_argument("--json", action="store_true", default=False, help="Print results as JSON")
+    return args.parse_args()
+
+
+def main() -> None:
+    """Run benchmark."""
+    args = parse_args()
+    scan_offline_templates()
+    computed = YangController(get_model(args.configfile)).compute_all([])
+
+    faults = FaultProfile(args.latency, args.jitter, args.error_rate, args.commit_delay)
+    simulator = Simulator(len(computed), faults=faults, seed=args.seed)
+    simulator.start_in_thread()
+    for (switch, _config), port in zip(computed, simulator.ports, strict=True):
+        switch.address = IPv4Address("127.0.0.1")
+        switch.port = port
+    try:
+        results = [push_round(index + 1, computed, simulator, args) for index in range(args.rounds)]
+    finally:
+        srclients.close()
+        simulator.stop_thread()
+
+    if args.json:
+        print(json.dumps([asdict(result) for result in results], indent=2))  # noqa: T201
+        return
+    for result in results:
+        phases = ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in result.phases.items())
+        print(  # noqa: T201
+            f"round {result.round}: {result.switches} switches in {result.seconds:.3f}s "
+            f"({result.switches_per_second:.1f} switches/s, {result.requests} requests, "
+            f"{result.requests_per_second:.1f} requests/s, {result.commits} commits) - {phases}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark yang serialization of a leaf with thousands of subinterfaces.
+
+The previous serialization path (one dump per model, merge, then fix) is compared with the single pass
+serialization of SRLinuxYang. Wire measures add the JSON encoding done by the client when pushing.
+
+Usage:
+    python -m benchmarks.bench_to_yang config.yaml --subinterfaces 4000
+"""
+
+import json
+import time
+from argparse import ArgumentParser, Namespace
+from collections.abc import Callable
+
+from yang_srlab.compute.compute import LEAF_GROUPS
+from yang_srlab.compute.container import ComputeContainer
+from yang_srlab.compute.template_scanner import get_func_from_group
+from yang_srlab.metamodel import get_model
+from yang_srlab.yang_model.srlinux import SRLinuxYang, _fix_system
+
+from .common import scan_offline_templates
+
+FIRST_VLAN = 100
+MAX_VLAN = 4094
+
+
+def parse_args() -> Namespace:
+    """Parse configuration.
+
+    Returns:
+        Namespace: parsed config.
+    """
+    args = ArgumentParser("yang serialization benchmark")
+    args.add_argument("configfile", help="Configuration file")
+    args.add_argument("--subinterfaces", "-s", type=int, default=4000, help="Number of subinterfaces")
+    args.add_argument("--repeat", "-r", type=int, default=5, help="Number of measures, the best is kept")
+    return args.parse_args()
+
+
+def build_leaf(configfile: str, subinterfaces: int) -> SRLinuxYang:
+    """Compute the yang model of the first leaf, with additional subinterfaces.
+
+    Args:
+        configfile (str): configuration file
+        subinterfaces (int): number of subinterfaces added to the leaf
+
+    Returns:
+        SRLinuxYang: yang model of the leaf
+    """
+    model = get_model(configfile)
+    sto = ComputeContainer(LEAF_GROUPS, model.fabrics[0].lifs[0])
+    for group in LEAF_GROUPS:
+        for callback in get_func_from_group(group):
+            callback(sto)
+
+    vlan_count = MAX_VLAN - FIRST_VLAN
+    interfaces = list(sto.container.interfaces.interfaces.values())
+    for index in range(subinterfaces):
+        vlan_id = FIRST_VLAN + index % vlan_count
+        sto.container.router.vlans.setdefault(f"bench{vlan_id}", vlan_id)
+        interfaces[index // vlan_count].vlans.append(vlan_id)
+
+    yang = SRLinuxYang(sto.container)
+    yang.run()
+    return yang
+
+
+def legacy_to_yang(yang: SRLinuxYang) -> dict:
+    """Serialize the leaf with one dump per model.
+
+    Args:
+        yang (SRLinuxYang): yang model
+
+    Returns:
+        dict: yang document
+    """
+    options = {"mode": "json", "exclude_none": True, "exclude_unset": True, "by_alias": True}
+    data = {
+        **yang.vrfs.model_dump(**options),
+        **yang.tunnel.model_dump(**options),
+        **yang.interfaces.model_dump(**options),
+        **yang.routing_policy.model_dump(**options),
+        **yang.system.model_dump(**options),
+    }
+    _fix_system(data["srl_nokia-system:system"])
+    return data
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Measure best duration of a function.
+
+    Args:
+        func (Callable[[], object]): function to measure
+        repeat (int): number of measures
+
+    Returns:
+        float: best duration, in seconds
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main() -> None:
+    """Run benchmark."""
+    args = parse_args()
+    scan_offline_templates()
+    yang = build_leaf(args.configfile, args.subinterfaces)
+
+    if legacy_to_yang(yang) != yang.to_yang():
+        msg = "single pass serialization differs from the legacy path"
+        raise RuntimeError(msg)
+
+    results = {
+        "legacy dict": measure(lambda: legacy_to_yang(yang), args.repeat),
+        "single pass dict": measure(yang.to_yang, args.repeat),
+        "legacy wire": measure(lambda: json.dumps(legacy_to_yang(yang)).encode(), args.repeat),
+        "single pass wire": measure(lambda: json.dumps(yang.to_yang()).encode(), args.repeat),
+    }
+    print(f"{args.subinterfaces} subinterfaces, {len(json.dumps(yang.to_yang()))} bytes")  # noqa: T201
+    for name, duration in results.items():
+        print(f"{name:<20} {duration * 1000:10.2f}ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Helpers shared by the benchmarks."""
+
+from yang_srlab.compute.compute import DCI_GROUPS, LEAF_GROUPS, SPINE_GROUPS
+from yang_srlab.compute.template_scanner import get_func_from_group, scan
+from yang_srlab.metamodel import Metamodel, Switch
+from yang_srlab.yang_model import scan_yang, srlinux_templates
+
+# templates reading the workstation, they can not run offline.
+OFFLINE_SKIPPED = frozenset({"get_ssh_keys"})
+
+
+def scan_offline_templates() -> None:
+    """Register templates, without the ones reaching the workstation or the switches."""
+    scan("yang_srlab.templates")
+    scan_yang("yang_srlab.yang_templates")
+    for group in {*LEAF_GROUPS, *SPINE_GROUPS, *DCI_GROUPS}:
+        functions = get_func_from_group(group)
+        functions[:] = [func for func in functions if func.__name__ not in OFFLINE_SKIPPED]
+    srlinux_templates.functions = [func for func in srlinux_templates.functions if func.__name__ not in OFFLINE_SKIPPED]
+
+
+def switch_groups(model: Metamodel) -> list[tuple[Switch, list[str]]]:
+    """Get every switch with its template groups.
+
+    Args:
+        model (Metamodel): metamodel
+
+    Returns:
+        list[tuple[Switch, list[str]]]: switch and template groups
+    """
+    switches: list[tuple[Switch, list[str]]] = []
+    for fabric in model.fabrics:
+        switches += [(leaf, LEAF_GROUPS) for leaf in fabric.lifs]
+        switches += [(spine, SPINE_GROUPS) for spine in fabric.spines]
+    switches += [(dci, DCI_GROUPS) for dci in model.dci]
+    return switches
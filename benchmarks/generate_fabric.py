@@ -0,0 +1,240 @@
+"""Generate a synthetic metamodel.
+
+Every site is a fabric of spines and leafs, leaf pairs share LAG ports and every port carries the VLANs
+of a client template. The generated file respects the limits of the templates: 20 ports per switch,
+the two last spine ports and the leaf uplinks are reserved for the fabric links.
+
+Usage:
+    python -m benchmarks.generate_fabric fabric.yaml --sites 4 --leaves 16 --ports 8 --vlans 50
+    python -m benchmarks.generate_fabric inventory --sharded --sites 32
+"""
+
+import sys
+from argparse import ArgumentParser, Namespace
+from ipaddress import IPv4Network
+from pathlib import Path
+from typing import Self
+
+from ruamel.yaml import YAML
+
+from yang_srlab.ipam import MAX_DCI, SPINE_LOOPBACKS
+
+PORTS_PER_SWITCH = 20
+# spine ports used by DCI links.
+DCI_PORTS = 2
+FIRST_VLAN = 100
+MAX_VLAN = 4094
+
+
+class AddressAllocator:
+    """Allocate aligned subnets from a supernet, in order."""
+
+    def __init__(self: Self, supernet: IPv4Network) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            supernet (IPv4Network): network to allocate from
+        """
+        self._supernet = supernet
+        self._next = int(supernet.network_address)
+
+    def allocate(self: Self, addresses: int) -> IPv4Network:
+        """Allocate the smallest subnet holding a number of addresses.
+
+        Args:
+            self (Self): self
+            addresses (int): number of addresses
+
+        Returns:
+            IPv4Network: allocated subnet
+
+        Raises:
+            ValueError: the supernet is exhausted.
+        """
+        size = 1 << max(addresses - 1, 1).bit_length()
+        start = -(-self._next // size) * size
+        subnet = IPv4Network((start, 32 - size.bit_length() + 1))
+        if not subnet.subnet_of(self._supernet):
+            msg = f"{self._supernet} is exhausted"
+            raise ValueError(msg)
+        self._next = start + size
+        return subnet
+
+
+def parse_args() -> Namespace:
+    """Parse configuration.
+
+    Returns:
+        Namespace: parsed config.
+    """
+    args = ArgumentParser("synthetic fabric generator")
+    args.add_argument("output", type=Path, help="Generated configuration file, - for stdout")
+    args.add_argument("--sites", type=int, default=2, help="Number of fabrics")
+    args.add_argument("--spines", type=int, default=2, help="Number of spines per fabric")
+    args.add_argument("--leaves", type=int, default=4, help="Number of leafs per fabric")
+    args.add_argument("--ports", type=int, default=4, help="Number of single homed ports per leaf")
+    args.add_argument("--lags", type=int, default=2, help="Number of LAG ports per leaf pair")
+    args.add_argument("--clients", type=int, default=2, help="Number of clients")
+    args.add_argument("--vlans", type=int, default=4, help="Number of VLANs per client")
+    args.add_argument("--dci", type=int, default=2, help="Number of DCI switches")
+    args.add_argument(
+        "--sharded",
+        action="store_true",
+        default=False,
+        help="Write an inventory directory, one file per fabric, client and template",
+    )
+    return args.parse_args()
+
+
+def check_limits(args: Namespace) -> None:
+    """Check the fabric fits the templates.
+
+    Args:
+        args (Namespace): generator configuration
+
+    Raises:
+        ValueError: the fabric does not fit the templates.
+    """
+    checks = [
+        (args.dci <= MAX_DCI, f"at most {MAX_DCI} DCI are supported"),
+        (args.spines <= SPINE_LOOPBACKS, f"at most {SPINE_LOOPBACKS} spines are supported per fabric"),
+        (
+            args.leaves <= PORTS_PER_SWITCH - DCI_PORTS,
+            f"spines have {PORTS_PER_SWITCH - DCI_PORTS} ports for leafs",
+        ),
+        (
+            args.ports + args.lags <= PORTS_PER_SWITCH - args.spines,
+            f"leafs have {PORTS_PER_SWITCH - args.spines} ports for ports and LAGs",
+        ),
+        (
+            not args.dci or args.sites * args.spines <= PORTS_PER_SWITCH,
+            f"DCI switches have {PORTS_PER_SWITCH} ports for spines",
+        ),
+        (
+            args.clients * args.vlans <= MAX_VLAN - FIRST_VLAN,
+            f"at most {MAX_VLAN - FIRST_VLAN} VLANs are available",
+        ),
+        (args.clients > 0, "at least one client is required"),
+    ]
+    for valid, msg in checks:
+        if not valid:
+            raise ValueError(msg)
+
+
+def generate(args: Namespace) -> dict:
+    """Generate the metamodel.
+
+    Args:
+        args (Namespace): generator configuration
+
+    Returns:
+        dict: raw metamodel
+    """
+    check_limits(args)
+    management = IPv4Network("172.16.0.0/12").hosts()
+    fabric_pools = AddressAllocator(IPv4Network("10.0.0.0/8"))
+    client_subnets = AddressAllocator(IPv4Network("100.64.0.0/10"))
+
+    def _switch(name: str) -> dict:
+        return {"name": name, "address": str(next(management)), "kind": "srlinux"}
+
+    clients = {}
+    templates = []
+    for client_index in range(args.clients):
+        name = f"client{client_index + 1}"
+        networks = {}
+        for vlan_index in range(args.vlans):
+            vlan_id = FIRST_VLAN + client_index * args.vlans + vlan_index
+            subnet = client_subnets.allocate(256)
+            networks[f"{name}_lan{vlan_index + 1}"] = {"vlan_id": vlan_id, "subnet": f"{subnet[1]}/24"}
+        clients[name] = {"id": client_index + 1, "networks": networks}
+        templates.append({"name": f"{name}_esx", "type": "esx", "clients": [name]})
+
+    fabrics = []
+    for site_index in range(args.sites):
+        site = f"S{site_index + 1}"
+        leaf_ids = [(site_index + 1) * 1000 + leaf_index + 1 for leaf_index in range(args.leaves)]
+        ports = []
+        for leaf_index, leaf_id in enumerate(leaf_ids):
+            for port_index in range(args.ports):
+                template = templates[(leaf_index + port_index) % len(templates)]
+                ports.append({"sw": leaf_id, "if": port_index + 1, "tpl": template["name"], "desc": "server"})
+            if leaf_index % 2 == 1:
+                for lag_index in range(args.lags):
+                    template = templates[lag_index % len(templates)]
+                    ports.append(
+                        {
+                            "sw": [leaf_ids[leaf_index - 1], leaf_id],
+                            "if": args.ports + lag_index + 1,
+                            "tpl": template["name"],
+                            "desc": "lag",
+                        },
+                    )
+        fabrics.append(
+            {
+                "site": site,
+                "id": site_index + 1,
+                "pool": {
+                    "loopbacks": str(fabric_pools.allocate(SPINE_LOOPBACKS + args.leaves + 2)),
+                    "links": str(fabric_pools.allocate(2 * args.spines * args.leaves)),
+                    "dci": str(fabric_pools.allocate(2 * MAX_DCI * args.spines)),
+                },
+                "spines": [_switch(f"{site}-SP-{index + 1:02}") for index in range(args.spines)],
+                "lifs": [
+                    {"id": leaf_id, **_switch(f"{site}-LF-{index + 1:04}")} for index, leaf_id in enumerate(leaf_ids)
+                ],
+                "ports": ports,
+            },
+        )
+
+    return {
+        "default": {"username": "admin", "password": "NokiaSrl1!"},
+        "dci": [_switch(f"DCI-{index + 1:02}") for index in range(args.dci)],
+        "fabrics": fabrics,
+        "clients": clients,
+        "templates": templates,
+    }
+
+
+def write_inventory(yaml: YAML, model: dict, directory: Path) -> None:
+    """Write the metamodel as an inventory directory.
+
+    Args:
+        yaml (YAML): YAML dumper
+        model (dict): raw metamodel
+        directory (Path): inventory directory
+    """
+    shards: dict[Path, object] = {
+        directory / "default.yaml": model["default"],
+        directory / "dci.yaml": model["dci"],
+    }
+    for name, client in model["clients"].items():
+        shards[directory / "clients" / f"{name}.yaml"] = {name: client}
+    for template in model["templates"]:
+        shards[directory / "templates" / f"{template['name']}.yaml"] = [template]
+    for fabric in model["fabrics"]:
+        shards[directory / "fabrics" / f"{fabric['site']}.yaml"] = fabric
+    for path, content in shards.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w") as f:
+            yaml.dump(content, f)
+
+
+def main() -> None:
+    """Generate the configuration file."""
+    args = parse_args()
+    yaml = YAML(typ="safe")
+    yaml.default_flow_style = False
+    if args.sharded:
+        write_inventory(yaml, generate(args), args.output)
+        return
+    if str(args.output) == "-":
+        yaml.dump(generate(args), sys.stdout)
+        return
+    with args.output.open("w") as f:
+        yaml.dump(generate(args), f)
+
+
+if __name__ == "__main__":
+    main()
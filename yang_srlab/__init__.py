@@ -1,14 +1,23 @@
-"""Main package."""
+"""Main package.
+
+Only the standard library is imported with the package, dependencies and yang models are imported once
+the command line is parsed.
+"""
 
 from argparse import ArgumentParser, Namespace
+from collections.abc import Iterator
+from contextlib import contextmanager
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .startup import StartupProfile
 
-from rich.console import Console
+if TYPE_CHECKING:
+    from rich.console import Console
 
-from .compute.compute import YangController
-from .compute.template_scanner import scan
-from .idempotency import IdempotencyManager
-from .metamodel import get_model
-from .yang_model import scan_yang
+    from .idempotency import IdempotencyManager
+    from .metamodel import Metamodel
 
 
 def parse_args() -> Namespace:
@@ -19,33 +28,286 @@ def parse_args() -> Namespace:
     """
     args = ArgumentParser("srlab YANG config management")
     args.add_argument("configfile", help="Configuration file")
-    args.add_argument("--host", "-H", action="append", default=[])
+    args.add_argument(
+        "--host",
+        "-H",
+        action="append",
+        default=[],
+        help="Switch selector: name, glob pattern or terms like site=S1,role=leaf; may be repeated",
+    )
     args.add_argument("--no-dryrun", "-D", action="store_true", default=False)
     args.add_argument("--show-config", "-C", action="store_true", default=False)
+    args.add_argument(
+        "--parallel",
+        "-p",
+        type=int,
+        default=1,
+        help="Number of switches processed concurrently",
+    )
+    args.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes used to compute switch configuration",
+    )
+    args.add_argument(
+        "--two-phase",
+        action="store_true",
+        default=False,
+        help=(
+            "Prepare every switch concurrently, then commit them all only if every prepare succeeded; "
+            "--parallel workers, 16 if not set"
+        ),
+    )
+    args.add_argument(
+        "--delta",
+        action="store_true",
+        default=False,
+        help="Push update/delete commands on changed paths instead of replacing the whole configuration",
+    )
+    args.add_argument(
+        "--local-diff",
+        action="store_true",
+        default=False,
+        help="Diff running and target config locally, switches without change are skipped",
+    )
+    args.add_argument(
+        "--async",
+        dest="async_io",
+        action="store_true",
+        default=False,
+        help="Drive every switch from a single event loop over a pooled httpx client instead of --parallel threads",
+    )
+    args.add_argument(
+        "--host-connections",
+        type=int,
+        default=2,
+        help="Number of connections used at once toward a switch with --async",
+    )
+    args.add_argument(
+        "--http2",
+        action="store_true",
+        default=False,
+        help="Negotiate HTTP/2 with the switches with --async, the h2 package must be installed",
+    )
+    args.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Directory used to cache data between runs, caching is disabled if not set",
+    )
+    args.add_argument(
+        "--connection-stats",
+        action="store_true",
+        default=False,
+        help="Print connection reuse per switch",
+    )
+    args.add_argument(
+        "--startup-profile",
+        action="store_true",
+        default=False,
+        help="Print time spent in imports, template discovery and metamodel loading",
+    )
+    args.add_argument(
+        "--timings",
+        action="store_true",
+        default=False,
+        help="Record time spent in each template function and print the slowest ones",
+    )
+    args.add_argument(
+        "--timings-top",
+        type=int,
+        default=20,
+        metavar="TOP",
+        help="Number of template functions and switches reported by --timings",
+    )
+    args.add_argument(
+        "--timings-output",
+        type=Path,
+        default=Path("timings.json"),
+        help="JSON file receiving template timings when --timings is set",
+    )
+    args.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        help="JSONL file receiving a span per JSON-RPC call, latency percentiles are printed at the end",
+    )
+    args.add_argument(
+        "--rpc-timeout",
+        type=float,
+        default=30.0,
+        help="Timeout of a JSON-RPC call until the latency of the switch is known, in seconds",
+    )
+    args.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Number of retries of a get, diff or validate call that failed to reach the switch",
+    )
+    args.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Time allowed for the calls of the whole run, in seconds; unbounded if not set",
+    )
 
     return args.parse_args()
 
 
+def print_connection_stats(console: "Console") -> None:
+    """Print connection reuse of the switch clients.
+
+    Args:
+        console (Console): rich console object used for printing
+    """
+    from rich.table import Table
+
+    from .yang import srclients
+
+    table = Table(title="Connection reuse")
+    table.add_column("Host")
+    table.add_column("Requests", justify="right")
+    table.add_column("Connections", justify="right")
+    table.add_column("Reused", justify="right")
+    for host, stats in sorted(srclients.stats().items()):
+        table.add_row(host, str(stats.requests), str(stats.connections), str(stats.reused))
+    console.print(table)
+
+
+def load_model(args: Namespace) -> "Metamodel":
+    """Load the metamodel, only the entities of the selected switches if they are selected by name.
+
+    Args:
+        args (Namespace): parsed config
+
+    Returns:
+        Metamodel: metamodel
+    """
+    from .fleet import exact_names
+    from .metamodel import get_model
+    from .metamodel_cache import MetamodelCache
+
+    # only selectors made of exact names are known before loading the metamodel.
+    hosts = exact_names(args.host)
+    if args.cache_dir:
+        return MetamodelCache(args.cache_dir).load(args.configfile, hosts)
+    return get_model(args.configfile, hosts=hosts)
+
+
+@contextmanager
+def trace_calls(args: Namespace, console: "Console") -> Iterator[None]:
+    """Trace JSON-RPC calls if requested, from the compute step to the last push phase.
+
+    Args:
+        args (Namespace): parsed config
+        console (Console): rich console object used for printing
+
+    Yields:
+        Iterator[None]: traced context, the trace report is printed once it is left
+    """
+    from .tracing import tracer
+
+    if args.trace is not None:
+        tracer.open(args.trace)
+    try:
+        yield
+    finally:
+        tracer.close()
+    if args.trace is not None:
+        tracer.report(console)
+
+
+def run_manager(args: Namespace, manager: "IdempotencyManager", console: "Console") -> None:
+    """Push configuration, then print the connection report.
+
+    Args:
+        args (Namespace): parsed config
+        manager (IdempotencyManager): idempotency manager of the computed switches
+        console (Console): rich console object used for printing
+    """
+    from .yang import srclients
+
+    manager.run()
+    if args.connection_stats:
+        print_connection_stats(console)
+    srclients.close()
+
+
 def main() -> None:
     """Main entrypoint."""
-    console = Console()
     args = parse_args()
-    scan("yang_srlab.templates")
-    scan_yang("yang_srlab.yang_templates")
+    profile = StartupProfile()
+    with profile.phase("imports"):
+        from rich.console import Console
+
+        from .compute.cache import ComputeCache
+        from .compute.template_scanner import scan
+        from .fleet import FleetRegistry
+        from .manifest import TemplateManifest
+        from .running_cache import RunningConfigCache
+        from .timings import timings
+        from .yang_model import scan_yang
+
+    console = Console()
+    with profile.phase("template discovery"):
+        manifest = TemplateManifest(args.cache_dir / "templates.json") if args.cache_dir else None
+        scan("yang_srlab.templates", manifest)
+        scan_yang("yang_srlab.yang_templates", manifest)
+
+    with profile.phase("metamodel loading"):
+        model = load_model(args)
+    if args.startup_profile:
+        profile.report(console)
 
-    model = get_model(args.configfile)
+    from .compute.compute import YangController
 
     console.log("read metamodel", style="bold yellow")
-    controller = YangController(model)
+    controller = YangController(model, ComputeCache(args.cache_dir) if args.cache_dir else None)
     console.log("transform meta model into configuration", style="bold yellow")
-    computed_elements = controller.compute_all(args.host)
-    manager = IdempotencyManager(
-        computed_elements,
-        console,
-        with_config_print=args.show_config,
-        with_commit=args.no_dryrun,
-    )
-    manager.run()
+    timings.enabled = args.timings
+    try:
+        selected = [switch.name for switch in FleetRegistry(model).select(args.host)]
+    except ValueError as exc:
+        console.log(str(exc), style="red")
+        return
+    if args.host and not selected:
+        console.log(f"No switch matches {', '.join(args.host)}", style="red")
+        return
+    if args.async_io and args.http2 and find_spec("h2") is None:
+        console.log("--http2 needs the h2 package, install httpx[http2]", style="red")
+        return
+    from .resilience import RetryPolicy, rpc_guard
+
+    # the deadline bounds every call of the run, from the compute step on.
+    rpc_guard.policy = RetryPolicy(timeout=args.rpc_timeout, attempts=args.retries + 1)
+    rpc_guard.start(args.deadline)
+    with trace_calls(args, console):
+        computed_elements = controller.compute_all(selected, workers=args.jobs)
+        if args.timings:
+            timings.report(console, args.timings_top)
+            timings.write(args.timings_output, args.timings_top)
+
+        from .idempotency import IdempotencyManager
+        from .yang import AsyncSRSession
+
+        session = (
+            AsyncSRSession(max_connections_per_host=args.host_connections, http2=args.http2) if args.async_io else None
+        )
+        manager = IdempotencyManager(
+            computed_elements,
+            console,
+            with_config_print=args.show_config,
+            with_commit=args.no_dryrun,
+            parallel=args.parallel,
+            two_phase=args.two_phase,
+            delta=args.delta,
+            local_diff=args.local_diff,
+            running_cache=RunningConfigCache(args.cache_dir) if args.cache_dir else None,
+            session=session,
+        )
+        run_manager(args, manager, console)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,236 @@
+"""Report the switches affected by a configuration change.
+
+Two revisions of the configuration are loaded and, for every switch, the metamodel entities read by
+its templates are compared. A switch is affected only if one of those inputs changed, its desired
+configuration is then rendered again by the next run. The YANG subtrees written from each changed
+input are reported along with it.
+
+Revisions are configuration files, inventory directories or ``REV:PATH`` git objects, for example::
+
+    ysrblast HEAD:config.yaml config.yaml
+    ysrblast HEAD~1:inventory inventory
+"""
+
+import io
+import json
+import subprocess
+import tarfile
+import tempfile
+from argparse import ArgumentParser, Namespace
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from .compute.fingerprint import switch_inputs
+from .fleet import FleetRegistry
+from .metamodel import Metamodel, get_model
+
+# YANG subtrees written from each input, see the templates reading them.
+INPUT_SUBTREES: dict[str, tuple[str, ...]] = {
+    "switch": ("system", "interface", "network-instance"),
+    "fabric": ("system", "interface", "network-instance"),
+    "dci": ("interface", "network-instance"),
+    "dci_fabrics": ("interface", "network-instance"),
+    "ssh_keys": ("system",),
+}
+# subtrees written from the template and client networks of a port.
+PORT_SERVICE_SUBTREES = ("network-instance", "tunnel-interface")
+
+
+@dataclass
+class SwitchImpact:
+    """Changes of a switch between two revisions."""
+
+    switch: str
+    status: str = "changed"
+    inputs: list[str] = field(default_factory=list)
+    subtrees: list[str] = field(default_factory=list)
+
+
+def _port_interface(port_inputs: dict) -> str:
+    """Get interface configured from a port.
+
+    Args:
+        port_inputs (dict): port inputs
+
+    Returns:
+        str: interface path
+    """
+    switch1, switch2 = port_inputs["switch_str"]
+    iface = port_inputs["iface"]
+    name = f"ethernet-1/{iface}" if switch1 == switch2 else f"lag{iface}"
+    return f"interface[name={name}]"
+
+
+def _ports_impact(old_ports: dict, new_ports: dict, impact: SwitchImpact) -> None:
+    """Compare ports of a leaf.
+
+    Args:
+        old_ports (dict): port inputs of the old revision, indexed by interface number
+        new_ports (dict): port inputs of the new revision, indexed by interface number
+        impact (SwitchImpact): switch changes to complete
+    """
+    subtrees: set[str] = set()
+    for iface in sorted(old_ports.keys() | new_ports.keys(), key=int):
+        old, new = old_ports.get(iface), new_ports.get(iface)
+        if old == new:
+            continue
+        impact.inputs.append(f"ports/{iface}")
+        subtrees.update(_port_interface(port) for port in (old, new) if port is not None)
+        if old is None or new is None or (old["template"], old["clients"]) != (new["template"], new["clients"]):
+            subtrees.update(PORT_SERVICE_SUBTREES)
+    impact.subtrees += sorted(subtrees - set(impact.subtrees))
+
+
+def compare_switch(name: str, old_inputs: dict | None, new_inputs: dict | None) -> SwitchImpact | None:
+    """Compare inputs of a switch.
+
+    Args:
+        name (str): switch name
+        old_inputs (dict | None): inputs of the old revision, None if the switch is added
+        new_inputs (dict | None): inputs of the new revision, None if the switch is removed
+
+    Returns:
+        SwitchImpact | None: switch changes, None if the switch is not affected
+    """
+    if old_inputs is None or new_inputs is None:
+        return SwitchImpact(name, "added" if old_inputs is None else "removed")
+    impact = SwitchImpact(name)
+    subtrees: set[str] = set()
+    for part in sorted(old_inputs.keys() | new_inputs.keys()):
+        if part == "ports" or old_inputs.get(part) == new_inputs.get(part):
+            continue
+        impact.inputs.append(part)
+        subtrees.update(INPUT_SUBTREES.get(part, ()))
+    impact.subtrees = sorted(subtrees)
+    _ports_impact(old_inputs.get("ports", {}), new_inputs.get("ports", {}), impact)
+    return impact if impact.inputs else None
+
+
+def blast_radius(old: Metamodel, new: Metamodel) -> list[SwitchImpact]:
+    """Get switches affected between two metamodels.
+
+    Args:
+        old (Metamodel): old revision
+        new (Metamodel): new revision
+
+    Returns:
+        list[SwitchImpact]: affected switches, in the order of the new revision then removed ones
+    """
+    old_fleet, new_fleet = FleetRegistry(old), FleetRegistry(new)
+    names = [switch.name for switch in new_fleet]
+    names += [switch.name for switch in old_fleet if switch.name not in new_fleet]
+    impacts = []
+    for name in names:
+        old_inputs = switch_inputs(old_fleet[name]) if name in old_fleet else None
+        new_inputs = switch_inputs(new_fleet[name]) if name in new_fleet else None
+        impact = compare_switch(name, old_inputs, new_inputs)
+        if impact is not None:
+            impacts.append(impact)
+    return impacts
+
+
+def _git(*args: str) -> bytes:
+    """Run a git command.
+
+    Args:
+        *args (str): git arguments
+
+    Returns:
+        bytes: standard output
+
+    Raises:
+        ValueError: git failed, the message holds its error output.
+    """
+    try:
+        result = subprocess.run(["git", *args], capture_output=True, check=False)  # noqa: S603, S607
+    except FileNotFoundError as exc:
+        msg = "git is not installed"
+        raise ValueError(msg) from exc
+    if result.returncode != 0:
+        msg = f"git {' '.join(args)}: {result.stderr.decode().strip()}"
+        raise ValueError(msg)
+    return result.stdout
+
+
+def load_revision(revision: str) -> Metamodel:
+    """Load metamodel of a revision.
+
+    Git trees are extracted into a temporary inventory directory.
+
+    Args:
+        revision (str): configuration file, inventory directory or ``REV:PATH`` git object
+
+    Returns:
+        Metamodel: metamodel
+
+    Raises:
+        ValueError: the git object can not be read or is neither a file nor a directory.
+    """
+    if Path(revision).exists():
+        return get_model(revision)
+    kind = _git("cat-file", "-t", revision).decode().strip()
+    if kind == "tree":
+        with tempfile.TemporaryDirectory() as directory:
+            with tarfile.open(fileobj=io.BytesIO(_git("archive", "--format=tar", revision))) as archive:
+                archive.extractall(directory, filter="data")
+            return get_model(directory)
+    if kind != "blob":
+        msg = f"{revision} is a git {kind}, expected a configuration file or an inventory directory"
+        raise ValueError(msg)
+    with tempfile.NamedTemporaryFile(suffix=".yaml") as f:
+        f.write(_git("cat-file", "blob", revision))
+        f.flush()
+        return get_model(f.name)
+
+
+def parse_args() -> Namespace:
+    """Parse configuration.
+
+    Returns:
+        Namespace: parsed config.
+    """
+    args = ArgumentParser("configuration change blast radius")
+    args.add_argument("old", help="Old revision: configuration file, inventory directory or REV:PATH")
+    args.add_argument("new", help="New revision: configuration file, inventory directory or REV:PATH")
+    args.add_argument("--json", action="store_true", default=False, help="Print affected switches as JSON")
+    args.add_argument(
+        "--selectors",
+        action="store_true",
+        default=False,
+        help="Print ysrcli --host options selecting the affected switches",
+    )
+    return args.parse_args()
+
+
+def main() -> None:
+    """Main entrypoint."""
+    args = parse_args()
+    try:
+        old, new = load_revision(args.old), load_revision(args.new)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    impacts = blast_radius(old, new)
+    if args.json:
+        print(json.dumps([asdict(impact) for impact in impacts], indent=2))  # noqa: T201
+        return
+    if args.selectors:
+        print(" ".join(f"-H {impact.switch}" for impact in impacts if impact.status != "removed"))  # noqa: T201
+        return
+
+    console = Console()
+    table = Table(title="Blast radius")
+    table.add_column("Switch")
+    table.add_column("Status")
+    table.add_column("Changed inputs")
+    table.add_column("YANG subtrees")
+    for impact in impacts:
+        table.add_row(impact.switch, impact.status, "\n".join(impact.inputs), "\n".join(impact.subtrees))
+    console.print(table)
+    console.log(f"{len(impacts)}/{len(FleetRegistry(new))} switch(s) affected", style="cyan")
+
+
+if __name__ == "__main__":
+    main()
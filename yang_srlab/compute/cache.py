@@ -0,0 +1,88 @@
+"""Cache computed configuration of the switches between runs.
+
+A switch configuration is reused as long as the metamodel entities read by its templates and the code
+producing it are unchanged.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Self
+
+from yang_srlab.metamodel import Switch
+
+from .fingerprint import code_hash, fingerprint, switch_inputs
+
+
+class ComputeCache:
+    """Store computed configuration of the switches, indexed by the fingerprint of their inputs."""
+
+    def __init__(self: Self, directory: Path) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            directory (Path): cache directory
+        """
+        self._directory = directory / "compute"
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._code_hash = code_hash()
+
+    def _path(self: Self, switch: Switch) -> Path:
+        """Get cache file of a switch.
+
+        Args:
+            self (Self): self
+            switch (Switch): switch
+
+        Returns:
+            Path: cache file
+        """
+        return self._directory / f"{re.sub(r'[^\w.-]', '_', switch.name)}.json"
+
+    def fingerprint(self: Self, switch: Switch) -> str:
+        """Get fingerprint of a switch.
+
+        Args:
+            self (Self): self
+            switch (Switch): switch
+
+        Returns:
+            str: fingerprint of the switch inputs
+        """
+        return fingerprint(switch_inputs(switch), self._code_hash)
+
+    def get(self: Self, switch: Switch, switch_fingerprint: str) -> dict | None:
+        """Get cached configuration.
+
+        Args:
+            self (Self): self
+            switch (Switch): switch
+            switch_fingerprint (str): current fingerprint of the switch
+
+        Returns:
+            dict | None: configuration, None if not cached or outdated
+        """
+        path = self._path(switch)
+        if not path.exists():
+            return None
+        with path.open() as f:
+            entry = json.load(f)
+        if entry.get("fingerprint") != switch_fingerprint:
+            return None
+        return entry["config"]
+
+    def set(self: Self, switch: Switch, switch_fingerprint: str, config: dict) -> None:
+        """Store configuration.
+
+        Args:
+            self (Self): self
+            switch (Switch): switch
+            switch_fingerprint (str): fingerprint of the switch
+            config (dict): computed configuration
+        """
+        path = self._path(switch)
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("w") as f:
+            json.dump({"fingerprint": switch_fingerprint, "config": config}, f)
+        tmp_path.replace(path)
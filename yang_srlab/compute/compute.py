@@ -1,75 +1,217 @@
 """Make conputation to transform meta model into Yang represantation."""
 
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from typing import Self
 
 from yang_srlab.metamodel import Metamodel, Switch
+from yang_srlab.timings import TemplateTiming, timings
+from yang_srlab.yang_model import srlinux_templates
 
+from .cache import ComputeCache
 from .container import ComputeContainer
+from .template_scanner import scan, scanned_packages
+
+LEAF_GROUPS = ["common_all", "common", "leaf"]
+SPINE_GROUPS = ["common_all", "common", "spine"]
+DCI_GROUPS = ["common_all", "dci"]
+
+# switch location inside the metamodel: fabric index (None for DCI), switch list name and index.
+type SwitchLocation = tuple[int | None, str, int]
+
+_worker_model: Metamodel | None = None
+
+
+def _locate_switch(model: Metamodel, location: SwitchLocation) -> Switch:
+    """Find a switch inside the metamodel.
+
+    Args:
+        model (Metamodel): metamodel
+        location (SwitchLocation): switch location
+
+    Returns:
+        Switch: switch
+    """
+    fabric_index, switch_list, switch_index = location
+    if fabric_index is None:
+        return model.dci[switch_index]
+    return getattr(model.fabrics[fabric_index], switch_list)[switch_index]
+
+
+def _init_worker(
+    model: Metamodel,
+    template_packages: list[str],
+    yang_packages: list[str],
+    *,
+    with_timings: bool,
+) -> None:
+    """Initialize a compute worker process.
+
+    Template registries are module globals, they are populated again in the worker.
+
+    Args:
+        model (Metamodel): metamodel
+        template_packages (list[str]): packages scanned for metamodel templates
+        yang_packages (list[str]): packages scanned for yang templates
+        with_timings (bool): record template timings
+    """
+    global _worker_model  # noqa: PLW0603
+    _worker_model = model
+    timings.enabled = with_timings
+    for package in template_packages:
+        scan(package)
+    for package in yang_packages:
+        srlinux_templates.scan(package)
+
+
+def _compute_in_worker(location: SwitchLocation, groups: list[str]) -> tuple[dict, list[TemplateTiming]]:
+    """Compute configuration of a switch inside a worker process.
+
+    Args:
+        location (SwitchLocation): switch location
+        groups (list[str]): template groups
+
+    Returns:
+        tuple[dict, list[TemplateTiming]]: yang configuration and template timings recorded by the worker
+    """
+    if _worker_model is None:
+        msg = "compute worker is not initialized"
+        raise RuntimeError(msg)
+    container = ComputeContainer(groups, _locate_switch(_worker_model, location))
+    container.run()
+    return container.to_yang(), timings.collect()
 
 
 class YangController:
     """Define yang controller that in charge of generating the corresponding yang config."""
 
-    def __init__(self: Self, model: Metamodel) -> None:
+    def __init__(self: Self, model: Metamodel, cache: ComputeCache | None = None) -> None:
         """Constructor.
 
         Args:
             self (Self): self
             model (Metamodel): base metamodel.
+            cache (ComputeCache | None, optional): cache of computed configurations. Defaults to None.
         """
         self._model: Metamodel = model
+        self._cache = cache
 
-    def _compute_switches(
+    def _select_switches(
         self,
         switches: Sequence[Switch],
-        allowed_switch: list[str],
+        allowed_switch: Collection[str],
         switch_category: list[str],
-    ) -> list[tuple[Switch, dict]]:
-        """Compute configuration for a list of switches based on their category.
+        fabric_index: int | None,
+        switch_list: str,
+    ) -> list[tuple[Switch, list[str], SwitchLocation]]:
+        """Select switches to compute.
 
         Args:
             switches (Sequence[Switch]): list of switches (e.g., leafs or spines).
-            allowed_switch (list[str]): list of allowed switch names; if empty, all are allowed.
+            allowed_switch (Collection[str]): allowed switch names; if empty, all are allowed.
             switch_category (str): type/category of the switch ("leaf" or "spine").
+            fabric_index (int | None): index of the fabric, None for DCI switches.
+            switch_list (str): name of the switch list inside the fabric or metamodel.
 
         Returns:
-            list[tuple[Switch, dict]]: computed configuration for the switches.
+            list[tuple[Switch, list[str], SwitchLocation]]: switch, template groups and location.
         """
-        computed = []
-        for switch in switches:
+        selected = []
+        for switch_index, switch in enumerate(switches):
             # Only compute for allowed switches (if the allowed_switch list is not empty)
             if allowed_switch and switch.name not in allowed_switch:
                 continue
-            container = ComputeContainer(switch_category, switch)
-            container.run()
-            computed.append((switch, container.to_yang()))
-        return computed
+            selected.append((switch, switch_category, (fabric_index, switch_list, switch_index)))
+        return selected
+
+    def _jobs(self, allowed_switch: Collection[str]) -> list[tuple[Switch, list[str], SwitchLocation]]:
+        """Get every switch to compute, in output order.
+
+        Args:
+            allowed_switch (Collection[str]): allowed switch names; empty means all switches.
 
-    def compute_all(self, allowed_switch: list[str]) -> list[tuple[Switch, dict]]:
+        Returns:
+            list[tuple[Switch, list[str], SwitchLocation]]: switch, template groups and location.
+        """
+        allowed_switch = frozenset(allowed_switch)
+        jobs = []
+        for fabric_index, site in enumerate(self._model.fabrics):
+            jobs += self._select_switches(site.lifs, allowed_switch, LEAF_GROUPS, fabric_index, "lifs")
+            jobs += self._select_switches(site.spines, allowed_switch, SPINE_GROUPS, fabric_index, "spines")
+        jobs += self._select_switches(self._model.dci, allowed_switch, DCI_GROUPS, None, "dci")
+        return jobs
+
+    def _compute(
+        self,
+        jobs: list[tuple[Switch, list[str], SwitchLocation]],
+        workers: int,
+    ) -> list[dict]:
+        """Run the templates of switches.
+
+        Args:
+            jobs (list[tuple[Switch, list[str], SwitchLocation]]): switch, template groups and location.
+            workers (int): number of worker processes, switches are computed in the current process if
+                lower than 2.
+
+        Returns:
+            list[dict]: computed configurations, in jobs order.
+        """
+        if workers < 2 or len(jobs) < 2:  # noqa: PLR2004
+            configs = []
+            for switch, groups, _location in jobs:
+                container = ComputeContainer(groups, switch)
+                container.run()
+                configs.append(container.to_yang())
+            return configs
+
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)),
+            initializer=partial(_init_worker, with_timings=timings.enabled),
+            initargs=(self._model, scanned_packages(), srlinux_templates.packages),
+        ) as executor:
+            results = list(
+                executor.map(
+                    _compute_in_worker,
+                    [location for _switch, _groups, location in jobs],
+                    [groups for _switch, groups, _location in jobs],
+                ),
+            )
+        configs = []
+        for config, records in results:
+            configs.append(config)
+            timings.records += records
+        return configs
+
+    def compute_all(self, allowed_switch: Collection[str], workers: int = 1) -> list[tuple[Switch, dict]]:
         """Generate yang configuration for all sites and switches.
 
+        Switches with a cached configuration matching their inputs are not computed again.
+
         Args:
-            allowed_switch (list[str]): list of allowed switch names; empty list means all switches.
+            allowed_switch (Collection[str]): allowed switch names; empty means all switches.
+            workers (int, optional): number of worker processes, switches are computed in the
+                current process if lower than 2. Defaults to 1.
 
         Returns:
             list[tuple[Switch, dict]]: computed configurations.
         """
-        computed_switches = []
-        for site in self._model.fabrics:
-            computed_switches += self._compute_switches(
-                site.lifs,
-                allowed_switch,
-                ["common_all", "common", "leaf"],
-            )
-            computed_switches += self._compute_switches(
-                site.spines,
-                allowed_switch,
-                ["common_all", "common", "spine"],
-            )
-        computed_switches += self._compute_switches(
-            self._model.dci,
-            allowed_switch,
-            ["common_all", "dci"],
-        )
-        return computed_switches
+        jobs = self._jobs(allowed_switch)
+        if self._cache is None:
+            return list(zip((switch for switch, _groups, _location in jobs), self._compute(jobs, workers), strict=True))
+
+        configs: dict[str, dict] = {}
+        fingerprints: dict[str, str] = {}
+        missing = []
+        for switch, groups, location in jobs:
+            fingerprints[switch.name] = self._cache.fingerprint(switch)
+            cached = self._cache.get(switch, fingerprints[switch.name])
+            if cached is None:
+                missing.append((switch, groups, location))
+            else:
+                configs[switch.name] = cached
+
+        for (switch, _groups, _location), config in zip(missing, self._compute(missing, workers), strict=True):
+            self._cache.set(switch, fingerprints[switch.name], config)
+            configs[switch.name] = config
+        return [(switch, configs[switch.name]) for switch, _groups, _location in jobs]
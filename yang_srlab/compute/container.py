@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Self
 
 from yang_srlab.dataclass import SwitchContainer
 from yang_srlab.metamodel import Switch
+from yang_srlab.timings import timings
 from yang_srlab.yang_model import model_from_kind
 
 if TYPE_CHECKING:
@@ -21,14 +22,10 @@ class ComputeContainer:
             groups (list[str]): list of template groups
             switch (Switch): switch to manage.
         """
-        from .template_scanner import get_func_from_group
-
         self._switch = switch
         self._container = SwitchContainer()
-        self._callbacks: list[Callable[[ComputeContainer], None]] = []
+        self._groups = groups
         self._model = model_from_kind(switch.kind.value)(self._container)
-        for group in groups:
-            self._callbacks += get_func_from_group(group)
 
     def run(self: Self) -> None:
         """Run templating callback stack against switch.
@@ -36,9 +33,14 @@ class ComputeContainer:
         Args:
             self (Self): self.
         """
-        for callback in self._callbacks:
-            callback(self)
-        self._model.run()
+        from .template_scanner import get_func_from_group
+
+        callbacks: list[Callable[[ComputeContainer], None]] = []
+        for group in self._groups:
+            callbacks += get_func_from_group(group)
+        with timings.switch(self._switch.name):
+            timings.run(callbacks, self)
+            self._model.run()
 
     def to_yang(self: Self) -> dict:
         """Get yang model."""
@@ -0,0 +1,133 @@
+"""Describe the metamodel inputs read by the templates of a switch.
+
+The inputs are split by entity, a change on an entity only changes the fingerprint of the switches
+reading it:
+* ``switch``: the switch itself and its role
+* ``fabric``: fabric identity, pools and switch lists, for leafs and spines
+* ``ports``: ports of a leaf, with their templates and client networks
+* ``dci``: DCI switch list
+* ``dci_fabrics``: pools and spines of every fabric, for DCI switches
+* ``ssh_keys``: public keys pushed on every switch
+"""
+
+import hashlib
+import json
+import pathlib
+from contextlib import suppress
+from importlib.metadata import PackageNotFoundError, version
+
+from yang_srlab.metamodel import Port, Switch
+from yang_srlab.topology import SwitchRole
+
+# package modules and directories producing the configuration, the push, tracing or CLI modules are not hashed.
+CODE_SOURCES = (
+    "compute",
+    "dataclass",
+    "templates",
+    "yang_model",
+    "yang_templates",
+    "ipam.py",
+    "metamodel.py",
+    "topology.py",
+)
+
+
+def _ssh_keys() -> list[str]:
+    """Get public keys read by the ``common_all`` templates.
+
+    Returns:
+        list[str]: public keys
+    """
+    ssh_base = pathlib.Path.home() / ".ssh"
+    if not ssh_base.is_dir():
+        return []
+    return [file.read_text() for file in sorted(ssh_base.iterdir()) if file.name.endswith(".pub")]
+
+
+def _port_inputs(port: Port) -> dict:
+    """Get inputs of a port.
+
+    Args:
+        port (Port): port
+
+    Returns:
+        dict: port with its template and client networks
+    """
+    return {
+        **port.model_dump(mode="json"),
+        "template": port.template.model_dump(mode="json"),
+        "clients": [client.model_dump(mode="json") for client in port.template.clients],
+    }
+
+
+def switch_inputs(switch: Switch) -> dict[str, object]:
+    """Get metamodel entities read by the templates of a switch.
+
+    Args:
+        switch (Switch): switch
+
+    Returns:
+        dict[str, object]: JSON serializable inputs, indexed by entity
+    """
+    position = switch.position
+    inputs: dict[str, object] = {
+        "switch": {**switch.model_dump(mode="json"), "role": position.role.value, "index": position.index},
+        "dci": [dci.name for dci in switch.config.dci],
+        "ssh_keys": _ssh_keys(),
+    }
+    if position.role == SwitchRole.dci:
+        inputs["dci_fabrics"] = [
+            {"pool": fabric.pool.model_dump(mode="json"), "spines": [spine.name for spine in fabric.spines]}
+            for fabric in switch.config.fabrics
+        ]
+        return inputs
+
+    fabric = switch.fabric
+    inputs["fabric"] = {
+        "id": fabric.id,
+        "site": fabric.site,
+        "pool": fabric.pool.model_dump(mode="json"),
+        "spines": [spine.name for spine in fabric.spines],
+        "lifs": [leaf.name for leaf in fabric.lifs],
+    }
+    if position.role == SwitchRole.leaf:
+        inputs["ports"] = {str(iface): _port_inputs(port) for iface, port in sorted(switch.ports.items())}
+    return inputs
+
+
+def code_hash() -> str:
+    """Get hash of the code producing the configuration.
+
+    Every module of CODE_SOURCES is hashed, along with the version of the yang models.
+
+    Returns:
+        str: hash
+    """
+    digest = hashlib.sha256()
+    package_dir = pathlib.Path(__file__).parent.parent
+    sources = [
+        source
+        for name in CODE_SOURCES
+        for source in ([package_dir / name] if name.endswith(".py") else (package_dir / name).rglob("*.py"))
+    ]
+    for source in sorted(sources):
+        digest.update(str(source.relative_to(package_dir)).encode())
+        digest.update(source.read_bytes())
+    with suppress(PackageNotFoundError):
+        digest.update(version("pydantic-srlinux").encode())
+    return digest.hexdigest()
+
+
+def fingerprint(inputs: dict[str, object], code: str) -> str:
+    """Get fingerprint of switch inputs.
+
+    Args:
+        inputs (dict[str, object]): switch inputs
+        code (str): hash of the code
+
+    Returns:
+        str: fingerprint
+    """
+    digest = hashlib.sha256(code.encode())
+    digest.update(json.dumps(inputs, sort_keys=True).encode())
+    return digest.hexdigest()
@@ -4,9 +4,14 @@ import importlib
 import pkgutil
 from collections.abc import Callable
 
+from yang_srlab.manifest import TemplateManifest, function_ref, resolve_ref
+
 from .container import ComputeContainer
 
 _template_functions: dict[str, list[Callable[[ComputeContainer], None]]] = {}
+# function references read from the manifest, imported on first use of their group.
+_lazy_functions: dict[str, list[str]] = {}
+_scanned_packages: list[str] = []
 
 
 def template_group(
@@ -36,18 +41,53 @@ def get_func_from_group(group: str) -> list[Callable[[ComputeContainer], None]]:
     Returns:
         list[Callable[[ComputeContainer], None]]: list of groups.
     """
+    refs = _lazy_functions.pop(group, None)
+    if refs is not None:
+        functions = [resolve_ref(ref) for ref in refs]
+        # importing the modules registered their functions again through the decorator.
+        registered = [func for func in _template_functions.get(group, []) if function_ref(func) not in refs]
+        _template_functions[group] = registered + functions
     return _template_functions.get(group, [])
 
 
-def scan(package_name: str) -> None:
+def scan(package_name: str, manifest: TemplateManifest | None = None) -> None:
     """Scan modules for decorator.
 
     Args:
         package_name (str): package to scan
+        manifest (TemplateManifest | None, optional): manifest of template packages, modules are not
+            imported if the package is up to date in the manifest. Defaults to None.
     """
+    if package_name not in _scanned_packages:
+        _scanned_packages.append(package_name)
+    functions = manifest.get(package_name) if manifest is not None else None
+    if functions is not None:
+        for group, refs in functions.items():
+            _lazy_functions.setdefault(group, []).extend(refs)
+        return
+
+    registered = {group: len(funcs) for group, funcs in _template_functions.items()}
     package = importlib.import_module(package_name)
     for _loader, module_name, _is_pkg in pkgutil.walk_packages(
         package.__path__,
         package.__name__ + ".",
     ):
         importlib.import_module(module_name)
+    if manifest is not None:
+        manifest.set(
+            package_name,
+            {
+                group: [function_ref(func) for func in funcs[registered.get(group, 0) :]]
+                for group, funcs in _template_functions.items()
+                if len(funcs) > registered.get(group, 0)
+            },
+        )
+
+
+def scanned_packages() -> list[str]:
+    """Get packages already scanned for templates.
+
+    Returns:
+        list[str]: package names, in scan order.
+    """
+    return list(_scanned_packages)
@@ -0,0 +1,448 @@
+"""Compute structural diff between running and target configuration.
+
+The diff is done locally, without calling the switch, and produces a change set:
+* ``add`` for containers, list entries and leaves missing on the switch
+* ``modify`` for leaves with a different value
+* ``replace`` for leaf-lists, unkeyed lists and nodes that changed of type
+* ``delete`` for containers, list entries and leaves that are no more in the target configuration
+
+YANG list entries are matched by key, not by position, and module prefixes are ignored.
+
+Only the top level containers of the target configuration are managed, as with the replace on ``/``
+of a merged configuration, other top level containers are left untouched.
+
+The change set can be pushed as is, commit time and bandwidth then depend on the change size instead
+of the configuration size.
+"""
+
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from json import dumps
+from typing import Self
+
+_MODULE_PREFIX = re.compile(r"^srl_nokia-[\w-]+:")
+_PREDICATE = re.compile(r"\[[^\]]*\]")
+
+# keys of the srlinux YANG lists, indexed by list name, prefixed by its parents when the name is ambiguous.
+_LIST_KEYS: dict[str, tuple[str, ...]] = {
+    # interfaces and tunnel interfaces
+    "interface": ("name",),
+    "subinterface": ("index",),
+    "address": ("ip-prefix",),
+    "arp/neighbor": ("ipv4-address",),
+    "neighbor-discovery/neighbor": ("ipv6-address",),
+    "tunnel-interface": ("name",),
+    "vxlan-interface": ("index",),
+    # network instances
+    "network-instance": ("name",),
+    "bgp/group": ("group-name",),
+    "bgp/neighbor": ("peer-address",),
+    "afi-safi": ("afi-safi-name",),
+    "bgp-instance": ("id",),
+    "ethernet-segment": ("name",),
+    "ospf/instance": ("name",),
+    "area": ("area-id",),
+    "area/interface": ("interface-name",),
+    "isis/instance": ("name",),
+    "isis/instance/interface": ("interface-name",),
+    "level": ("level-number",),
+    "static-routes/route": ("prefix",),
+    "aggregate-routes/route": ("prefix",),
+    "next-hop-groups/group": ("name",),
+    "next-hop": ("index",),
+    # routing policies
+    "policy": ("name",),
+    "statement": ("name",),
+    "prefix-set": ("name",),
+    "prefix-set/prefix": ("ip-prefix", "mask-length-range"),
+    "community-set": ("name",),
+    "as-path-set": ("name",),
+    "tag-set": ("name",),
+    # acl
+    "acl-filter": ("name", "type"),
+    "entry": ("sequence-id",),
+    # system
+    "grpc-server": ("name",),
+    "ssh-server": ("name",),
+    "netconf-server": ("name",),
+    "server-group": ("name",),
+    "server-group/server": ("address",),
+    "ntp/server": ("address",),
+    "user": ("username",),
+    "role": ("rolename",),
+    "remote-server": ("host",),
+    "subsystem": ("subsystem-name",),
+    "facility": ("facility-name",),
+    "server-profile": ("name",),
+    "access-group": ("name",),
+    "trap-group": ("name",),
+}
+# longest parent prefix used in _LIST_KEYS.
+_LIST_KEY_DEPTH = max(name.count("/") + 1 for name in _LIST_KEYS)
+
+# leaves used as key of lists missing from _LIST_KEYS, by order of preference.
+_LIST_KEY_CANDIDATES = (
+    "name",
+    "index",
+    "id",
+    "interface-name",
+    "area-id",
+    "peer-address",
+    "group-name",
+    "afi-safi-name",
+    "ip-prefix",
+    "sequence-id",
+    "ethernet-interface",
+)
+
+
+def strip_prefix(name: str) -> str:
+    """Strip YANG module prefix from a node name or an identity value.
+
+    Args:
+        name (str): node name, ``srl_nokia-interfaces:interface`` for example.
+
+    Returns:
+        str: name without module prefix.
+    """
+    return _MODULE_PREFIX.sub("", name)
+
+
+def _normalize_keys(node: dict) -> dict[str, tuple[str, object]]:
+    """Index a container by its node names without module prefix.
+
+    Args:
+        node (dict): container
+
+    Returns:
+        dict[str, tuple[str, object]]: original name and value indexed by name without prefix.
+    """
+    return {strip_prefix(key): (key, value) for key, value in node.items()}
+
+
+def _normalize_scalar(value: object) -> str:
+    """Get comparable representation of a leaf value.
+
+    Leaves are not always encoded with the same type by the switch and by the models, ``uint64`` are
+    strings on the switch side for example.
+
+    Args:
+        value (object): leaf value
+
+    Returns:
+        str: comparable value
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return strip_prefix(value)
+    return str(value)
+
+
+def _list_keys(path: str, entries: list[dict]) -> tuple[str, ...]:
+    """Get keys of a YANG list.
+
+    Keys declared in _LIST_KEYS are used if every entry holds them, the first candidate leaf held by
+    every entry is used otherwise.
+
+    Args:
+        path (str): path of the list, without module prefix
+        entries (list[dict]): entries of the list, from both configurations
+
+    Returns:
+        tuple[str, ...]: key leaves, empty if no key can be found
+    """
+    normalized = [_normalize_keys(entry) for entry in entries]
+    segments = _PREDICATE.sub("", path).strip("/").split("/")
+    for depth in range(min(len(segments), _LIST_KEY_DEPTH), 0, -1):
+        keys = _LIST_KEYS.get("/".join(segments[-depth:]))
+        if keys is not None and all(key in entry for entry in normalized for key in keys):
+            return keys
+    for candidate in _LIST_KEY_CANDIDATES:
+        if all(candidate in entry for entry in normalized):
+            return (candidate,)
+    return ()
+
+
+def _entry_key(entry: dict, keys: tuple[str, ...]) -> tuple[str, ...]:
+    """Get key of a list entry.
+
+    Args:
+        entry (dict): list entry
+        keys (tuple[str, ...]): key leaves
+
+    Returns:
+        tuple[str, ...]: comparable key values
+    """
+    normalized = _normalize_keys(entry)
+    return tuple(_normalize_scalar(normalized[key][1]) if key in normalized else "" for key in keys)
+
+
+def _entry_path(path: str, entry: dict, keys: tuple[str, ...]) -> str:
+    """Get path of a list entry.
+
+    Args:
+        path (str): path of the list
+        entry (dict): list entry
+        keys (tuple[str, ...]): key leaves
+
+    Returns:
+        str: path of the entry, ``/interface[name=ethernet-1/3]`` for example
+    """
+    values = _entry_key(entry, keys)
+    return path + "".join(f"[{key}={value}]" for key, value in zip(keys, values, strict=True))
+
+
+def _is_entry_list(value: object) -> bool:
+    """Check if a value is a YANG list, as opposed to a leaf-list.
+
+    Args:
+        value (object): value to check
+
+    Returns:
+        bool: true if the value is a list of entries
+    """
+    return isinstance(value, list) and any(isinstance(entry, dict) for entry in value)
+
+
+class ChangeKind(Enum):
+    """Describe kind of change."""
+
+    add = "add"
+    modify = "modify"
+    replace = "replace"
+    delete = "delete"
+
+
+_CHANGE_ACTIONS = {
+    ChangeKind.add: "update",
+    ChangeKind.modify: "update",
+    ChangeKind.replace: "replace",
+    ChangeKind.delete: "delete",
+}
+
+_CHANGE_SYMBOLS = {
+    ChangeKind.add: "+",
+    ChangeKind.modify: "~",
+    ChangeKind.replace: "~",
+    ChangeKind.delete: "-",
+}
+
+
+@dataclass
+class Change:
+    """Change on a single path."""
+
+    kind: ChangeKind
+    path: str
+    running: object = None
+    target: object = None
+
+    def to_command(self: Self) -> dict:
+        """Get JSON-RPC command applying the change.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            dict: command
+        """
+        command: dict = {"action": _CHANGE_ACTIONS[self.kind], "path": self.path}
+        if self.kind != ChangeKind.delete:
+            command["value"] = self.target
+        return command
+
+    def __str__(self: Self) -> str:
+        """Get user readable change.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            str: change
+        """
+        symbol = _CHANGE_SYMBOLS[self.kind]
+        if self.kind == ChangeKind.delete:
+            return f"{symbol} {self.path}"
+        if isinstance(self.target, dict | list):
+            return f"{symbol} {self.path} {dumps(self.target)}"
+        if self.kind == ChangeKind.add:
+            return f"{symbol} {self.path} = {self.target}"
+        return f"{symbol} {self.path} : {self.running} -> {self.target}"
+
+
+@dataclass
+class ChangeSet:
+    """Set of changes bringing a running configuration to its target."""
+
+    changes: list[Change] = field(default_factory=list)
+
+    def __bool__(self: Self) -> bool:
+        """Check if there is something to change.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            bool: true if the change set is not empty
+        """
+        return bool(self.changes)
+
+    def __len__(self: Self) -> int:
+        """Get number of changes.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            int: number of changes
+        """
+        return len(self.changes)
+
+    def add(self: Self, kind: ChangeKind, path: str, running: object = None, target: object = None) -> None:
+        """Record a change.
+
+        Args:
+            self (Self): self
+            kind (ChangeKind): kind of change
+            path (str): changed path
+            running (object, optional): running value. Defaults to None.
+            target (object, optional): target value. Defaults to None.
+        """
+        self.changes.append(Change(kind, path, running, target))
+
+    def to_commands(self: Self) -> list[dict]:
+        """Get JSON-RPC commands applying the change set.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            list[dict]: commands
+        """
+        return [change.to_command() for change in self.changes]
+
+    def __str__(self: Self) -> str:
+        """Get user readable change set, one change per line.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            str: change set
+        """
+        return "\n".join(str(change) for change in self.changes)
+
+
+def _diff_list(path: str, running: list, target: list, changes: ChangeSet) -> None:
+    """Compute changes of a YANG list.
+
+    Args:
+        path (str): path of the list
+        running (list): running list entries
+        target (list): target list entries
+        changes (ChangeSet): change set to complete
+    """
+    keys = _list_keys(path, running + target)
+    if not keys:
+        # without key, entries can not be matched, the whole list is replaced.
+        if running != target:
+            changes.add(ChangeKind.replace, path, running, target)
+        return
+
+    running_entries = {_entry_key(entry, keys): entry for entry in running}
+    target_keys: set[tuple[str, ...]] = set()
+    for entry in target:
+        entry_key = _entry_key(entry, keys)
+        target_keys.add(entry_key)
+        entry_path = _entry_path(path, entry, keys)
+        if entry_key in running_entries:
+            _diff_node(entry_path, running_entries[entry_key], entry, changes)
+        else:
+            changes.add(ChangeKind.add, entry_path, target=entry)
+    for entry_key, entry in running_entries.items():
+        if entry_key not in target_keys:
+            changes.add(ChangeKind.delete, _entry_path(path, entry, keys), running=entry)
+
+
+def _diff_container(path: str, running: dict, target: dict, changes: ChangeSet) -> None:
+    """Compute changes of a YANG container or list entry.
+
+    Args:
+        path (str): path of the container
+        running (dict): running container
+        target (dict): target container
+        changes (ChangeSet): change set to complete
+    """
+    running_children = _normalize_keys(running)
+    target_children = _normalize_keys(target)
+    for name, (_key, value) in target_children.items():
+        child_path = f"{path.rstrip('/')}/{name}"
+        if name not in running_children:
+            changes.add(ChangeKind.add, child_path, target=value)
+            continue
+        _diff_node(child_path, running_children[name][1], value, changes)
+    for name, (_key, value) in running_children.items():
+        if name not in target_children:
+            changes.add(ChangeKind.delete, f"{path.rstrip('/')}/{name}", running=value)
+
+
+def _diff_node(path: str, running: object, target: object, changes: ChangeSet) -> None:
+    """Compute changes of any YANG node.
+
+    Args:
+        path (str): path of the node
+        running (object): running value
+        target (object): target value
+        changes (ChangeSet): change set to complete
+    """
+    if isinstance(running, dict) and isinstance(target, dict):
+        _diff_container(path, running, target, changes)
+    elif _is_entry_list(running) or _is_entry_list(target):
+        if isinstance(running, list) and isinstance(target, list):
+            _diff_list(path, running, target, changes)
+        else:
+            changes.add(ChangeKind.replace, path, running, target)
+    elif isinstance(target, list):
+        running_values = [_normalize_scalar(value) for value in running] if isinstance(running, list) else None
+        if running_values != [_normalize_scalar(value) for value in target]:
+            changes.add(ChangeKind.replace, path, running, target)
+    elif isinstance(running, dict | list) or isinstance(target, dict):
+        changes.add(ChangeKind.replace, path, running, target)
+    elif _normalize_scalar(running) != _normalize_scalar(target):
+        changes.add(ChangeKind.modify, path, running, target)
+
+
+def diff_config(running: dict, target: dict) -> ChangeSet:
+    """Compute changes bringing running configuration to the target configuration.
+
+    Args:
+        running (dict): running configuration, as collected on ``/``
+        target (dict): target configuration, as generated by the yang model
+
+    Returns:
+        ChangeSet: changes, empty if there is nothing to change.
+    """
+    changes = ChangeSet()
+    running_children = _normalize_keys(running)
+    for name, (_key, value) in _normalize_keys(target).items():
+        path = f"/{name}"
+        if name in running_children:
+            _diff_node(path, running_children[name][1], value, changes)
+        else:
+            changes.add(ChangeKind.add, path, target=value)
+    return changes
+
+
+def compute_commands(running: dict, target: dict) -> list[dict]:
+    """Compute commands bringing running configuration to the target configuration.
+
+    Args:
+        running (dict): running configuration, as collected on ``/``
+        target (dict): target configuration, as generated by the yang model
+
+    Returns:
+        list[dict]: JSON-RPC commands, empty if there is nothing to change.
+    """
+    return diff_config(running, target).to_commands()
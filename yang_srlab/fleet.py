@@ -0,0 +1,182 @@
+"""Select switches of the fleet.
+
+Switches are indexed by name, management address, site, role and LAG pairing once the metamodel is
+loaded. A selector is a comma separated list of terms, every term must match:
+
+* ``S1-LF-0001`` or ``S1-LF-*``: switch name or glob pattern
+* ``name=...``, ``address=...``, ``site=...``, ``role=...``: indexed attribute, values may be glob
+  patterns, ``role`` is ``leaf``, ``spine`` or ``dci``
+* ``lag=...``: switches sharing a LAG with the matching leafs, those leafs included
+
+Several selectors select the union of their switches, for example ``site=S1,role=spine`` and
+``DCI-*``.
+"""
+
+from collections.abc import Iterable, Iterator
+from fnmatch import fnmatchcase
+from typing import Self
+
+from .metamodel import Metamodel, Switch
+from .topology import SwitchRole
+
+GLOB_CHARS = frozenset("*?[")
+SELECTOR_KEYS = ("name", "address", "site", "role", "lag")
+
+
+def exact_names(selectors: Iterable[str]) -> list[str] | None:
+    """Get switch names of selectors made of exact names only.
+
+    Such selectors can be resolved without loading the whole metamodel.
+
+    Args:
+        selectors (Iterable[str]): selectors
+
+    Returns:
+        list[str] | None: switch names, None if a selector is not an exact name
+    """
+    names = []
+    for selector in selectors:
+        for term in selector.split(","):
+            if "=" in term or not GLOB_CHARS.isdisjoint(term):
+                return None
+            names.append(term.strip())
+    return names
+
+
+class FleetRegistry:
+    """Switches of the metamodel, indexed by selectable attribute."""
+
+    def __init__(self: Self, model: Metamodel) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            model (Metamodel): metamodel
+        """
+        self._switches: dict[str, Switch] = {}
+        self._indexes: dict[str, dict[str, set[str]]] = {key: {} for key in SELECTOR_KEYS}
+
+        def _add(switch: Switch, site: str, role: SwitchRole) -> None:
+            self._switches[switch.name] = switch
+            for key, value in (("name", switch.name), ("address", str(switch.address)), ("site", site)):
+                self._indexes[key].setdefault(value, set()).add(switch.name)
+            self._indexes["role"].setdefault(role.value, set()).add(switch.name)
+
+        for fabric in model.fabrics:
+            for leaf in fabric.lifs:
+                _add(leaf, fabric.site, SwitchRole.leaf)
+            for spine in fabric.spines:
+                _add(spine, fabric.site, SwitchRole.spine)
+            for port in fabric.ports:
+                switch1, switch2 = port.switch
+                if switch1 is not switch2:
+                    self._indexes["lag"].setdefault(switch1.name, {switch1.name}).add(switch2.name)
+                    self._indexes["lag"].setdefault(switch2.name, {switch2.name}).add(switch1.name)
+        for dci in model.dci:
+            _add(dci, "", SwitchRole.dci)
+
+    def __len__(self: Self) -> int:
+        """Get number of switches.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            int: number of switches
+        """
+        return len(self._switches)
+
+    def __iter__(self: Self) -> Iterator[Switch]:
+        """Iterate over switches, in metamodel order.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            Iterator[Switch]: switches
+        """
+        return iter(self._switches.values())
+
+    def __contains__(self: Self, name: object) -> bool:
+        """Check if a switch is part of the fleet.
+
+        Args:
+            self (Self): self
+            name (object): switch name
+
+        Returns:
+            bool: true if the switch is indexed
+        """
+        return name in self._switches
+
+    def __getitem__(self: Self, name: str) -> Switch:
+        """Get switch by name.
+
+        Args:
+            self (Self): self
+            name (str): switch name
+
+        Returns:
+            Switch: switch
+        """
+        return self._switches[name]
+
+    def _match(self: Self, key: str, pattern: str) -> set[str]:
+        """Get switches whose indexed attribute matches a pattern.
+
+        Args:
+            self (Self): self
+            key (str): indexed attribute
+            pattern (str): value or glob pattern
+
+        Returns:
+            set[str]: switch names
+
+        Raises:
+            ValueError: the attribute is not indexed.
+        """
+        if key not in self._indexes:
+            msg = f"unknown selector key {key}, expected one of {', '.join(SELECTOR_KEYS)}"
+            raise ValueError(msg)
+        index = self._indexes[key]
+        if GLOB_CHARS.isdisjoint(pattern):
+            return set(index.get(pattern, ()))
+        matched: set[str] = set()
+        for value, names in index.items():
+            if fnmatchcase(value, pattern):
+                matched |= names
+        return matched
+
+    def resolve(self: Self, selector: str) -> set[str]:
+        """Get switches matching every term of a selector.
+
+        Args:
+            self (Self): self
+            selector (str): selector
+
+        Returns:
+            set[str]: switch names
+        """
+        selected: set[str] | None = None
+        for term in selector.split(","):
+            key, sep, pattern = term.strip().partition("=")
+            matched = self._match(key.strip(), pattern.strip()) if sep else self._match("name", key)
+            selected = matched if selected is None else selected & matched
+            if not selected:
+                break
+        return selected or set()
+
+    def select(self: Self, selectors: Iterable[str]) -> list[Switch]:
+        """Get switches matching any selector.
+
+        Args:
+            self (Self): self
+            selectors (Iterable[str]): selectors
+
+        Returns:
+            list[Switch]: switches, in metamodel order
+        """
+        selected: set[str] = set()
+        for selector in selectors:
+            selected |= self.resolve(selector)
+        return [switch for name, switch in self._switches.items() if name in selected]
@@ -7,75 +7,171 @@ This module provides :
 * push configuration
 """
 
+import asyncio
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from json import dumps
-from typing import Self
+from time import perf_counter
+from typing import Self, TypeVar
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.syntax import Syntax
 
+from .delta import ChangeSet, diff_config, strip_prefix
 from .metamodel import Switch
-from .yang import SRClient
-
-
-def _cleanup_candidate_config(diff: str) -> str:
-    return (
-        diff.replace("srl_nokia-interfaces-ip-dhcp:", "")
-        .replace("srl_nokia-interfaces:", "")
-        .replace("srl_nokia-network-instance:", "")
-        .replace("srl_nokia-linux:", "")
-        .replace("srl_nokia-ospf:", "")
-        .replace("srl_nokia-bgp:", "")
-        .replace("srl_nokia-tunnel-interfaces:", "")
-        .replace("srl_nokia-interfaces-vlans:", "")
-        .replace("srl_nokia-bgp-evpn:", "")
-        .replace("srl_nokia-routing-policy:", "")
-        .replace("srl_nokia-system-network-instance:", "")
-        .replace("srl_nokia-aaa:", "")
-        .replace("srl_nokia-ssh:", "")
-        .replace("srl_nokia-snmp:", "")
-        .replace("srl_nokia-logging:", "")
-        .replace("srl_nokia-tls:", "")
-        .replace("srl_nokia-system-banner:", "")
-        .replace("srl_nokia-json-rpc:", "")
-        .replace("srl_nokia-netconf-server:", "")
-        .replace("srl_nokia-system-network-instance-bgp-evpn-ethernet-segments:", "")
-        .replace("srl_nokia-dns:", "")
-        .replace("srl_nokia-grpc:", "")
-        .replace("srl_nokia-system:", "")
-        .replace("srl_nokia-acl:", "")
-        .replace("srl_nokia-openconfig:", "")
-        .replace("srl_nokia-system-network-instance-bgp-vpn:", "")
-    )
+from .resilience import SRClientError
+from .running_cache import RunningConfigCache, RunningSnapshot
+from .tracing import tracer
+from .yang import AsyncSRClient, AsyncSRSession, SRClient, srclients
+from .yang_model.namespaces import strip_module_prefixes
+
+T = TypeVar("T")
+
+# concurrent switches of a two-phase phase when the parallel setting is not set.
+PHASE_WORKERS = 16
+
+SYSTEM_NODE = "srl_nokia-system:system"
+# system subtrees owned by the switch, read back from its running config, indexed by path.
+NON_MANAGED_SUBTREES = {
+    "/system/logging": "srl_nokia-logging:logging",
+    "/system/tls": "srl_nokia-tls:tls",
+    "/system/snmp": "srl_nokia-snmp:snmp",
+}
 
 
 def _build_srclient(switch: Switch) -> SRClient:
-    return SRClient(str(switch.address), switch.username, switch.password)
+    return srclients.get(switch.endpoint, switch.username, switch.password)
+
+
+def _running_subtree(running: dict, path: str) -> object:
+    """Get a subtree of a running config, ignoring module prefixes.
+
+    Args:
+        running (dict): running config of ``/``
+        path (str): subtree path, without list keys
+
+    Returns:
+        object: subtree, None if missing
+    """
+    node: object = running
+    for name in path.strip("/").split("/"):
+        if not isinstance(node, dict):
+            return None
+        node = next((value for key, value in node.items() if strip_prefix(key) == name), None)
+    return node
 
 
 class SwitchStorage:
     """Store switch configuration and perform transformation on candidate configuration."""
 
-    def __init__(self: Self, switch: Switch, config: dict) -> None:
+    def __init__(
+        self: Self,
+        switch: Switch,
+        config: dict,
+        *,
+        delta: bool = False,
+        local_diff: bool = False,
+    ) -> None:
         """Constructor.
 
         Args:
             self (Self): self
             switch (Switch): switch object
             config (dict): target config
+            delta (bool, optional): push only changed paths instead of replacing the whole
+                configuration. Defaults to False.
+            local_diff (bool, optional): send nothing to the switch if the local diff is empty.
+                Defaults to False.
         """
         self._switch = switch
         self._base_config = config
-        self._config: dict = {}
+        self._config: dict | RunningSnapshot = {}
+        self._running_config: dict | None = None
+        self._non_managed: dict[str, object] | None = None
+        self._target_config: dict | None = None
+        self._delta = delta
+        self._local_diff = local_diff
+        self._changes: ChangeSet | None = None
+        self._commands: list[dict] | None = None
+        self.validation: dict | None = None
+        self.failure: str | None = None
+
+    def fail(self: Self, error: SRClientError) -> dict:
+        """Take the switch out of the run after a call failed.
+
+        Args:
+            self (Self): self
+            error (SRClientError): call failure
+
+        Returns:
+            dict: error response reported for the switch
+        """
+        if self.failure is None:
+            self.failure = str(error)
+        return self.error_response
 
-    def add_base_config(self: Self, base_config: dict) -> None:
+    @property
+    def error_response(self: Self) -> dict:
+        """Get error response reported for a switch taken out of the run.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            dict: JSON-RPC error response
+        """
+        return {"error": {"message": self.failure}}
+
+    def add_base_config(self: Self, base_config: dict | RunningSnapshot) -> None:
         """Add base config of the switch.
 
         Args:
             self (Self): self
-            base_config (dict): base config collected from the switch.
+            base_config (dict | RunningSnapshot): base config collected from the switch, snapshots
+                are loaded only when needed.
         """
         self._config = base_config
+        self._running_config = None
+        self._target_config = None
+        self._changes = None
+        self._commands = None
+
+    def add_non_managed(self: Self, subtrees: list[dict]) -> None:
+        """Add non managed subtrees, read from the switch when its whole running config is not collected.
+
+        Args:
+            self (Self): self
+            subtrees (list[dict]): running config of each NON_MANAGED_SUBTREES path
+        """
+        self._non_managed = dict(zip(NON_MANAGED_SUBTREES.values(), subtrees, strict=True))
+        self._target_config = None
+        self._changes = None
+        self._commands = None
+
+    @property
+    def target_config(self: Self) -> dict:
+        """Get target config, with the non managed subtrees of the switch.
+
+        Subtrees are taken from the running config unless they were read on their own, the missing ones
+        are left out.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            dict: target config
+        """
+        if self._target_config is None:
+            non_managed = self._non_managed
+            if non_managed is None:
+                non_managed = {
+                    node: _running_subtree(self.running_config, path) for path, node in NON_MANAGED_SUBTREES.items()
+                }
+            system = {**self._base_config.get(SYSTEM_NODE, {}), **{k: v for k, v in non_managed.items() if v}}
+            self._target_config = {**self._base_config, SYSTEM_NODE: system}
+        return self._target_config
 
     @property
     def base_config(self: Self) -> str:
@@ -87,7 +183,7 @@ class SwitchStorage:
         Returns:
             dict: base config
         """
-        return _cleanup_candidate_config(dumps(self._base_config, indent=2))
+        return strip_module_prefixes(dumps(self.target_config, indent=2))
 
     @property
     def switch(self: Self) -> Switch:
@@ -101,6 +197,23 @@ class SwitchStorage:
         """
         return self._switch
 
+    @property
+    def running_config(self: Self) -> dict:
+        """Get running config collected from the switch.
+
+        Snapshots are parsed on first use and released once the commands are built, so that a run holds
+        the parsed running config of the switches being processed only.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            dict: running config
+        """
+        if self._running_config is None:
+            self._running_config = self._config.load() if isinstance(self._config, RunningSnapshot) else self._config
+        return self._running_config
+
     @property
     def merged_config(self: Self) -> dict:
         """Get merged config.
@@ -111,13 +224,82 @@ class SwitchStorage:
         Returns:
             dict: _description_
         """
-        return {**self._config, **self._base_config}
+        return {**self.running_config, **self.target_config}
+
+    @property
+    def changes(self: Self) -> ChangeSet:
+        """Get local diff between running and target config.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            ChangeSet: changes to apply on the switch
+        """
+        if self._changes is None:
+            self._changes = diff_config(self.running_config, self.target_config)
+        return self._changes
+
+    @property
+    def replaces_root(self: Self) -> bool:
+        """Check if the commands replace the whole configuration.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            bool: true unless only changed paths are pushed or the local diff is empty
+        """
+        return not self._delta and not (self._local_diff and not self.changes)
+
+    @property
+    def commands(self: Self) -> list[dict]:
+        """Get commands bringing the switch to the target config.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            list[dict]: JSON-RPC commands, empty if there is nothing to push in delta or local diff mode.
+        """
+        if self._commands is None:
+            if self.replaces_root:
+                self._commands = [{"action": "replace", "path": "/", "value": self.merged_config}]
+            else:
+                self._commands = self.changes.to_commands()
+            if isinstance(self._config, RunningSnapshot):
+                self._running_config = None
+        return self._commands
+
+
+@dataclass
+class PhaseReport:
+    """Timing of a fleet wide phase."""
+
+    name: str
+    duration: float
+    critical_switch: str
+    critical_duration: float
+
+    def __str__(self: Self) -> str:
+        """Get user readable report.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            str: report
+        """
+        return (
+            f"{self.name} took {self.duration:.3f}s, critical path : "
+            f"{self.critical_switch} ({self.critical_duration:.3f}s)"
+        )
 
 
 class IdempotencyManager:
     """Manage idempotency flow of checking and commiting configuration on the switch."""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self: Self,
         switchs: list[tuple[Switch, dict]],
         console: Console,
@@ -125,6 +307,12 @@ class IdempotencyManager:
         with_config_print: bool = False,
         with_diff: bool = True,
         with_commit: bool = False,
+        parallel: int = 1,
+        two_phase: bool = False,
+        delta: bool = False,
+        local_diff: bool = False,
+        running_cache: RunningConfigCache | None = None,
+        session: AsyncSRSession | None = None,
     ) -> None:
         """Constructor.
 
@@ -135,26 +323,259 @@ class IdempotencyManager:
             with_config_print (bool, optional): print config Defaults to False.
             with_diff (bool, optional): generate diff Defaults to True.
             with_commit (bool, optional): commit configuration. Defaults to False.
+            parallel (int, optional): number of switches processed concurrently. Defaults to 1.
+            two_phase (bool, optional): prepare every switch before commiting any of them, both phases
+                being run concurrently. Defaults to False.
+            delta (bool, optional): push update and delete commands on changed paths only instead of
+                replacing the whole configuration. Defaults to False.
+            local_diff (bool, optional): compare running and target config locally, switches without
+                change are not called for diff, validate and commit. Defaults to False.
+            running_cache (RunningConfigCache | None, optional): cache of running config, running
+                config is collected on each run if not set. Defaults to None.
+            session (AsyncSRSession | None, optional): connection pool driving every switch from a
+                single event loop instead of parallel threads, it is closed at the end of the run.
+                Defaults to None.
         """
         self._switchs: list[SwitchStorage] = []
         self._with_diff = with_diff
         self._with_config_print = with_config_print
         self._with_commit = with_commit
+        self._parallel = max(parallel, 1)
+        self._two_phase = two_phase
+        self._delta = delta
+        self._local_diff = local_diff
+        self._running_cache = running_cache
         self._console = console
+        self._session = session
+        self._runner = asyncio.Runner()
+        self._aclients: dict[str, AsyncSRClient] = {}
 
         for switch, config in switchs:
-            self._switchs.append(SwitchStorage(switch, config))
+            self._switchs.append(SwitchStorage(switch, config, delta=delta, local_diff=local_diff))
+            if session is not None:
+                self._aclients[switch.name] = AsyncSRClient(switch.endpoint, switch.username, switch.password, session)
+
+    def _map_switchs(self: Self, func: Callable[[SwitchStorage], T], workers: int | None = None) -> list[T]:
+        """Apply a function on every switch, concurrently if allowed.
+
+        Results are always returned in the switch order, whatever the completion order is.
+
+        Args:
+            self (Self): self
+            func (Callable[[SwitchStorage], T]): function to apply on each switch storage.
+            workers (int | None, optional): number of concurrent workers, use the parallel setting
+                if not set. Defaults to None.
+
+        Returns:
+            list[T]: results, in the same order as the switchs.
+        """
+        workers = self._parallel if workers is None else workers
+        if workers == 1 or len(self._switchs) <= 1:
+            return [func(sw_sto) for sw_sto in self._switchs]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, self._switchs))
+
+    def _amap_switchs(self: Self, func: Callable[[SwitchStorage], Awaitable[T]]) -> list[T]:
+        """Apply a coroutine function on every switch, all of them on the event loop of the run.
+
+        Args:
+            self (Self): self
+            func (Callable[[SwitchStorage], Awaitable[T]]): coroutine function to apply on each switch
+                storage.
+
+        Returns:
+            list[T]: results, in the same order as the switchs.
+        """
+
+        async def _gather() -> list[T]:
+            return list(await asyncio.gather(*(func(sw_sto) for sw_sto in self._switchs)))
+
+        return self._runner.run(_gather())
+
+    @staticmethod
+    def _local_responses(sw_sto: SwitchStorage, methods: tuple[str, ...]) -> list[dict] | None:
+        """Get responses of a switch that needs no call.
+
+        Args:
+            sw_sto (SwitchStorage): switch storage
+            methods (tuple[str, ...]): JSON-RPC methods to execute
+
+        Returns:
+            list[dict] | None: error responses if the switch is out of the run, empty results if there is
+                no command to send, None if the switch has to be called.
+        """
+        if not methods:
+            return []
+        if sw_sto.failure is not None:
+            return [sw_sto.error_response for _method in methods]
+        if not sw_sto.commands:
+            return [{"result": []} for _method in methods]
+        return None
+
+    def _execute(self: Self, sw_sto: SwitchStorage, methods: tuple[str, ...]) -> list[dict]:
+        """Execute switch commands, several methods are sent in a single request.
+
+        Args:
+            self (Self): self
+            sw_sto (SwitchStorage): switch storage
+            methods (tuple[str, ...]): JSON-RPC methods to execute
+
+        Returns:
+            list[dict]: response of each method
+        """
+        responses = self._local_responses(sw_sto, methods)
+        if responses is not None:
+            return responses
+        client = _build_srclient(sw_sto.switch)
+        try:
+            if len(methods) == 1:
+                return [client.execute(methods[0], sw_sto.commands)]
+            return client.batch([(method, sw_sto.commands) for method in methods])
+        except SRClientError as exc:
+            return [sw_sto.fail(exc) for _method in methods]
+
+    async def _aexecute(self: Self, sw_sto: SwitchStorage, methods: tuple[str, ...]) -> list[dict]:
+        """Execute switch commands from the event loop, several methods are sent in a single request.
+
+        Args:
+            self (Self): self
+            sw_sto (SwitchStorage): switch storage
+            methods (tuple[str, ...]): JSON-RPC methods to execute
+
+        Returns:
+            list[dict]: response of each method
+        """
+        responses = self._local_responses(sw_sto, methods)
+        if responses is not None:
+            return responses
+        client = self._aclients[sw_sto.switch.name]
+        try:
+            if len(methods) == 1:
+                return [await client.execute(methods[0], sw_sto.commands)]
+            return await client.batch([(method, sw_sto.commands) for method in methods])
+        except SRClientError as exc:
+            return [sw_sto.fail(exc) for _method in methods]
+
+    def _map_calls(
+        self: Self,
+        methods: Callable[[SwitchStorage], tuple[str, ...]],
+        workers: int | None = None,
+    ) -> list[tuple[list[dict], float]]:
+        """Execute commands of every switch and time each of them.
+
+        Args:
+            self (Self): self
+            methods (Callable[[SwitchStorage], tuple[str, ...]]): JSON-RPC methods to execute on a switch
+            workers (int | None, optional): number of concurrent workers when the switches are not driven
+                from an event loop, use the parallel setting if not set. Defaults to None.
+
+        Returns:
+            list[tuple[list[dict], float]]: responses and duration of each switch, in switch order.
+        """
+
+        def _timed(sw_sto: SwitchStorage) -> tuple[list[dict], float]:
+            start = perf_counter()
+            responses = self._execute(sw_sto, methods(sw_sto))
+            return responses, perf_counter() - start
+
+        async def _atimed(sw_sto: SwitchStorage) -> tuple[list[dict], float]:
+            start = perf_counter()
+            responses = await self._aexecute(sw_sto, methods(sw_sto))
+            return responses, perf_counter() - start
+
+        if self._session is None:
+            return self._map_switchs(_timed, workers)
+        return self._amap_switchs(_atimed)
+
+    def _timed_phase(
+        self: Self,
+        name: str,
+        methods: Callable[[SwitchStorage], tuple[str, ...]],
+    ) -> tuple[list[list[dict]], PhaseReport]:
+        """Run a phase concurrently on every switch and time it.
+
+        Switches run concurrently, with the parallel setting as the number of workers, or PHASE_WORKERS
+        if it is not set, so that a small fleet lasts as long as its slowest switch.
+
+        Args:
+            self (Self): self
+            name (str): phase name
+            methods (Callable[[SwitchStorage], tuple[str, ...]]): JSON-RPC methods to execute on a switch
+
+        Returns:
+            tuple[list[list[dict]], PhaseReport]: responses in switch order and phase timing.
+        """
+        workers = self._parallel if self._parallel > 1 else PHASE_WORKERS
+        start = perf_counter()
+        timed_results = self._map_calls(methods, workers)
+        duration = perf_counter() - start
+
+        critical_switch, critical_duration = "", 0.0
+        for sw_sto, (_responses, sw_duration) in zip(self._switchs, timed_results, strict=True):
+            if sw_duration >= critical_duration:
+                critical_switch, critical_duration = sw_sto.switch.name, sw_duration
+        report = PhaseReport(name, duration, critical_switch, critical_duration)
+        return [responses for responses, _sw_duration in timed_results], report
 
     def collect_running_config(self: Self) -> None:
         """Collect and inject running config into switch storage.
 
+        Only the non managed subtrees are read when neither diff, delta nor local diff needs the whole
+        running config. The running config cache is read from parallel threads, even when the switches
+        are driven from an event loop.
+
         Args:
             self (Self): self
         """
         self._console.log("Collect running config", style="bold yellow")
-        for sw_sto in self._switchs:
+        whole = self._with_diff or self._delta or self._local_diff
+
+        def _collect(sw_sto: SwitchStorage) -> dict | RunningSnapshot:
             client = _build_srclient(sw_sto.switch)
-            sw_sto.add_base_config(client.get_running_config("/"))
+            try:
+                if not whole:
+                    sw_sto.add_non_managed(client.get_running_configs(list(NON_MANAGED_SUBTREES)))
+                    return {}
+                if self._running_cache is None:
+                    return client.get_running_config("/")
+                return self._running_cache.get(client, sw_sto.switch.endpoint)
+            except SRClientError as exc:
+                sw_sto.fail(exc)
+                return {}
+
+        async def _acollect(sw_sto: SwitchStorage) -> dict:
+            client = self._aclients[sw_sto.switch.name]
+            try:
+                if not whole:
+                    sw_sto.add_non_managed(await client.get_running_configs(list(NON_MANAGED_SUBTREES)))
+                    return {}
+                return await client.get_running_config("/")
+            except SRClientError as exc:
+                sw_sto.fail(exc)
+                return {}
+
+        with tracer.phase("collect"):
+            if self._session is None or (whole and self._running_cache is not None):
+                running_configs = self._map_switchs(_collect)
+            else:
+                running_configs = self._amap_switchs(_acollect)
+        for sw_sto, running_config in zip(self._switchs, running_configs, strict=True):
+            sw_sto.add_base_config(running_config)
+
+    def _log_failure(self: Self, sw_sto: SwitchStorage) -> bool:
+        """Report a switch taken out of the run.
+
+        Args:
+            self (Self): self
+            sw_sto (SwitchStorage): switch storage
+
+        Returns:
+            bool: true if the switch is out of the run
+        """
+        if sw_sto.failure is None:
+            return False
+        self._console.log(f"Switch {sw_sto.switch.name} skipped : {sw_sto.failure}", style="red")
+        return True
 
     def print_config(self: Self) -> None:
         """Print configuration that will be pushed.
@@ -180,40 +601,76 @@ class IdempotencyManager:
             self (Self): self
         """
         self._console.log("Print diff ", style="bold yellow")
-        for sw_sto in self._switchs:
-            client = _build_srclient(sw_sto.switch)
-            diff_data = client.diff("/", sw_sto.merged_config)
+
+        def _diff(sw_sto: SwitchStorage) -> tuple[str, ...]:
+            if self._two_phase or sw_sto.failure is not None or not sw_sto.commands or sw_sto.replaces_root:
+                # prepare phase validate again right before the commit barrier, and batching a whole
+                # configuration would upload it twice in the same request.
+                return ("diff",)
+            # path scoped commands are small, validation is requested in the same round trip,
+            # valitate_config reuse it.
+            return ("diff", "validate")
+
+        with tracer.phase("diff"):
+            diffs = self._map_calls(_diff)
+        for sw_sto, (responses, _duration) in zip(self._switchs, diffs, strict=True):
+            diff_data = responses[0]
+            if len(responses) > 1:
+                sw_sto.validation = responses[1]
+            if self._log_failure(sw_sto):
+                continue
             if "result" not in diff_data:
                 self._console.print(diff_data)
             elif len(diff_data["result"]) > 0:
-                syntax = Syntax(diff_data["result"][0], "diff", theme="monokai", line_numbers=True)
+                syntax = Syntax(
+                    strip_module_prefixes(diff_data["result"][0]),
+                    "diff",
+                    theme="monokai",
+                    line_numbers=True,
+                )
                 panel = Panel(syntax, title=f"Switch : {sw_sto.switch.name}", title_align="center")
                 self._console.print(panel)
             else:
                 self._console.log(f"no diff for {sw_sto.switch.name}", style="green")
+        if self._delta or self._local_diff:
+            changed = sum(1 for sw_sto in self._switchs if sw_sto.failure is None and sw_sto.changes)
+            self._console.log(f"{changed}/{len(self._switchs)} switch(s) with local changes", style="cyan")
 
     def valitate_config(self: Self) -> bool:
         """Validate configuration before commiting it.
 
+        Every switch is validated, failures are reported once all results are printed so that
+        they are not lost among the successful ones. A switch taken out of the run fails validation.
+
         Args:
             self (Self): self
         Return:
             bool: true if all config are validated successfully. false otherwise.
         """
         self._console.log("validate ", style="bold yellow")
-        for sw_sto in self._switchs:
-            client = _build_srclient(sw_sto.switch)
-            validate_info = client.validate("/", sw_sto.merged_config)
+
+        def _validate(sw_sto: SwitchStorage) -> tuple[str, ...]:
+            return () if sw_sto.validation is not None else ("validate",)
+
+        failed: list[str] = []
+        with tracer.phase("validate"):
+            validations = self._map_calls(_validate)
+        for sw_sto, (responses, _duration) in zip(self._switchs, validations, strict=True):
+            validate_info = sw_sto.validation if sw_sto.validation is not None else responses[0]
             if "error" in validate_info:
                 self._console.log(
-                    f"Switch {sw_sto.switch.name} failed : {validate_info["error"]["message"]}",
+                    f"Switch {sw_sto.switch.name} failed : {validate_info['error']['message']}",
                     style="red",
                 )
-                return False
+                failed.append(sw_sto.switch.name)
+                continue
             self._console.log(
                 f"Switch {sw_sto.switch.name} successfully validated",
                 style="green",
             )
+        if failed:
+            self._console.log(f"Validation failed on {len(failed)} switch(s) : {', '.join(failed)}", style="red")
+            return False
         return True
 
     def commit_config(self: Self) -> None:
@@ -223,20 +680,86 @@ class IdempotencyManager:
             self (Self): self
         """
         self._console.log("commit ", style="bold yellow")
-        for sw_sto in self._switchs:
-            client = _build_srclient(sw_sto.switch)
-            validate_info = client.commit("/", sw_sto.merged_config)
-            if "result" not in validate_info:
-                self._console.log(validate_info, style="red")
-                continue
-            result = validate_info["result"][0]
-            if result == {}:
+
+        def _commit(_sw_sto: SwitchStorage) -> tuple[str, ...]:
+            return ("set",)
+
+        with tracer.phase("commit"):
+            commits = self._map_calls(_commit)
+        for sw_sto, ([commit_info], _duration) in zip(self._switchs, commits, strict=True):
+            self._print_commit(sw_sto, commit_info)
+
+    def _print_commit(self: Self, sw_sto: SwitchStorage, commit_info: dict) -> None:
+        """Print commit result of a switch.
+
+        Args:
+            self (Self): self
+            sw_sto (SwitchStorage): switch storage
+            commit_info (dict): commit response
+        """
+        if self._log_failure(sw_sto):
+            return
+        if "result" not in commit_info:
+            self._console.log(commit_info, style="red")
+            return
+        if not commit_info["result"]:
+            self._console.log(f"Switch {sw_sto.switch.name} has nothing to commit", style="green")
+            return
+        result = commit_info["result"][0]
+        if result == {}:
+            self._console.log(
+                f"Switch {sw_sto.switch.name} successfully commited",
+                style="green",
+            )
+        else:
+            self._console.log(f"Switch {sw_sto.switch.name} failed : {result}")
+
+    def two_phase_commit(self: Self) -> bool:
+        """Prepare every switch, then commit all of them only if they are all prepared.
+
+        Both phases are run concurrently, the commit phase does not start until every switch has
+        answered to the prepare phase.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            bool: true if every switch has been prepared successfully, false otherwise.
+        """
+        self._console.log("prepare ", style="bold yellow")
+
+        def _prepare(_sw_sto: SwitchStorage) -> tuple[str, ...]:
+            return ("validate",)
+
+        with tracer.phase("prepare"):
+            prepared, prepare_report = self._timed_phase("prepare", _prepare)
+        failed: list[str] = []
+        for sw_sto, [validate_info] in zip(self._switchs, prepared, strict=True):
+            if "error" in validate_info:
                 self._console.log(
-                    f"Switch {sw_sto.switch.name} successfully commited",
-                    style="green",
+                    f"Switch {sw_sto.switch.name} failed : {validate_info['error']['message']}",
+                    style="red",
                 )
-            else:
-                self._console.log(f"Switch {sw_sto.switch.name} failed : {result}")
+                failed.append(sw_sto.switch.name)
+        self._console.log(str(prepare_report), style="cyan")
+        if failed:
+            self._console.log(f"Prepare failed on {len(failed)} switch(s) : {', '.join(failed)}", style="red")
+            return False
+        self._console.log(f"{len(self._switchs)} switch(s) prepared", style="green")
+        if not self._with_commit:
+            return True
+
+        self._console.log("commit ", style="bold yellow")
+
+        def _commit(_sw_sto: SwitchStorage) -> tuple[str, ...]:
+            return ("set",)
+
+        with tracer.phase("commit"):
+            commited, commit_report = self._timed_phase("commit", _commit)
+        for sw_sto, [commit_info] in zip(self._switchs, commited, strict=True):
+            self._print_commit(sw_sto, commit_info)
+        self._console.log(str(commit_report), style="cyan")
+        return True
 
     def run(self: Self) -> None:
         """Run configuration.
@@ -244,12 +767,36 @@ class IdempotencyManager:
         Args:
             self (Self): self.
         """
-        if self._with_diff:
-            self.collect_running_config()
+        try:
+            self._run_phases()
+        finally:
+            self.close()
+
+    def close(self: Self) -> None:
+        """Close the connection pool and the event loop driving the switches, if any.
+
+        Args:
+            self (Self): self.
+        """
+        if self._session is not None:
+            self._runner.run(self._session.aclose())
+        self._runner.close()
+
+    def _run_phases(self: Self) -> None:
+        """Run every phase of the configuration.
+
+        Args:
+            self (Self): self.
+        """
+        self.collect_running_config()
         if self._with_config_print:
             self.print_config()
         if self._with_diff:
             self.generate_diff()
+        if self._two_phase:
+            if not self.two_phase_commit():
+                self._console.log("Exit due to validation error", style="red")
+            return
         validation_status = self.valitate_config()
         if not validation_status:
             self._console.log("Exit due to validation error", style="red")
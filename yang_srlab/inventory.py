@@ -0,0 +1,302 @@
+"""Load the metamodel from a sharded inventory directory.
+
+The inventory directory holds one file per entity group::
+
+    inventory/
+        default.yaml        default credentials
+        dci.yaml            list of DCI switches, optional
+        clients/*.yaml      clients, indexed by name as in the single file format
+        templates/*.yaml    list of interface templates
+        fabrics/*.yaml      a single fabric
+
+Every shard is parsed and validated on its own, in worker processes. References between shards,
+port templates, template clients and DCI switches, are resolved once every shard is loaded.
+"""
+
+import os
+from collections.abc import Callable, Collection
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Self
+
+from pydantic import TypeAdapter
+from ruamel.yaml import YAML
+
+from .metamodel import Client, Default, Fabric, InterfaceTemplate, Metamodel, Switch
+from .selection import dci_selected, select_raw
+
+SHARD_SUFFIXES = (".yaml", ".yml")
+
+# shard kinds, in loading order.
+SHARD_KINDS = ("default", "dci", "clients", "templates", "fabrics")
+
+_SWITCHES = TypeAdapter(list[Switch])
+_CLIENTS = TypeAdapter(dict[str, dict])
+_TEMPLATES = TypeAdapter(list[InterfaceTemplate])
+
+
+@dataclass
+class Inventory:
+    """Validated entities of an inventory, before the references between shards are resolved."""
+
+    default: Default | None = None
+    dci: list[Switch] = field(default_factory=list)
+    clients: dict[str, Client] = field(default_factory=dict)
+    templates: list[InterfaceTemplate] = field(default_factory=list)
+    fabrics: list[Fabric] = field(default_factory=list)
+
+    def add(self: Self, shard: "Inventory") -> None:
+        """Add entities of a shard.
+
+        Args:
+            self (Self): self
+            shard (Inventory): entities of a single shard
+
+        Raises:
+            ValueError: clients are defined by several shards.
+        """
+        duplicated = self.clients.keys() & shard.clients.keys()
+        if duplicated:
+            msg = f"clients {', '.join(sorted(duplicated))} already defined"
+            raise ValueError(msg)
+        if shard.default is not None:
+            self.default = shard.default
+        self.dci += shard.dci
+        self.clients.update(shard.clients)
+        self.templates += shard.templates
+        self.fabrics += shard.fabrics
+
+    def link(self: Self) -> Metamodel:
+        """Build metamodel and resolve references between shards.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            Metamodel: resolved metamodel
+
+        Raises:
+            ValueError: an entity is defined by several shards or default credentials are missing.
+        """
+        if self.default is None:
+            msg = "default credentials are not defined"
+            raise ValueError(msg)
+        _check_unique([template.name for template in self.templates], "template")
+        _check_unique([str(fabric.id) for fabric in self.fabrics], "fabric")
+
+        # shards are already validated, only the cross references are resolved.
+        model = Metamodel.model_construct(
+            default=self.default,
+            dci=self.dci,
+            fabrics=self.fabrics,
+            clients=self.clients,
+            templates_list=self.templates,
+        )
+        model.resolve_references()
+        return model
+
+
+def _check_unique(names: list[str], label: str) -> None:
+    """Check that entities are defined by a single shard.
+
+    Args:
+        names (list[str]): entity names
+        label (str): entity kind, used in the error message
+
+    Raises:
+        ValueError: an entity is defined several times.
+    """
+    duplicated = {name for name in names if names.count(name) > 1}
+    if duplicated:
+        msg = f"{label}s {', '.join(sorted(duplicated))} already defined"
+        raise ValueError(msg)
+
+
+def _parse_clients(content: dict[str, dict]) -> dict[str, Client]:
+    """Validate a clients shard.
+
+    Args:
+        content (dict[str, dict]): raw shard content
+
+    Returns:
+        dict[str, Client]: clients, indexed by name
+    """
+    # client names are injected from their key, as done by Metamodel for the single file format.
+    return {name: Client.model_validate({**data, "name": name}) for name, data in content.items()}
+
+
+def _parse_shard(kind: str, path: Path) -> Inventory:
+    """Parse and validate a shard.
+
+    Args:
+        kind (str): shard kind, one of SHARD_KINDS
+        path (Path): shard file
+
+    Returns:
+        Inventory: entities of the shard
+
+    Raises:
+        ValueError: the shard is not valid, the message holds the shard path.
+    """
+    try:
+        content = _read_shard(path)
+        if kind == "default":
+            return Inventory(default=Default.model_validate(content))
+        if kind == "dci":
+            return Inventory(dci=_SWITCHES.validate_python(content))
+        if kind == "clients":
+            return Inventory(clients=_parse_clients(_CLIENTS.validate_python(content)))
+        if kind == "templates":
+            return Inventory(templates=_TEMPLATES.validate_python(content))
+        return Inventory(fabrics=[Fabric.model_validate(content)])
+    except ValueError as exc:
+        msg = f"{path}: {exc}"
+        raise ValueError(msg) from exc
+
+
+def inventory_shards(directory: Path) -> list[tuple[str, Path]]:
+    """List shards of an inventory directory, in loading order.
+
+    Args:
+        directory (Path): inventory directory
+
+    Returns:
+        list[tuple[str, Path]]: kind and file of each shard
+    """
+    shards = []
+    for kind in SHARD_KINDS:
+        files = [directory / f"{kind}{suffix}" for suffix in SHARD_SUFFIXES]
+        shards += [(kind, path) for path in files if path.is_file()]
+        if (directory / kind).is_dir():
+            shards += [(kind, path) for path in sorted((directory / kind).iterdir()) if path.suffix in SHARD_SUFFIXES]
+    return shards
+
+
+def _read_shard(path: Path) -> object:
+    """Read a shard without validating it.
+
+    Args:
+        path (Path): shard file
+
+    Returns:
+        object: raw shard content
+    """
+    with path.open() as f:
+        return YAML(typ="safe", pure=True).load(f)
+
+
+def _read_raw_shard(kind: str, path: Path) -> object:
+    """Read a shard, only checking that it holds the container expected for its kind.
+
+    Args:
+        kind (str): shard kind, one of SHARD_KINDS
+        path (Path): shard file
+
+    Returns:
+        object: raw shard content
+
+    Raises:
+        ValueError: the shard does not hold a list or a mapping as expected, the message holds the shard
+            path.
+    """
+    content = _read_shard(path)
+    expected = list if kind in {"dci", "templates"} else dict
+    if not isinstance(content, expected):
+        msg = f"{path}: {kind} shard should hold a {expected.__name__}, found {type(content).__name__}"
+        raise ValueError(msg)  # noqa: TRY004
+    return content
+
+
+def _map_shards[T](func: Callable[..., T], *iterables: list, workers: int | None) -> list[T]:
+    """Apply a function on shards, in worker processes if allowed.
+
+    Args:
+        func (Callable[..., T]): function to apply
+        *iterables (list): arguments of each call
+        workers (int | None): number of worker processes, shards are processed in the current process if
+            lower than 2. Defaults to the number of CPUs if None.
+
+    Returns:
+        list[T]: results, in shard order
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(iterables[0]))
+    if workers < 2:  # noqa: PLR2004
+        return list(map(func, *iterables))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, *iterables))
+
+
+def _load_selected(shards: list[tuple[str, Path]], hosts: Collection[str], workers: int | None) -> Metamodel:
+    """Load the entities read by a set of switches.
+
+    Fabric files not naming any selected switch are not even parsed, unless a DCI switch is selected.
+
+    Args:
+        shards (list[tuple[str, Path]]): kind and file of each shard
+        hosts (Collection[str]): selected switch names
+        workers (int | None): number of worker processes parsing the fabric files
+
+    Returns:
+        Metamodel: resolved metamodel
+
+    Raises:
+        ValueError: a shard is not valid or clients are defined by several shards.
+    """
+    raw: dict = {"dci": [], "clients": {}, "templates": [], "fabrics": []}
+    for kind, path in shards:
+        if kind == "fabrics":
+            continue
+        content = _read_raw_shard(kind, path)
+        if kind == "default":
+            raw["default"] = content
+        elif kind == "clients":
+            duplicated = raw["clients"].keys() & content.keys()  # type: ignore[attr-defined]
+            if duplicated:
+                msg = f"clients {', '.join(sorted(duplicated))} already defined"
+                raise ValueError(msg)
+            raw["clients"].update(content)
+        else:
+            raw[kind] += content
+
+    with_dci = dci_selected(raw["dci"], hosts)
+    fabric_files = [
+        path
+        for kind, path in shards
+        if kind == "fabrics" and (with_dci or any(host in path.read_text() for host in hosts))
+    ]
+    raw["fabrics"] = _map_shards(_read_raw_shard, ["fabrics"] * len(fabric_files), fabric_files, workers=workers)
+    return Metamodel.model_validate(select_raw(raw, hosts))
+
+
+def load_inventory(directory: Path, workers: int | None = None, hosts: Collection[str] | None = None) -> Metamodel:
+    """Load metamodel from an inventory directory.
+
+    Args:
+        directory (Path): inventory directory
+        workers (int | None, optional): number of worker processes, shards are parsed in the current
+            process if lower than 2. Defaults to the number of CPUs.
+        hosts (Collection[str] | None, optional): load only the entities read by these switches, every
+            entity is loaded if not set. Defaults to None.
+
+    Returns:
+        Metamodel: resolved metamodel
+    """
+    shards = inventory_shards(directory)
+    if hosts:
+        model = _load_selected(shards, hosts, workers)
+    else:
+        parsed = _map_shards(
+            _parse_shard,
+            [kind for kind, _path in shards],
+            [path for _kind, path in shards],
+            workers=workers,
+        )
+        inventory = Inventory()
+        for shard in parsed:
+            inventory.add(shard)
+        model = inventory.link()
+    model.propagate_default()
+    return model
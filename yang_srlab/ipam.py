@@ -0,0 +1,174 @@
+"""Allocate fabric addresses from its ressource pools.
+
+The whole fabric plan is computed at once as integer arrays when the metamodel is loaded, templates
+then get their addresses by index instead of expanding the pools into network objects:
+* spine loopbacks are the first hosts of the loopback pool, leaf loopbacks start at the 33th host
+* leaf to spine links are /31, each spine get an equal share of the link pool, indexed by leaf
+* spine to DCI links are /31, each DCI get half of the DCI pool, indexed by spine
+"""
+
+from array import array
+from ipaddress import IPv4Address, IPv4Network
+from typing import Self
+
+# number of loopbacks reserved for spines, leaf loopbacks start after them.
+SPINE_LOOPBACKS = 32
+# number of DCI switches a fabric can be connected to.
+MAX_DCI = 2
+# /31 point to point subnets.
+_P2P_SIZE = 2
+_P2P_PREFIX = 31
+
+
+def _first_host(network: IPv4Network) -> int:
+    """Get first usable host of a network.
+
+    Args:
+        network (IPv4Network): network
+
+    Returns:
+        int: first host, as integer
+    """
+    if network.prefixlen >= _P2P_PREFIX:
+        return int(network.network_address)
+    return int(network.network_address) + 1
+
+
+def _host_count(network: IPv4Network) -> int:
+    """Get number of usable hosts of a network.
+
+    Args:
+        network (IPv4Network): network
+
+    Returns:
+        int: number of hosts
+    """
+    if network.prefixlen >= _P2P_PREFIX:
+        return network.num_addresses
+    return network.num_addresses - 2
+
+
+class FabricIPAM:
+    """Address plan of a fabric."""
+
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        loopbacks: IPv4Network,
+        links: IPv4Network,
+        dci: IPv4Network,
+        spine_count: int,
+        leaf_count: int,
+        dci_count: int,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            loopbacks (IPv4Network): loopback pool
+            links (IPv4Network): leaf to spine link pool
+            dci (IPv4Network): spine to DCI link pool
+            spine_count (int): number of spines
+            leaf_count (int): number of leafs
+            dci_count (int): number of DCI switches
+
+        Raises:
+            ValueError: a pool is too small for the fabric.
+        """
+        self._spine_count = spine_count
+        self._leaf_count = leaf_count
+
+        # only allocated addresses are reserved, leaf loopbacks come after the spine ones when there are leafs.
+        if leaf_count and spine_count > SPINE_LOOPBACKS:
+            msg = f"{spine_count} spines declared, only {SPINE_LOOPBACKS} spine loopbacks are available"
+            raise ValueError(msg)
+        loopback_count = SPINE_LOOPBACKS + leaf_count if leaf_count else spine_count
+        if loopback_count > _host_count(loopbacks):
+            msg = f"loopback pool {loopbacks} is too small for {spine_count} spines and {leaf_count} leafs"
+            raise ValueError(msg)
+        first_loopback = _first_host(loopbacks)
+        self._loopbacks = array("L", range(first_loopback, first_loopback + loopback_count))
+
+        # links are split between spines, each spine share is indexed by leaf.
+        link_share = links.num_addresses // _P2P_SIZE // max(spine_count, 1)
+        if spine_count and leaf_count > link_share:
+            msg = f"link pool {links} is too small for {spine_count} spines and {leaf_count} leafs"
+            raise ValueError(msg)
+        links_base = int(links.network_address)
+        self._links = array(
+            "L",
+            (
+                links_base + _P2P_SIZE * (link_share * spine_index + leaf_index)
+                for spine_index in range(spine_count)
+                for leaf_index in range(leaf_count)
+            ),
+        )
+
+        # DCI pool is split between DCI switches, each DCI share is indexed by spine.
+        dci_share = dci.num_addresses // _P2P_SIZE // MAX_DCI
+        if dci_count > MAX_DCI:
+            msg = f"{dci_count} DCI declared, a fabric can only be connected to {MAX_DCI} DCI"
+            raise ValueError(msg)
+        if dci_count and spine_count > dci_share:
+            msg = f"DCI pool {dci} is too small for {spine_count} spines"
+            raise ValueError(msg)
+        dci_base = int(dci.network_address)
+        self._dci_links = array(
+            "L",
+            (
+                dci_base + _P2P_SIZE * (dci_share * dci_index + spine_index)
+                for dci_index in range(MAX_DCI)
+                for spine_index in range(spine_count)
+            ),
+        )
+
+    def spine_loopback(self: Self, spine_index: int) -> IPv4Address:
+        """Get loopback of a spine.
+
+        Args:
+            self (Self): self
+            spine_index (int): spine position inside the fabric
+
+        Returns:
+            IPv4Address: loopback address
+        """
+        return IPv4Address(self._loopbacks[spine_index])
+
+    def leaf_loopback(self: Self, leaf_index: int) -> IPv4Address:
+        """Get loopback of a leaf.
+
+        Args:
+            self (Self): self
+            leaf_index (int): leaf position inside the fabric
+
+        Returns:
+            IPv4Address: loopback address
+        """
+        return IPv4Address(self._loopbacks[SPINE_LOOPBACKS + leaf_index])
+
+    def leaf_spine_link(self: Self, spine_index: int, leaf_index: int) -> tuple[IPv4Address, IPv4Address]:
+        """Get addresses of a leaf to spine link.
+
+        Args:
+            self (Self): self
+            spine_index (int): spine position inside the fabric
+            leaf_index (int): leaf position inside the fabric
+
+        Returns:
+            tuple[IPv4Address, IPv4Address]: spine side and leaf side addresses, inside a /31.
+        """
+        base = self._links[spine_index * self._leaf_count + leaf_index]
+        return IPv4Address(base), IPv4Address(base + 1)
+
+    def spine_dci_link(self: Self, dci_index: int, spine_index: int) -> tuple[IPv4Address, IPv4Address]:
+        """Get addresses of a spine to DCI link.
+
+        Args:
+            self (Self): self
+            dci_index (int): DCI position
+            spine_index (int): spine position inside the fabric
+
+        Returns:
+            tuple[IPv4Address, IPv4Address]: spine side and DCI side addresses, inside a /31.
+        """
+        base = self._dci_links[dci_index * self._spine_count + spine_index]
+        return IPv4Address(base), IPv4Address(base + 1)
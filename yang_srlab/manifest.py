@@ -0,0 +1,105 @@
+"""Cache discovered templates between runs.
+
+Scanning a template package imports every module of the package to collect the decorated functions.
+The manifest records the functions registered by each package, it is reused as long as no source file
+of the package changed, template modules are then only imported when their functions are used.
+"""
+
+import importlib
+import importlib.util
+import json
+from collections.abc import Callable
+from pathlib import Path
+from typing import Self
+
+
+def function_ref(func: Callable) -> str:
+    """Get importable reference of a function.
+
+    Args:
+        func (Callable): function
+
+    Returns:
+        str: reference, as ``module:function``
+    """
+    return f"{func.__module__}:{func.__qualname__}"
+
+
+def resolve_ref(ref: str) -> Callable:
+    """Import a function from its reference.
+
+    Args:
+        ref (str): reference, as ``module:function``
+
+    Returns:
+        Callable: function
+    """
+    module_name, func_name = ref.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _source_stamps(package_name: str) -> dict[str, int]:
+    """Get modification time of every source file of a package.
+
+    Args:
+        package_name (str): package name
+
+    Returns:
+        dict[str, int]: modification time in nanoseconds, indexed by file path
+    """
+    spec = importlib.util.find_spec(package_name)
+    if spec is None or spec.submodule_search_locations is None:
+        return {}
+    stamps = {}
+    for location in spec.submodule_search_locations:
+        for source in sorted(Path(location).rglob("*.py")):
+            stamps[str(source)] = source.stat().st_mtime_ns
+    return stamps
+
+
+class TemplateManifest:
+    """Functions registered by template packages, stored as a JSON file."""
+
+    def __init__(self: Self, path: Path) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            path (Path): manifest file
+        """
+        self._path = path
+        self._entries: dict[str, dict] = {}
+        if path.exists():
+            with path.open() as f:
+                self._entries = json.load(f)
+
+    def get(self: Self, package_name: str) -> dict[str, list[str]] | None:
+        """Get functions registered by a package.
+
+        Args:
+            self (Self): self
+            package_name (str): package name
+
+        Returns:
+            dict[str, list[str]] | None: function references indexed by group, None if the package
+                is not in the manifest or one of its source files changed.
+        """
+        entry = self._entries.get(package_name)
+        if entry is None or entry["sources"] != _source_stamps(package_name):
+            return None
+        return entry["functions"]
+
+    def set(self: Self, package_name: str, functions: dict[str, list[str]]) -> None:
+        """Record functions registered by a package.
+
+        Args:
+            self (Self): self
+            package_name (str): package name
+            functions (dict[str, list[str]]): function references indexed by group
+        """
+        self._entries[package_name] = {"sources": _source_stamps(package_name), "functions": functions}
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(".tmp")
+        with tmp_path.open("w") as f:
+            json.dump(self._entries, f)
+        tmp_path.replace(self._path)
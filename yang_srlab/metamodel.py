@@ -1,5 +1,6 @@
 """Define metamodel class used as source of preprocessing."""
 
+from collections.abc import Collection
 from enum import Enum
 from ipaddress import IPv4Address, IPv4Interface, IPv4Network
 from pathlib import Path
@@ -7,6 +8,11 @@ from typing import Self
 
 from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 from pydantic_yaml import parse_yaml_raw_as
+from ruamel.yaml import YAML
+
+from .ipam import FabricIPAM
+from .selection import select_raw
+from .topology import SwitchPosition, TopologyIndex
 
 
 class SwitchKind(Enum):
@@ -28,6 +34,7 @@ class Switch(BaseModel):
     name: str
     kind: SwitchKind
     address: IPv4Address
+    port: int | None = Field(default=None)
     username: str = Field(default="")
     password: str = Field(default="")
     _ports: dict[int, "Port"] = PrivateAttr(default_factory=dict)
@@ -92,6 +99,32 @@ class Switch(BaseModel):
         """
         self._fabric = fabric
 
+    @property
+    def endpoint(self: Self) -> str:
+        """Get JSON-RPC endpoint of this switch.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            str: address, followed by the port if it is not the default one
+        """
+        if self.port is None:
+            return str(self.address)
+        return f"{self.address}:{self.port}"
+
+    @property
+    def position(self: Self) -> SwitchPosition:
+        """Get role and position of this switch inside the topology.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            SwitchPosition: switch position
+        """
+        return self._config.topology[self.name]
+
     @property
     def config(self: Self) -> "Metamodel":
         """Get config.
@@ -127,6 +160,30 @@ class FabricPool(BaseModel):
     loopbacks: IPv4Network
     links: IPv4Network
     dci: IPv4Network
+    _ipam: FabricIPAM
+
+    def allocate(self: Self, spine_count: int, leaf_count: int, dci_count: int) -> None:
+        """Compute address plan of the fabric.
+
+        Args:
+            self (Self): self
+            spine_count (int): number of spines
+            leaf_count (int): number of leafs
+            dci_count (int): number of DCI switches
+        """
+        self._ipam = FabricIPAM(self.loopbacks, self.links, self.dci, spine_count, leaf_count, dci_count)
+
+    @property
+    def ipam(self: Self) -> FabricIPAM:
+        """Get address plan of the fabric.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            FabricIPAM: address plan
+        """
+        return self._ipam
 
 
 class Port(BaseModel):
@@ -242,9 +299,9 @@ class Fabric(BaseModel):
         config: "Metamodel",
     ) -> None:
         """Resolve switch for ports."""
+        self._leaf_index = {leaf.id: leaf for leaf in self.lifs}
         for port in self.ports:
             port.template = templates[port.template_str]
-            self._leaf_index = {leaf.id: leaf for leaf in self.lifs}
             sw1, sw2 = port.switch_str
             port.switch = (self._leaf_index[sw1], self._leaf_index[sw2])
         for switch in self.lifs + self.spines:
@@ -368,6 +425,7 @@ class Metamodel(BaseModel):
     clients: dict[str, Client] = Field(default_factory=dict)
     templates_list: list[InterfaceTemplate] = Field(default_factory=list, alias="templates")
     _templates: dict[str, InterfaceTemplate]
+    _topology: TopologyIndex
 
     @field_validator("clients", mode="before")
     @classmethod
@@ -389,6 +447,15 @@ class Metamodel(BaseModel):
     def process_templates(self: Self) -> Self:
         """Resolve client str into client object.
 
+        Args:
+            self (Self): self.
+        """
+        self.resolve_references()
+        return self
+
+    def resolve_references(self: Self) -> None:
+        """Resolve references between entities, and index templates and topology.
+
         Args:
             self (Self): self.
         """
@@ -397,9 +464,10 @@ class Metamodel(BaseModel):
             template.clients = [self.clients[client_str] for client_str in template.clients_str]
         for fabric in self.fabrics:
             fabric.resolve_switch(self.templates, self)
+            fabric.pool.allocate(len(fabric.spines), len(fabric.lifs), len(self.dci))
         for dci in self.dci:
             dci.config = self
-        return self
+        self._topology = TopologyIndex(self)
 
     @property
     def templates(self: Self) -> dict[str, InterfaceTemplate]:
@@ -413,6 +481,18 @@ class Metamodel(BaseModel):
         """
         return self._templates
 
+    @property
+    def topology(self: Self) -> TopologyIndex:
+        """Get topology index.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            TopologyIndex: position of every switch
+        """
+        return self._topology
+
     def propagate_default(self: Self) -> None:
         """Propagate default value.
 
@@ -431,17 +511,30 @@ class Metamodel(BaseModel):
                 spine.password = self.default.password if not spine.password else spine.password
 
 
-def get_model(filename: str) -> Metamodel:
+def get_model(filename: str, workers: int | None = None, hosts: Collection[str] | None = None) -> Metamodel:
     """Parse model from filename.
 
     Args:
-        filename (str): filmename to parse
+        filename (str): filmename to parse, or inventory directory holding one file per fabric, client
+            and template group.
+        workers (int | None, optional): number of worker processes parsing the files of an inventory
+            directory. Defaults to the number of CPUs.
+        hosts (Collection[str] | None, optional): load only the entities read by these switches, every
+            entity is loaded if not set. Defaults to None.
 
     Returns:
         Metamodel: parsed metamodel
     """
     path = Path(filename)
+    if path.is_dir():
+        from .inventory import load_inventory
+
+        return load_inventory(path, workers, hosts)
     with path.open() as f:
-        model = parse_yaml_raw_as(Metamodel, f)
+        if hosts:
+            # same loader as parse_yaml_raw_as, the raw document is filtered before being validated.
+            model = Metamodel.model_validate(select_raw(YAML(typ="safe", pure=True).load(f), hosts))
+        else:
+            model = parse_yaml_raw_as(Metamodel, f)
         model.propagate_default()
         return model
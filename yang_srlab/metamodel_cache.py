@@ -0,0 +1,129 @@
+"""Cache the parsed metamodel between runs.
+
+Parsing the configuration file validates every entity, resolves switch and template references and
+allocates the fabric address plans. The resolved metamodel is stored as a pickle snapshot, private
+back references included, and reloaded as long as the configuration file and the metamodel code are
+unchanged.
+"""
+
+import hashlib
+import pickle
+import re
+from collections.abc import Collection
+from pathlib import Path
+from typing import Self
+
+import pydantic
+
+from .inventory import inventory_shards
+from .metamodel import Metamodel, get_model
+
+# modules defining the metamodel, a snapshot is outdated once one of them changes.
+MODEL_MODULES = ("metamodel.py", "ipam.py", "topology.py", "inventory.py")
+
+
+class MetamodelCache:
+    """Store resolved metamodel snapshots, indexed by a hash of the configuration file and the code."""
+
+    def __init__(self: Self, directory: Path) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            directory (Path): cache directory
+        """
+        self._directory = directory / "metamodel"
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self: Self, configfile: Path) -> Path:
+        """Get snapshot file of a configuration file.
+
+        Args:
+            self (Self): self
+            configfile (Path): configuration file
+
+        Returns:
+            Path: snapshot file
+        """
+        return self._directory / f"{re.sub(r'[^\w.-]', '_', str(configfile.resolve()))}.pickle"
+
+    @staticmethod
+    def key(configfile: Path) -> bytes:
+        """Get snapshot key of a configuration.
+
+        Args:
+            configfile (Path): configuration file or inventory directory
+
+        Returns:
+            bytes: hex digest of the configuration and of the metamodel code
+        """
+        digest = hashlib.sha256()
+        if configfile.is_dir():
+            for kind, path in inventory_shards(configfile):
+                digest.update(f"{kind}:{path.relative_to(configfile)}".encode())
+                digest.update(path.read_bytes())
+        else:
+            digest.update(configfile.read_bytes())
+        digest.update(pydantic.VERSION.encode())
+        package = Path(__file__).parent
+        for module in MODEL_MODULES:
+            digest.update((package / module).read_bytes())
+        return digest.hexdigest().encode()
+
+    def get(self: Self, configfile: Path, key: bytes) -> Metamodel | None:
+        """Load a snapshot.
+
+        Args:
+            self (Self): self
+            configfile (Path): configuration file
+            key (bytes): current key of the configuration
+
+        Returns:
+            Metamodel | None: metamodel, None if not cached or outdated
+        """
+        path = self._path(configfile)
+        if not path.exists():
+            return None
+        with path.open("rb") as f:
+            if f.read(len(key)) != key:
+                return None
+            return pickle.load(f)  # noqa: S301
+
+    def set(self: Self, configfile: Path, key: bytes, model: Metamodel) -> None:
+        """Store a snapshot.
+
+        Args:
+            self (Self): self
+            configfile (Path): configuration file
+            key (bytes): key of the configuration
+            model (Metamodel): resolved metamodel
+        """
+        path = self._path(configfile)
+        tmp_path = path.with_suffix(".tmp")
+        with tmp_path.open("wb") as f:
+            f.write(key)
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+
+    def load(self: Self, filename: str, hosts: Collection[str] | None = None) -> Metamodel:
+        """Get metamodel of a configuration file, parsing it only if no snapshot is up to date.
+
+        Args:
+            self (Self): self
+            filename (str): configuration file or inventory directory
+            hosts (Collection[str] | None, optional): switches selected by the run, only their entities
+                are parsed if no snapshot is up to date. Partial metamodels are not stored. Defaults to None.
+
+        Returns:
+            Metamodel: resolved metamodel
+        """
+        configfile = Path(filename)
+        key = self.key(configfile)
+        model = self.get(configfile, key)
+        if model is not None:
+            return model
+        if hosts:
+            return get_model(filename, hosts=hosts)
+        model = get_model(filename)
+        self.set(configfile, key, model)
+        return model
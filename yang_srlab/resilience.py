@@ -0,0 +1,364 @@
+"""Bound the time spent on JSON-RPC calls.
+
+Every call is sent with a timeout derived from the latency observed for the same method and path on
+the same switch, capped by the deadline of the run: a ``get`` of ``/`` is not timed by the small gets.
+Calls made only of idempotent methods (``get``, ``diff`` and ``validate``) are retried with a jittered
+exponential backoff, ``set`` is sent once since a commit that timed out may still have been applied.
+
+Each switch has a circuit breaker: once several calls failed in a row, the next ones are refused
+without reaching the network, so that an unreachable switch is taken out of the run instead of
+consuming its deadline. A single trial call is let through once the reset delay is elapsed.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Self
+
+from .tracing import describe_query
+
+IDEMPOTENT_METHODS = frozenset({"get", "diff", "validate"})
+
+
+class SRClientError(Exception):
+    """JSON-RPC call failure."""
+
+    def __init__(self: Self, host: str, message: str, *, retryable: bool = False) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            host (str): switch endpoint
+            message (str): failure reason
+            retryable (bool, optional): the switch did not process the call, it may be sent again.
+                Defaults to False.
+        """
+        super().__init__(f"{host}: {message}")
+        self.host = host
+        self.retryable = retryable
+
+
+class RPCTimeoutError(SRClientError):
+    """No response received before the call timeout."""
+
+
+class CircuitOpenError(SRClientError):
+    """Call refused, the switch failed too many calls in a row."""
+
+
+class DeadlineExceededError(SRClientError):
+    """Call refused, the run deadline is exceeded."""
+
+
+@dataclass
+class RetryPolicy:
+    """Timeouts, retries and circuit breaking of JSON-RPC calls."""
+
+    timeout: float = 30.0
+    min_timeout: float = 2.0
+    max_timeout: float = 300.0
+    attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 8.0
+    failure_threshold: int = 3
+    reset_after: float = 60.0
+
+
+@dataclass
+class LatencyEstimator:
+    """Latency of a method on a switch, smoothed as TCP does to derive its retransmission timeout."""
+
+    smoothed: float | None = None
+    variation: float = 0.0
+    penalty: int = 1
+
+    def update(self: Self, latency: float) -> None:
+        """Record latency of a successful call.
+
+        Args:
+            self (Self): self
+            latency (float): call duration, in seconds
+        """
+        if self.smoothed is None:
+            self.smoothed, self.variation = latency, latency / 2
+        else:
+            self.variation = 0.75 * self.variation + 0.25 * abs(self.smoothed - latency)
+            self.smoothed = 0.875 * self.smoothed + 0.125 * latency
+        self.penalty = 1
+
+    def timed_out(self: Self) -> None:
+        """Double the timeout after a call timed out.
+
+        Args:
+            self (Self): self
+        """
+        self.penalty = min(self.penalty * 2, 16)
+
+    def timeout(self: Self, policy: RetryPolicy) -> float:
+        """Get timeout of the next call.
+
+        Args:
+            self (Self): self
+            policy (RetryPolicy): retry policy
+
+        Returns:
+            float: timeout, in seconds, the policy timeout until a latency is observed
+        """
+        if self.smoothed is None:
+            estimate = policy.timeout
+        else:
+            estimate = max(self.smoothed + 4 * self.variation, policy.min_timeout)
+        return min(estimate * self.penalty, policy.max_timeout)
+
+
+@dataclass
+class CircuitBreaker:
+    """Consecutive failures of a switch."""
+
+    failures: int = 0
+    opened_at: float | None = None
+    trial: bool = False
+
+    def allow(self: Self, policy: RetryPolicy) -> bool:
+        """Check if a call may be sent.
+
+        Args:
+            self (Self): self
+            policy (RetryPolicy): retry policy
+
+        Returns:
+            bool: true if the circuit is closed, or if the call is the trial of a half-opened one
+        """
+        if self.opened_at is None:
+            return True
+        if self.trial or time.monotonic() - self.opened_at < policy.reset_after:
+            return False
+        self.trial = True
+        return True
+
+    def success(self: Self) -> None:
+        """Close the circuit.
+
+        Args:
+            self (Self): self
+        """
+        self.failures, self.opened_at, self.trial = 0, None, False
+
+    def failure(self: Self, policy: RetryPolicy) -> None:
+        """Record a failure, open the circuit once the threshold is reached.
+
+        Args:
+            self (Self): self
+            policy (RetryPolicy): retry policy
+        """
+        self.failures += 1
+        if self.trial or self.failures >= policy.failure_threshold:
+            self.opened_at, self.trial = time.monotonic(), False
+
+    @property
+    def is_open(self: Self) -> bool:
+        """Check if calls are refused.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            bool: true if the circuit is open
+        """
+        return self.opened_at is not None
+
+
+class DeviceGuard:
+    """Send the calls of a switch within the timeouts, retries and circuit breaker of the run."""
+
+    def __init__(self: Self, host: str, registry: "RPCGuard") -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            host (str): switch endpoint
+            registry (RPCGuard): guards of the run, holding the policy and the deadline
+        """
+        self.host = host
+        self.breaker = CircuitBreaker()
+        self._registry = registry
+        self._latencies: dict[tuple[str, str], LatencyEstimator] = {}
+        self._lock = Lock()
+
+    def _timeout(self: Self, call: tuple[str, str]) -> float:
+        """Get timeout of the next attempt.
+
+        Args:
+            self (Self): self
+            call (tuple[str, str]): JSON-RPC methods and path of the call
+
+        Returns:
+            float: timeout, in seconds
+
+        Raises:
+            CircuitOpenError: the switch failed too many calls in a row.
+            DeadlineExceededError: the run deadline is exceeded.
+        """
+        policy = self._registry.policy
+        remaining = self._registry.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(self.host, "run deadline exceeded")
+        with self._lock:
+            if not self.breaker.allow(policy):
+                msg = f"circuit open after {self.breaker.failures} consecutive failures"
+                raise CircuitOpenError(self.host, msg)
+            timeout = self._latencies.setdefault(call, LatencyEstimator()).timeout(policy)
+        return timeout if remaining is None else min(timeout, remaining)
+
+    def _success(self: Self, call: tuple[str, str], latency: float) -> None:
+        """Record a successful attempt.
+
+        Args:
+            self (Self): self
+            call (tuple[str, str]): JSON-RPC methods and path of the call
+            latency (float): attempt duration, in seconds
+        """
+        with self._lock:
+            self.breaker.success()
+            self._latencies[call].update(latency)
+
+    def _failure(self: Self, call: tuple[str, str], error: SRClientError, attempt: int) -> float | None:
+        """Record a failed attempt.
+
+        Args:
+            self (Self): self
+            call (tuple[str, str]): JSON-RPC methods and path of the call
+            error (SRClientError): failure
+            attempt (int): attempt number, starting at 0
+
+        Returns:
+            float | None: delay before the next attempt, None if the call must not be retried
+        """
+        policy = self._registry.policy
+        if not error.retryable:
+            # the switch answered, it is reachable.
+            with self._lock:
+                self.breaker.success()
+            return None
+        with self._lock:
+            self.breaker.failure(policy)
+            if isinstance(error, RPCTimeoutError):
+                self._latencies[call].timed_out()
+            if self.breaker.is_open:
+                return None
+        method, _path = call
+        if attempt + 1 >= policy.attempts or not IDEMPOTENT_METHODS.issuperset(method.split("+")):
+            return None
+        delay = random.uniform(0, min(policy.max_backoff, policy.backoff * 2**attempt))  # noqa: S311
+        remaining = self._registry.remaining()
+        if remaining is not None and remaining <= delay:
+            return None
+        return delay
+
+    def call[R](self: Self, query: dict | list[dict], send: Callable[[float], R]) -> R:
+        """Send a call, retrying it if allowed.
+
+        Args:
+            self (Self): self
+            query (dict | list[dict]): query or batch of queries
+            send (Callable[[float], R]): send an attempt with a timeout, raise SRClientError on failure
+
+        Returns:
+            R: result of the first successful attempt
+        """
+        call = describe_query(query)
+        attempt = 0
+        while True:
+            timeout = self._timeout(call)
+            start = time.perf_counter()
+            try:
+                result = send(timeout)
+            except SRClientError as exc:
+                delay = self._failure(call, exc, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._success(call, time.perf_counter() - start)
+            return result
+
+    async def acall[R](self: Self, query: dict | list[dict], send: Callable[[float], Awaitable[R]]) -> R:
+        """Send a call from an event loop, retrying it if allowed.
+
+        Args:
+            self (Self): self
+            query (dict | list[dict]): query or batch of queries
+            send (Callable[[float], Awaitable[R]]): send an attempt with a timeout, raise SRClientError
+                on failure
+
+        Returns:
+            R: result of the first successful attempt
+        """
+        call = describe_query(query)
+        attempt = 0
+        while True:
+            timeout = self._timeout(call)
+            start = time.perf_counter()
+            try:
+                result = await send(timeout)
+            except SRClientError as exc:
+                delay = self._failure(call, exc, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._success(call, time.perf_counter() - start)
+            return result
+
+
+@dataclass
+class RPCGuard:
+    """Guards of every switch, sharing the retry policy and the deadline of the run."""
+
+    policy: RetryPolicy = field(default_factory=RetryPolicy)
+    deadline: float | None = None
+    _guards: dict[str, DeviceGuard] = field(default_factory=dict, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def start(self: Self, seconds: float | None) -> None:
+        """Start the run deadline.
+
+        Args:
+            self (Self): self
+            seconds (float | None): run duration, unbounded if None
+        """
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self: Self) -> float | None:
+        """Get time left before the run deadline.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            float | None: remaining time, in seconds, None if the run is unbounded
+        """
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def device(self: Self, host: str) -> DeviceGuard:
+        """Get guard of a switch, create it if needed.
+
+        Args:
+            self (Self): self
+            host (str): switch endpoint
+
+        Returns:
+            DeviceGuard: guard
+        """
+        with self._lock:
+            if host not in self._guards:
+                self._guards[host] = DeviceGuard(host, self)
+            return self._guards[host]
+
+
+rpc_guard = RPCGuard()
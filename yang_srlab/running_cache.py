@@ -0,0 +1,111 @@
+"""Cache running configuration of the switches on disk.
+
+Collecting ``/`` is the most expensive call of a run, the collected configuration is stored on disk
+along with the identity of the last configuration change of the switch. On the next run, only this
+identity is read from the switch state, the full configuration is collected again if it changed.
+
+Cached configurations are only read from disk when a phase needs them, a run that ends before the
+diff, or that skips every switch, does not parse them.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Self
+
+from .yang import SRClient
+
+# state leaf updated by the switch on each commit.
+COMMIT_IDENTITY_PATH = "/system/configuration/last-change"
+
+
+def _cache_key(host: str) -> str:
+    """Get file name used for a host.
+
+    Args:
+        host (str): host
+
+    Returns:
+        str: file name without extension
+    """
+    return re.sub(r"[^\w.-]", "_", host)
+
+
+class RunningSnapshot:
+    """Running configuration stored on disk, loaded when needed."""
+
+    def __init__(self: Self, path: Path) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            path (Path): path of the configuration file.
+        """
+        self._path = path
+
+    def load(self: Self) -> dict:
+        """Load configuration.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            dict: running configuration
+        """
+        return json.loads(self._path.read_bytes())
+
+
+class RunningConfigCache:
+    """Store running configuration of the switches, indexed by their last configuration change."""
+
+    def __init__(self: Self, directory: Path) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            directory (Path): cache directory
+        """
+        self._directory = directory / "running"
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _commit_identity(client: SRClient) -> str | None:
+        """Get identity of the last configuration change of a switch.
+
+        Args:
+            client (SRClient): switch client
+
+        Returns:
+            str | None: identity, None if the switch does not expose it
+        """
+        response = client.get_state(COMMIT_IDENTITY_PATH)
+        if "result" not in response or not response["result"]:
+            return None
+        return json.dumps(response["result"][0], sort_keys=True)
+
+    def get(self: Self, client: SRClient, host: str) -> RunningSnapshot | dict:
+        """Get running configuration, from the cache if the switch config did not change.
+
+        Args:
+            self (Self): self
+            client (SRClient): switch client
+            host (str): switch host
+
+        Returns:
+            RunningSnapshot | dict: running configuration, as a snapshot if it can be cached.
+        """
+        identity = self._commit_identity(client)
+        config_path = self._directory / f"{_cache_key(host)}.json"
+        identity_path = self._directory / f"{_cache_key(host)}.id"
+        if identity is None:
+            return client.get_running_config("/")
+        if config_path.exists() and identity_path.exists() and identity_path.read_text() == identity:
+            return RunningSnapshot(config_path)
+
+        config = client.get_running_config("/")
+        tmp_path = config_path.with_suffix(".tmp")
+        with tmp_path.open("w") as f:
+            json.dump(config, f)
+        tmp_path.replace(config_path)
+        identity_path.write_text(identity)
+        return RunningSnapshot(config_path)
@@ -0,0 +1,100 @@
+"""Select the metamodel entities read by a set of switches.
+
+A run targeting a few switches only needs their fabric, the ports of the selected leafs, with their
+templates and clients, and the DCI switch list. DCI switches are connected to the spines of every
+fabric, selecting one of them keeps every fabric, without their ports.
+
+Entities are selected on the raw configuration, before validation, so that unrelated fabrics, ports,
+templates and clients are never validated nor resolved.
+"""
+
+from collections.abc import Collection
+
+
+def _switch_names(raw_fabric: dict) -> set[str]:
+    """Get names of the switches of a raw fabric.
+
+    Args:
+        raw_fabric (dict): raw fabric
+
+    Returns:
+        set[str]: spine and leaf names
+    """
+    return {switch["name"] for switch in [*raw_fabric.get("spines", []), *raw_fabric.get("lifs", [])]}
+
+
+def _port_switches(raw_port: dict) -> set[int]:
+    """Get leaf identifiers of a raw port.
+
+    Args:
+        raw_port (dict): raw port
+
+    Returns:
+        set[int]: leaf identifiers, a single one unless the port is a LAG shared by two leafs
+    """
+    switches = raw_port["sw"]
+    return {switches} if isinstance(switches, int) else set(switches)
+
+
+def select_fabric(raw_fabric: dict, hosts: Collection[str]) -> dict:
+    """Keep only the ports of the selected leafs in a raw fabric.
+
+    Args:
+        raw_fabric (dict): raw fabric
+        hosts (Collection[str]): selected switch names
+
+    Returns:
+        dict: raw fabric, ports of other leafs removed
+    """
+    leaf_ids = {leaf["id"] for leaf in raw_fabric.get("lifs", []) if leaf["name"] in hosts}
+    ports = [port for port in raw_fabric.get("ports", []) if _port_switches(port) & leaf_ids]
+    return {**raw_fabric, "ports": ports}
+
+
+def fabric_selected(raw_fabric: dict, hosts: Collection[str]) -> bool:
+    """Check if a raw fabric holds one of the selected switches.
+
+    Args:
+        raw_fabric (dict): raw fabric
+        hosts (Collection[str]): selected switch names
+
+    Returns:
+        bool: true if a spine or leaf of the fabric is selected
+    """
+    return not _switch_names(raw_fabric).isdisjoint(hosts)
+
+
+def dci_selected(raw_dci: list[dict], hosts: Collection[str]) -> bool:
+    """Check if a DCI switch is selected.
+
+    Args:
+        raw_dci (list[dict]): raw DCI switches
+        hosts (Collection[str]): selected switch names
+
+    Returns:
+        bool: true if a DCI switch is selected, every fabric is then needed
+    """
+    return any(dci["name"] in hosts for dci in raw_dci)
+
+
+def select_raw(raw: dict, hosts: Collection[str]) -> dict:
+    """Keep only the entities read by the selected switches in a raw metamodel.
+
+    Args:
+        raw (dict): raw metamodel, as read from the configuration file
+        hosts (Collection[str]): selected switch names
+
+    Returns:
+        dict: raw metamodel holding the selected entities
+    """
+    with_dci = dci_selected(raw.get("dci", []), hosts)
+    fabrics = [
+        select_fabric(raw_fabric, hosts)
+        for raw_fabric in raw.get("fabrics", [])
+        if with_dci or fabric_selected(raw_fabric, hosts)
+    ]
+    template_names = {port["tpl"] for raw_fabric in fabrics for port in raw_fabric["ports"]}
+    templates = [template for template in raw.get("templates", []) if template["name"] in template_names]
+    client_names = {client for template in templates for client in template.get("clients", [])}
+    clients = {name: client for name, client in raw.get("clients", {}).items() if name in client_names}
+    return {**raw, "fabrics": fabrics, "templates": templates, "clients": clients}
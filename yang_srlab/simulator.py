@@ -0,0 +1,595 @@
+"""Simulate SR Linux JSON-RPC endpoints.
+
+Each simulated device listens on its own localhost port and keeps its running configuration in memory.
+The ``get``, ``diff``, ``validate`` and ``set`` methods are implemented on ``/jsonrpc``, batches
+included, along with the commit identity leaf used by the running config cache. Latency, jitter,
+errors and slow commits can be injected to exercise the push pipeline without lab devices.
+
+Paths are resolved ignoring YANG module prefixes, update merges containers and replaces lists.
+"""
+
+import asyncio
+import copy
+import difflib
+import json
+import random
+import threading
+from argparse import ArgumentParser, Namespace
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from functools import partial
+from typing import Self
+
+from .delta import strip_prefix
+from .running_cache import COMMIT_IDENTITY_PATH
+
+_HTTP_REASONS = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}
+
+type PathSegment = tuple[str, dict[str, str]]
+
+
+def split_path(path: str) -> list[PathSegment]:
+    """Split a JSON-RPC path into nodes.
+
+    Args:
+        path (str): path, ``/interface[name=ethernet-1/1]/description`` for example.
+
+    Returns:
+        list[PathSegment]: node names, with the list keys of each node.
+    """
+    segments: list[str] = []
+    current = ""
+    depth = 0
+    for char in path:
+        if char == "/" and depth == 0:
+            if current:
+                segments.append(current)
+            current = ""
+            continue
+        depth += (char == "[") - (char == "]")
+        current += char
+    if current:
+        segments.append(current)
+
+    nodes: list[PathSegment] = []
+    for segment in segments:
+        name, _sep, raw_keys = segment.partition("[")
+        keys = {}
+        for raw_key in f"[{raw_keys}".split("[")[1:] if raw_keys else []:
+            key, _sep, value = raw_key.rstrip("]").partition("=")
+            keys[strip_prefix(key)] = value
+        nodes.append((strip_prefix(name), keys))
+    return nodes
+
+
+def _child_key(node: dict, name: str) -> str | None:
+    """Find a child of a container, ignoring module prefixes.
+
+    Args:
+        node (dict): container
+        name (str): child name, without prefix
+
+    Returns:
+        str | None: child key, None if missing.
+    """
+    for key in node:
+        if strip_prefix(key) == name:
+            return key
+    return None
+
+
+def _entry_index(entries: list, keys: dict[str, str]) -> int | None:
+    """Find a list entry by its keys.
+
+    Args:
+        entries (list): list entries
+        keys (dict[str, str]): key leaves
+
+    Returns:
+        int | None: entry index, None if missing.
+    """
+    for index, entry in enumerate(entries):
+        values = {strip_prefix(key): strip_prefix(str(value)) for key, value in entry.items()}
+        if all(values.get(key) == strip_prefix(value) for key, value in keys.items()):
+            return index
+    return None
+
+
+def _merge(running: object, value: object) -> object:
+    """Merge a value into a node.
+
+    Args:
+        running (object): current node
+        value (object): value to merge
+
+    Returns:
+        object: merged node
+    """
+    if not isinstance(running, dict) or not isinstance(value, dict):
+        return copy.deepcopy(value)
+    for key, child in value.items():
+        running_key = _child_key(running, strip_prefix(key)) or key
+        running[running_key] = _merge(running.get(running_key), child)
+    return running
+
+
+def lookup(root: dict, path: str) -> object | None:
+    """Get a node of a datastore.
+
+    Args:
+        root (dict): datastore
+        path (str): node path
+
+    Returns:
+        object | None: node, None if missing.
+    """
+    node: object = root
+    for name, keys in split_path(path):
+        if not isinstance(node, dict) or (key := _child_key(node, name)) is None:
+            return None
+        node = node[key]
+        if keys:
+            if not isinstance(node, list) or (index := _entry_index(node, keys)) is None:
+                return None
+            node = node[index]
+    return node
+
+
+def _container(root: dict, segments: list[PathSegment], *, create: bool) -> dict | None:
+    """Get the container holding the last node of a path.
+
+    Args:
+        root (dict): datastore
+        segments (list[PathSegment]): path nodes
+        create (bool): create missing containers and list entries
+
+    Returns:
+        dict | None: container, None if missing and not created.
+    """
+    node = root
+    for name, keys in segments[:-1]:
+        key = _child_key(node, name)
+        if key is None:
+            if not create:
+                return None
+            key = name
+            node[key] = [] if keys else {}
+        child = node[key]
+        if keys:
+            index = _entry_index(child, keys)
+            if index is None:
+                if not create:
+                    return None
+                child.append(dict(keys))
+                index = len(child) - 1
+            child = child[index]
+        node = child
+    return node
+
+
+def _slot(container: dict, segment: PathSegment, *, create: bool) -> tuple[dict | list, str | int] | None:
+    """Get the slot of a node inside its container.
+
+    Args:
+        container (dict): container holding the node
+        segment (PathSegment): node name and list keys
+        create (bool): create the node if missing
+
+    Returns:
+        tuple[dict | list, str | int] | None: parent and key or index of the node, None if missing and
+            not created.
+    """
+    name, keys = segment
+    key = _child_key(container, name)
+    if key is None:
+        if not create:
+            return None
+        key = name
+        container[key] = [] if keys else None
+    if not keys:
+        return container, key
+    entries = container[key]
+    index = _entry_index(entries, keys)
+    if index is None:
+        if not create:
+            return None
+        entries.append(dict(keys))
+        index = len(entries) - 1
+    return entries, index
+
+
+def apply_command(root: dict, command: dict) -> None:
+    """Apply a JSON-RPC command to a datastore.
+
+    Args:
+        root (dict): datastore
+        command (dict): ``replace``, ``update`` or ``delete`` command
+    """
+    action = command["action"]
+    segments = split_path(command["path"])
+    if not segments:
+        if action != "update":
+            root.clear()
+        if action != "delete":
+            _merge(root, command["value"])
+        return
+
+    container = _container(root, segments, create=action != "delete")
+    slot = _slot(container, segments[-1], create=action != "delete") if container is not None else None
+    if slot is None:
+        return
+    parent, key = slot
+    if action == "delete":
+        del parent[key]  # type: ignore[arg-type]
+    elif action == "update":
+        parent[key] = _merge(parent[key], command["value"])  # type: ignore[index]
+    else:
+        parent[key] = copy.deepcopy(command["value"])  # type: ignore[index]
+
+
+@dataclass
+class FaultProfile:
+    """Faults injected by simulated devices."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    commit_delay: float = 0.0
+
+
+@dataclass
+class SimulatedDevice:
+    """In memory SR Linux device."""
+
+    name: str
+    faults: FaultProfile = field(default_factory=FaultProfile)
+    running: dict = field(default_factory=dict)
+    last_change: str = ""
+    commits: int = 0
+    requests: int = 0
+    rng: random.Random = field(default_factory=random.Random)
+
+    def _candidate(self: Self, commands: list[dict]) -> dict:
+        """Apply commands on a copy of the running configuration.
+
+        Args:
+            self (Self): self
+            commands (list[dict]): commands
+
+        Returns:
+            dict: candidate configuration
+        """
+        candidate = copy.deepcopy(self.running)
+        for command in commands:
+            apply_command(candidate, command)
+        return candidate
+
+    def _get(self: Self, commands: list[dict]) -> list:
+        """Read datastore paths.
+
+        Args:
+            self (Self): self
+            commands (list[dict]): get commands
+
+        Returns:
+            list: one value per command
+        """
+        results: list[object] = []
+        for command in commands:
+            if command.get("datastore") == "state" and command["path"] == COMMIT_IDENTITY_PATH:
+                results.append(self.last_change)
+                continue
+            value = lookup(self.running, command["path"])
+            results.append({} if value is None else copy.deepcopy(value))
+        return results
+
+    def _diff(self: Self, commands: list[dict]) -> list:
+        """Diff candidate against running configuration.
+
+        Args:
+            self (Self): self
+            commands (list[dict]): commands
+
+        Returns:
+            list: unified diff, empty if nothing changes
+        """
+        running = json.dumps(self.running, indent=2, sort_keys=True).splitlines()
+        candidate = json.dumps(self._candidate(commands), indent=2, sort_keys=True).splitlines()
+        diff = "\n".join(difflib.unified_diff(running, candidate, "running", "candidate", lineterm=""))
+        return [diff] if diff else []
+
+    async def _set(self: Self, commands: list[dict]) -> list:
+        """Commit commands into the running configuration.
+
+        Args:
+            self (Self): self
+            commands (list[dict]): commands
+
+        Returns:
+            list: commit result
+        """
+        candidate = self._candidate(commands)
+        if self.faults.commit_delay:
+            await asyncio.sleep(self.faults.commit_delay)
+        self.running = candidate
+        self.commits += 1
+        self.last_change = datetime.now(UTC).isoformat()
+        return [{}]
+
+    async def call(self: Self, query: dict) -> dict:
+        """Answer a single JSON-RPC query.
+
+        Args:
+            self (Self): self
+            query (dict): query
+
+        Returns:
+            dict: response
+        """
+        if not isinstance(query, dict):
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "query is not an object"}}
+        response: dict = {"jsonrpc": "2.0", "id": query.get("id")}
+        method = query.get("method")
+        commands = query.get("params", {}).get("commands", [])
+        if self.faults.error_rate and self.rng.random() < self.faults.error_rate:
+            response["error"] = {"code": -32000, "message": f"injected error on {self.name}"}
+            return response
+        try:
+            if method == "get":
+                response["result"] = self._get(commands)
+            elif method == "diff":
+                response["result"] = self._diff(commands)
+            elif method == "validate":
+                self._candidate(commands)
+                response["result"] = [{}]
+            elif method == "set":
+                response["result"] = await self._set(commands)
+            else:
+                response["error"] = {"code": -32601, "message": f"unknown method {method}"}
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError) as exc:
+            # commands not matching the datastore are rejected, the connection is kept open.
+            response["error"] = {"code": -32602, "message": f"invalid command on {self.name}: {exc!r}"}
+        return response
+
+    async def handle(self: Self, body: bytes) -> bytes:
+        """Answer a JSON-RPC request, single query or batch.
+
+        Args:
+            self (Self): self
+            body (bytes): request body
+
+        Returns:
+            bytes: response body
+        """
+        self.requests += 1
+        delay = self.faults.latency + self.rng.uniform(0, self.faults.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            request = json.loads(body)
+        except ValueError as exc:
+            error = {"code": -32700, "message": f"invalid JSON on {self.name}: {exc}"}
+            return json.dumps({"jsonrpc": "2.0", "id": None, "error": error}).encode()
+        if isinstance(request, list):
+            return json.dumps([await self.call(query) for query in request]).encode()
+        return json.dumps(await self.call(request)).encode()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, dict[str, str], bytes] | None:
+    """Read an HTTP request.
+
+    Args:
+        reader (asyncio.StreamReader): connection reader
+
+    Returns:
+        tuple[str, str, dict[str, str], bytes] | None: method, target, headers and body, None once the
+            connection is closed.
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+    method, target, _version = request_line.split(" ", 2)
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _sep, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", "0")))
+    return method, target, headers, body
+
+
+class Simulator:
+    """Fleet of simulated devices, each one listening on its own port."""
+
+    def __init__(
+        self: Self,
+        count: int,
+        *,
+        host: str = "127.0.0.1",
+        base_port: int = 0,
+        faults: FaultProfile | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            count (int): number of devices
+            host (str, optional): listening address. Defaults to "127.0.0.1".
+            base_port (int, optional): port of the first device, next devices use the following ports.
+                Ports are picked by the system if 0. Defaults to 0.
+            faults (FaultProfile | None, optional): injected faults. Defaults to None.
+            seed (int | None, optional): seed of the fault injection. Defaults to None.
+        """
+        self._host = host
+        self._base_port = base_port
+        rng = random.Random(seed)  # noqa: S311
+        self.devices = [
+            SimulatedDevice(f"sim{index}", faults or FaultProfile(), rng=random.Random(rng.random()))  # noqa: S311
+            for index in range(count)
+        ]
+        self.ports: list[int] = []
+        self._servers: list[asyncio.Server] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def endpoints(self: Self) -> list[str]:
+        """Get JSON-RPC endpoints of the devices.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            list[str]: ``host:port`` of each device
+        """
+        return [f"{self._host}:{port}" for port in self.ports]
+
+    async def _serve(
+        self: Self,
+        device: SimulatedDevice,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Serve a connection, kept alive between requests.
+
+        Args:
+            self (Self): self
+            device (SimulatedDevice): device behind the port
+            reader (asyncio.StreamReader): connection reader
+            writer (asyncio.StreamWriter): connection writer
+        """
+        try:
+            while (request := await _read_request(reader)) is not None:
+                method, target, headers, body = request
+                status = 200
+                if target.split("?")[0] != "/jsonrpc":
+                    status, payload = 404, b""
+                elif method != "POST":
+                    status, payload = 405, b""
+                else:
+                    payload = await device.handle(body)
+                writer.write(
+                    f"HTTP/1.1 {status} {_HTTP_REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload,
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        finally:
+            writer.close()
+
+    async def start(self: Self) -> None:
+        """Start listening on every device port.
+
+        Args:
+            self (Self): self
+        """
+        for index, device in enumerate(self.devices):
+            port = self._base_port + index if self._base_port else 0
+            server = await asyncio.start_server(
+                partial(self._serve, device),
+                self._host,
+                port,
+            )
+            self._servers.append(server)
+            self.ports.append(server.sockets[0].getsockname()[1])
+
+    async def close(self: Self) -> None:
+        """Stop listening.
+
+        Args:
+            self (Self): self
+        """
+        for server in self._servers:
+            server.close()
+            # kept alive client connections would hold wait_closed forever.
+            server.close_clients()
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+
+    def start_in_thread(self: Self) -> None:
+        """Serve devices from a background thread, returns once every port is listening.
+
+        Args:
+            self (Self): self
+        """
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def _run() -> None:
+            if self._loop is None:
+                return
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=_run, name="srl-simulator", daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop_thread(self: Self) -> None:
+        """Stop serving from the background thread.
+
+        Args:
+            self (Self): self
+        """
+        if self._loop is None or self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+
+
+def parse_args() -> Namespace:
+    """Parse configuration.
+
+    Returns:
+        Namespace: parsed config.
+    """
+    args = ArgumentParser("SR Linux JSON-RPC simulator")
+    args.add_argument("--count", "-n", type=int, default=1, help="Number of simulated devices")
+    args.add_argument("--host", default="127.0.0.1", help="Listening address")
+    args.add_argument("--base-port", type=int, default=20000, help="Port of the first device")
+    args.add_argument("--latency", type=float, default=0.0, help="Added latency per request, in seconds")
+    args.add_argument("--jitter", type=float, default=0.0, help="Random latency added on top, in seconds")
+    args.add_argument("--error-rate", type=float, default=0.0, help="Probability of a query to fail")
+    args.add_argument("--commit-delay", type=float, default=0.0, help="Duration of a commit, in seconds")
+    args.add_argument("--seed", type=int, default=None, help="Seed of the fault injection")
+    return args.parse_args()
+
+
+async def _serve_forever(simulator: Simulator) -> None:
+    """Serve devices until cancelled.
+
+    Args:
+        simulator (Simulator): simulator
+    """
+    await simulator.start()
+    print(f"{len(simulator.ports)} devices listening on {simulator.endpoints[0]} and following ports")  # noqa: T201
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.close()
+
+
+def main() -> None:
+    """Simulator entrypoint."""
+    args = parse_args()
+    faults = FaultProfile(args.latency, args.jitter, args.error_rate, args.commit_delay)
+    simulator = Simulator(args.count, host=args.host, base_port=args.base_port, faults=faults, seed=args.seed)
+    with suppress(KeyboardInterrupt):
+        asyncio.run(_serve_forever(simulator))
+
+
+if __name__ == "__main__":
+    main()
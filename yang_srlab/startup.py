@@ -0,0 +1,72 @@
+"""Measure CLI startup phases."""
+
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+@dataclass
+class StartupPhase:
+    """Duration of a startup phase."""
+
+    name: str
+    duration: float
+    modules: int
+
+
+class StartupProfile:
+    """Record startup phases."""
+
+    def __init__(self: Self) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+        """
+        self.phases: list[StartupPhase] = []
+
+    @contextmanager
+    def phase(self: Self, name: str) -> Iterator[None]:
+        """Measure a startup phase.
+
+        Args:
+            self (Self): self
+            name (str): phase name
+
+        Yields:
+            Iterator[None]: phase context
+        """
+        modules = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append(StartupPhase(name, time.perf_counter() - start, len(sys.modules) - modules))
+
+    def report(self: Self, console: "Console") -> None:
+        """Print startup phases.
+
+        Args:
+            self (Self): self
+            console (Console): rich console object used for printing
+        """
+        from rich.table import Table
+
+        table = Table(title="Startup profile")
+        table.add_column("Phase")
+        table.add_column("Duration", justify="right")
+        table.add_column("Imported modules", justify="right")
+        for phase in self.phases:
+            table.add_row(phase.name, f"{phase.duration * 1000:.1f}ms", str(phase.modules))
+        table.add_row(
+            "total",
+            f"{sum(phase.duration for phase in self.phases) * 1000:.1f}ms",
+            str(sum(phase.modules for phase in self.phases)),
+        )
+        console.print(table)
@@ -23,4 +23,4 @@ def set_creedentials(sto: ComputeContainer) -> None:
     """Set credentials for users."""
     sto.container.password = sto.switch.password
     sto.container.username = sto.switch.username
-    sto.container.address = str(sto.switch.address)
+    sto.container.address = sto.switch.endpoint
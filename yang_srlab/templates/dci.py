@@ -28,13 +28,10 @@ def compute_interface(sto: ComputeContainer) -> None:
         sto (ComputeContainer): sto
     """
     leaf_id = 0
-    dci_id = sto.switch.config.dci.index(sto.switch)
+    dci_id = sto.switch.position.index
     for fabric in sto.switch.config.fabrics:
-        subnet = list(fabric.pool.dci.subnets(new_prefix=31))
-        subnet_count = len(subnet) // 2
         for spine_id, spine in enumerate(fabric.spines):
-            subnet_index = subnet_count * dci_id + spine_id
-            address = list(subnet[subnet_index].hosts())[1]
+            _spine_address, address = fabric.pool.ipam.spine_dci_link(dci_id, spine_id)
             leaf_id += 1
             iface = f"ethernet-1/{leaf_id}"
 
@@ -17,21 +17,14 @@ def compute_spine_link(sto: ComputeContainer) -> None:
     """
     container = sto.container
     spines = sto.switch.fabric.spines
-    lifs = sto.switch.fabric.lifs
-    links = sto.switch.fabric.pool.links
-    loopbacks = sto.switch.fabric.pool.loopbacks
+    leaf_index = sto.switch.position.index
+    ipam = sto.switch.fabric.pool.ipam
 
-    for spine_index, spine in enumerate(sto.switch.fabric.spines):
+    for spine_index, spine in enumerate(spines):
         port_index = len(container.interfaces.interfaces) - len(spines) + spine_index
         port_name = f"ethernet-1/{port_index+1}"
         port = container.interfaces.interfaces[port_name]
-        leaf_index = lifs.index(sto.switch)  # type: ignore[arg-type]
-
-        subnet = list(links.subnets(new_prefix=31))
-        subnet_count = len(subnet) // len(spines)
-        subnet_index = subnet_count * spine_index + leaf_index
-        leaf_spine_subnet = subnet[subnet_index]
-        leaf_spine_interface = list(leaf_spine_subnet.hosts())[1]
+        _spine_interface, leaf_spine_interface = ipam.leaf_spine_link(spine_index, leaf_index)
 
         port.description = f"{spine.name} ethernet-1/{leaf_index+1}"
         port.admin_state = True
@@ -42,8 +35,7 @@ def compute_spine_link(sto: ComputeContainer) -> None:
         # add port to routing instance
         container.router.interfaces.append(f"{port_name}.0")
         # add evpn peer
-        spine_loopback = list(loopbacks.hosts())[spine_index]
-        container.router.evpn_peers[spine.name] = spine_loopback
+        container.router.evpn_peers[spine.name] = ipam.spine_loopback(spine_index)
 
 
 @template_group("leaf")
@@ -53,15 +45,11 @@ def compute_loopback(sto: ComputeContainer) -> None:
     Args:
         sto (ComputeContainer): container.
     """
-    lifs = sto.switch.fabric.lifs
-    loopbacks = sto.switch.fabric.pool.loopbacks
-
     iface = Interface("system0")
     sto.container.interfaces.interfaces[iface.name] = iface
 
-    leaf_index = lifs.index(sto.switch)  # type: ignore[arg-type]
-    subnet = list(loopbacks.hosts())
-    loopback = subnet[32 + leaf_index]
+    leaf_index = sto.switch.position.index
+    loopback = sto.switch.fabric.pool.ipam.leaf_loopback(leaf_index)
 
     iface.admin_state = True
     iface.kind = InterfaceKind.L3
@@ -126,7 +114,7 @@ def compute_system_id(sto: ComputeContainer) -> None:
     Args:
         sto (ComputeContainer): container
     """
-    leaf_id = sto.switch.fabric.lifs.index(sto.switch)  # type: ignore[arg-type]
+    leaf_id = sto.switch.position.index
     if leaf_id % 2 == 1:
         leaf_id -= 1
 
@@ -15,21 +15,14 @@ def compute_downlinks(sto: ComputeContainer) -> None:
         sto (ComputeContainer): container.
     """
     lifs = sto.switch.fabric.lifs
-    spines = sto.switch.fabric.spines
-    links = sto.switch.fabric.pool.links
-    loopbacks = sto.switch.fabric.pool.loopbacks
+    spine_index = sto.switch.position.index
+    ipam = sto.switch.fabric.pool.ipam
 
     for leaf_index, leaf in enumerate(lifs):
         port_index = leaf_index
         port_name = f"ethernet-1/{port_index+1}"
         port = sto.container.interfaces.interfaces[port_name]
-        spine_index = spines.index(sto.switch)
-
-        subnet = list(links.subnets(new_prefix=31))
-        subnet_count = len(subnet) // len(spines)
-        subnet_index = subnet_count * spine_index + leaf_index
-        leaf_spine_subnet = subnet[subnet_index]
-        leaf_spine_interface = list(leaf_spine_subnet.hosts())[0]
+        leaf_spine_interface, _leaf_interface = ipam.leaf_spine_link(spine_index, leaf_index)
 
         port.description = f"{leaf.name} ethernet-1/{20-spine_index-1}"
         port.admin_state = True
@@ -40,8 +33,7 @@ def compute_downlinks(sto: ComputeContainer) -> None:
         # add port to routing interface
         sto.container.router.interfaces.append(f"{port_name}.0")
         # add evpn peer
-        leaf_loopback = list(loopbacks.hosts())[32 + leaf_index]
-        sto.container.router.evpn_peers[leaf.name] = leaf_loopback
+        sto.container.router.evpn_peers[leaf.name] = ipam.leaf_loopback(leaf_index)
 
 
 @template_group("spine")
@@ -51,15 +43,11 @@ def compute_loopback(sto: ComputeContainer) -> None:
     Args:
         sto (ComputeContainer): container.
     """
-    spines = sto.switch.fabric.spines
-    loopbacks = sto.switch.fabric.pool.loopbacks
-
     iface = Interface("system0")
     sto.container.interfaces.interfaces[iface.name] = iface
 
-    spine_index = spines.index(sto.switch)
-    subnet = list(loopbacks.hosts())
-    loopback = subnet[spine_index]
+    spine_index = sto.switch.position.index
+    loopback = sto.switch.fabric.pool.ipam.spine_loopback(spine_index)
 
     iface.admin_state = True
     iface.kind = InterfaceKind.L3
@@ -79,20 +67,15 @@ def compute_dci(sto: ComputeContainer) -> None:
     Args:
         sto (ComputeContainer): storage.
     """
-    spines = sto.switch.fabric.spines
-    links = sto.switch.fabric.pool.dci
-    spine_index = spines.index(sto.switch)
+    ipam = sto.switch.fabric.pool.ipam
+    spine_index = sto.switch.position.index
 
     for i in range(2):
         port_index = 19 + i
         port_name = f"ethernet-1/{port_index}"
         port = sto.container.interfaces.interfaces[port_name]
 
-        subnet = list(links.subnets(new_prefix=31))
-        subnet_count = len(subnet) // 2
-        subnet_index = subnet_count * i + spine_index
-        spine_dci_subnet = subnet[subnet_index]
-        spine_subnet_interface = list(spine_dci_subnet.hosts())[0]
+        spine_subnet_interface, _dci_interface = ipam.spine_dci_link(i, spine_index)
 
         port.description = f"DCI_{i + 1} ethernet-1/{spine_index + 1}"
         port.admin_state = True
@@ -0,0 +1,185 @@
+"""Measure time spent in templates.
+
+Recording is disabled by default, template functions are then called without any measurement. Once
+enabled, wall and CPU time of every template function call are recorded along with the switch being
+computed.
+"""
+
+import json
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter, thread_time
+from typing import TYPE_CHECKING, Self
+
+from .manifest import function_ref
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+@dataclass
+class TemplateTiming:
+    """Duration of a template function call."""
+
+    template: str
+    switch: str
+    wall: float
+    cpu: float
+
+
+@dataclass
+class TemplateHotspot:
+    """Duration of a template function, summed over every switch."""
+
+    template: str
+    calls: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    slowest_switch: str = ""
+    slowest_wall: float = 0.0
+
+
+class TimingRecorder:
+    """Record template function timings."""
+
+    def __init__(self: Self) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+        """
+        self.enabled = False
+        self.records: list[TemplateTiming] = []
+        self._switch = ""
+
+    @contextmanager
+    def switch(self: Self, name: str) -> Iterator[None]:
+        """Attribute the templates run in this context to a switch.
+
+        Args:
+            self (Self): self
+            name (str): switch name
+
+        Yields:
+            Iterator[None]: switch context
+        """
+        previous, self._switch = self._switch, name
+        try:
+            yield
+        finally:
+            self._switch = previous
+
+    def run[T](self: Self, functions: Iterable[Callable[[T], None]], instance: T) -> None:
+        """Call template functions, timing them if recording is enabled.
+
+        Args:
+            self (Self): self
+            functions (Iterable[Callable[[T], None]]): template functions
+            instance (T): argument of the template functions
+        """
+        if not self.enabled:
+            for func in functions:
+                func(instance)
+            return
+        for func in functions:
+            wall, cpu = perf_counter(), thread_time()
+            func(instance)
+            self.records.append(
+                TemplateTiming(function_ref(func), self._switch, perf_counter() - wall, thread_time() - cpu),
+            )
+
+    def collect(self: Self) -> list[TemplateTiming]:
+        """Take the records, used to send worker process records back.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            list[TemplateTiming]: records taken
+        """
+        records, self.records = self.records, []
+        return records
+
+    def hotspots(self: Self, top: int | None = None) -> list[TemplateHotspot]:
+        """Get template functions, slowest first.
+
+        Args:
+            self (Self): self
+            top (int | None, optional): number of functions to return, all if not set. Defaults to None.
+
+        Returns:
+            list[TemplateHotspot]: functions durations
+        """
+        hotspots: dict[str, TemplateHotspot] = {}
+        for record in self.records:
+            hotspot = hotspots.setdefault(record.template, TemplateHotspot(record.template))
+            hotspot.calls += 1
+            hotspot.wall += record.wall
+            hotspot.cpu += record.cpu
+            if record.wall >= hotspot.slowest_wall:
+                hotspot.slowest_switch, hotspot.slowest_wall = record.switch, record.wall
+        return sorted(hotspots.values(), key=lambda hotspot: hotspot.wall, reverse=True)[:top]
+
+    def switches(self: Self, top: int | None = None) -> list[tuple[str, float, float]]:
+        """Get switches, slowest first.
+
+        Args:
+            self (Self): self
+            top (int | None, optional): number of switches to return, all if not set. Defaults to None.
+
+        Returns:
+            list[tuple[str, float, float]]: switch name, wall and CPU time spent in its templates
+        """
+        switches: dict[str, tuple[float, float]] = {}
+        for record in self.records:
+            wall, cpu = switches.get(record.switch, (0.0, 0.0))
+            switches[record.switch] = (wall + record.wall, cpu + record.cpu)
+        ordered = sorted(switches.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return [(switch, wall, cpu) for switch, (wall, cpu) in ordered]
+
+    def write(self: Self, path: Path, top: int | None = None) -> None:
+        """Write timings as JSON.
+
+        Args:
+            self (Self): self
+            path (Path): output file
+            top (int | None, optional): number of hotspots and switches to write, all if not set.
+                Defaults to None.
+        """
+        document = {
+            "hotspots": [asdict(hotspot) for hotspot in self.hotspots(top)],
+            "switches": [{"switch": switch, "wall": wall, "cpu": cpu} for switch, wall, cpu in self.switches(top)],
+            "records": [asdict(record) for record in self.records],
+        }
+        path.write_text(json.dumps(document, indent=2))
+
+    def report(self: Self, console: "Console", top: int | None = None) -> None:
+        """Print template hotspots.
+
+        Args:
+            self (Self): self
+            console (Console): rich console object used for printing
+            top (int | None, optional): number of hotspots to print, all if not set. Defaults to None.
+        """
+        from rich.table import Table
+
+        table = Table(title="Template hotspots")
+        table.add_column("Template")
+        table.add_column("Calls", justify="right")
+        table.add_column("Wall", justify="right")
+        table.add_column("CPU", justify="right")
+        table.add_column("Slowest switch")
+        for hotspot in self.hotspots(top):
+            table.add_row(
+                hotspot.template,
+                str(hotspot.calls),
+                f"{hotspot.wall * 1000:.1f}ms",
+                f"{hotspot.cpu * 1000:.1f}ms",
+                f"{hotspot.slowest_switch} ({hotspot.slowest_wall * 1000:.1f}ms)",
+            )
+        console.print(table)
+
+
+timings = TimingRecorder()
@@ -0,0 +1,83 @@
+"""Index switch positions inside the fabrics.
+
+Templates need the role and position of a switch inside its fabric, looking for it inside the fabric
+switch lists costs a linear scan on each call. The index is built once when the metamodel is loaded.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from .metamodel import Fabric, Metamodel, Switch
+
+
+class SwitchRole(Enum):
+    """Describe switch role."""
+
+    leaf = "leaf"
+    spine = "spine"
+    dci = "dci"
+
+
+@dataclass
+class SwitchPosition:
+    """Position of a switch in the topology."""
+
+    role: SwitchRole
+    index: int
+    fabric: Fabric | None
+    peers: list[Switch] = field(default_factory=list)
+
+
+class TopologyIndex:
+    """Position of every switch, indexed by switch name."""
+
+    def __init__(self: Self, model: Metamodel) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            model (Metamodel): metamodel to index
+        """
+        self._positions: dict[str, SwitchPosition] = {}
+        all_spines: list[Switch] = []
+        for fabric in model.fabrics:
+            all_spines += fabric.spines
+            for leaf_index, leaf in enumerate(fabric.lifs):
+                self._positions[leaf.name] = SwitchPosition(SwitchRole.leaf, leaf_index, fabric, list(fabric.spines))
+            for spine_index, spine in enumerate(fabric.spines):
+                self._positions[spine.name] = SwitchPosition(
+                    SwitchRole.spine,
+                    spine_index,
+                    fabric,
+                    [*fabric.lifs, *model.dci],
+                )
+        for dci_index, dci in enumerate(model.dci):
+            self._positions[dci.name] = SwitchPosition(SwitchRole.dci, dci_index, None, all_spines)
+
+    def __getitem__(self: Self, name: str) -> SwitchPosition:
+        """Get switch position.
+
+        Args:
+            self (Self): self
+            name (str): switch name
+
+        Returns:
+            SwitchPosition: position of the switch
+        """
+        return self._positions[name]
+
+    def __contains__(self: Self, name: object) -> bool:
+        """Check if a switch is indexed.
+
+        Args:
+            self (Self): self
+            name (object): switch name
+
+        Returns:
+            bool: true if the switch is part of the topology
+        """
+        return name in self._positions
@@ -0,0 +1,246 @@
+"""Trace JSON-RPC calls.
+
+Tracing is disabled by default. Once enabled, every JSON-RPC request sent to a switch produces a span
+holding its latency, payload sizes and status, written as one JSON line per call. Spans are tagged
+with the push phase running when the request was sent.
+"""
+
+import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from math import ceil
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Self, TextIO
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+@dataclass
+class Span:
+    """JSON-RPC call."""
+
+    switch: str
+    method: str
+    path: str
+    phase: str
+    start: float
+    duration: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    status: str = "ok"
+
+
+@dataclass
+class LatencySummary:
+    """Latency percentiles of a group of spans."""
+
+    name: str
+    calls: int
+    errors: int
+    percentiles: tuple[float, ...]
+    slowest: float
+
+
+def describe_query(query: dict | list[dict]) -> tuple[str, str]:
+    """Get method and path of a query.
+
+    Args:
+        query (dict | list[dict]): query or batch of queries
+
+    Returns:
+        tuple[str, str]: methods, joined by ``+`` for batches, and path of the first command
+    """
+    queries = query if isinstance(query, list) else [query]
+    method = "+".join(item.get("method", "") for item in queries)
+    commands = [command for item in queries for command in item.get("params", {}).get("commands", [])]
+    return method, commands[0].get("path", "") if commands else ""
+
+
+def response_status(status_code: int, response: object) -> str:
+    """Get span status of a response.
+
+    Args:
+        status_code (int): HTTP status code
+        response (object): decoded response, a batch response is a list
+
+    Returns:
+        str: ``ok``, ``error`` if any query failed or the HTTP status if not successful
+    """
+    if status_code >= 400:  # noqa: PLR2004
+        return f"http {status_code}"
+    responses = response if isinstance(response, list) else [response]
+    if any(isinstance(item, dict) and "error" in item for item in responses):
+        return "error"
+    return "ok"
+
+
+def _percentile(durations: list[float], percentile: float) -> float:
+    """Get percentile of sorted durations, nearest rank.
+
+    Args:
+        durations (list[float]): sorted durations
+        percentile (float): percentile, between 0 and 1
+
+    Returns:
+        float: duration
+    """
+    return durations[max(ceil(percentile * len(durations)) - 1, 0)]
+
+
+class SpanTracer:
+    """Record JSON-RPC spans."""
+
+    def __init__(self: Self) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+        """
+        self.enabled = False
+        self.spans: list[Span] = []
+        self._phase = ""
+        self._output: TextIO | None = None
+        self._lock = Lock()
+
+    def open(self: Self, path: Path) -> None:
+        """Enable tracing, spans are written to a JSONL file.
+
+        Args:
+            self (Self): self
+            path (Path): output file
+        """
+        self._output = path.open("w")
+        self.enabled = True
+
+    def close(self: Self) -> None:
+        """Disable tracing and close the output file.
+
+        Args:
+            self (Self): self
+        """
+        self.enabled = False
+        if self._output is not None:
+            self._output.close()
+            self._output = None
+
+    @contextmanager
+    def phase(self: Self, name: str) -> Iterator[None]:
+        """Tag spans recorded in this context with a phase.
+
+        Phases are run one after the other, the phase is shared by every worker thread.
+
+        Args:
+            self (Self): self
+            name (str): phase name
+
+        Yields:
+            Iterator[None]: phase context
+        """
+        previous, self._phase = self._phase, name
+        try:
+            yield
+        finally:
+            self._phase = previous
+
+    @contextmanager
+    def span(self: Self, switch: str, query: dict | list[dict], request_bytes: int) -> Iterator[Span]:
+        """Time a JSON-RPC call, the caller completes the response fields.
+
+        Args:
+            self (Self): self
+            switch (str): switch endpoint
+            query (dict | list[dict]): query or batch of queries
+            request_bytes (int): size of the encoded query
+
+        Yields:
+            Iterator[Span]: span of the call
+        """
+        method, path = describe_query(query)
+        span = Span(switch, method, path, self._phase, time.time(), request_bytes=request_bytes)
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as exc:
+            span.status = type(exc).__name__
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            self.record(span)
+
+    def record(self: Self, span: Span) -> None:
+        """Record a span.
+
+        Args:
+            self (Self): self
+            span (Span): span
+        """
+        with self._lock:
+            self.spans.append(span)
+            if self._output is not None:
+                self._output.write(json.dumps(asdict(span)) + "\n")
+
+    def summary(self: Self, by: str = "method") -> list[LatencySummary]:
+        """Get latency percentiles.
+
+        Args:
+            self (Self): self
+            by (str, optional): span field grouping spans, ``method`` or ``switch``. Defaults to "method".
+
+        Returns:
+            list[LatencySummary]: latency of each group, slowest p95 first
+        """
+        groups: dict[str, list[Span]] = {}
+        for span in self.spans:
+            groups.setdefault(getattr(span, by), []).append(span)
+        summaries = []
+        for name, spans in groups.items():
+            durations = sorted(span.duration for span in spans)
+            summaries.append(
+                LatencySummary(
+                    name,
+                    len(spans),
+                    sum(1 for span in spans if span.status != "ok"),
+                    tuple(_percentile(durations, percentile) for percentile in PERCENTILES),
+                    durations[-1],
+                ),
+            )
+        return sorted(summaries, key=lambda summary: summary.percentiles[1], reverse=True)
+
+    def report(self: Self, console: "Console", top_switches: int = 10) -> None:
+        """Print latency percentiles per method, and the slowest switches.
+
+        Args:
+            self (Self): self
+            console (Console): rich console object used for printing
+            top_switches (int, optional): number of switches to print. Defaults to 10.
+        """
+        from rich.table import Table
+
+        for title, by, top in (
+            ("RPC latency per method", "method", None),
+            ("Slowest switches", "switch", top_switches),
+        ):
+            table = Table(title=title)
+            table.add_column(by.capitalize())
+            table.add_column("Calls", justify="right")
+            table.add_column("Errors", justify="right")
+            for percentile in PERCENTILES:
+                table.add_column(f"p{percentile * 100:g}", justify="right")
+            table.add_column("max", justify="right")
+            for summary in self.summary(by)[:top]:
+                table.add_row(
+                    summary.name,
+                    str(summary.calls),
+                    str(summary.errors),
+                    *(f"{duration * 1000:.1f}ms" for duration in (*summary.percentiles, summary.slowest)),
+                )
+            console.print(table)
+
+
+tracer = SpanTracer()
@@ -1,13 +1,165 @@
 """Define yang access."""
 
+import asyncio
+import atexit
+import json
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import partial
+from threading import Lock
+from types import TracebackType
 from typing import Self
 
-from requests import Session
+import httpx
+import requests
+from pydantic_core import from_json
+
+from .resilience import RPCTimeoutError, SRClientError, rpc_guard
+from .tracing import response_status, tracer
+
+
+def _build_query(method: str, commands: list[dict], query_id: str | None = None) -> dict:
+    """Build a JSON-RPC query.
+
+    Args:
+        method (str): JSON-RPC method
+        commands (list[dict]): commands to send with the method
+        query_id (str | None, optional): query identifier, current timestamp if not set. Defaults to None.
+
+    Returns:
+        dict: JSON-RPC query
+    """
+    return {
+        "jsonrpc": "2.0",
+        "id": datetime.now(tz=UTC).isoformat() if query_id is None else query_id,
+        "method": method,
+        "params": {"commands": commands},
+    }
+
+
+def _build_batch(calls: list[tuple[str, list[dict]]]) -> list[dict]:
+    """Build a JSON-RPC batch, every query get a distinct identifier.
+
+    Args:
+        calls (list[tuple[str, list[dict]]]): method and commands of each query
+
+    Returns:
+        list[dict]: JSON-RPC batch
+    """
+    timestamp = datetime.now(tz=UTC).isoformat()
+    return [_build_query(method, commands, f"{timestamp}-{index}") for index, (method, commands) in enumerate(calls)]
+
+
+def _demux_batch(queries: list[dict], responses: list[dict] | dict) -> list[dict]:
+    """Match batch responses with their queries.
+
+    Args:
+        queries (list[dict]): queries sent
+        responses (list[dict] | dict): responses received, a single object is received when the whole
+            batch is rejected
+
+    Returns:
+        list[dict]: responses in the same order than the queries
+    """
+    if isinstance(responses, dict):
+        return [responses for _query in queries]
+    by_id = {response.get("id"): response for response in responses}
+    missing = {"error": {"message": "no response received for this query"}}
+    return [by_id.get(query["id"], missing) for query in queries]
+
+
+def _replace_command(path: str, data: dict) -> list[dict]:
+    """Build the command list replacing a path with data.
+
+    Args:
+        path (str): path to replace
+        data (dict): data to set on the path
+
+    Returns:
+        list[dict]: commands
+    """
+    return [{"action": "replace", "path": path, "value": data}]
+
+
+def _get_command(path: str, datastore: str = "running") -> list[dict]:
+    """Build the command list getting a path.
+
+    Args:
+        path (str): path to get
+        datastore (str, optional): datastore to read. Defaults to "running".
+
+    Returns:
+        list[dict]: commands
+    """
+    return [{"path": path, "datastore": datastore}]
+
+
+def _decode_response(host: str, status_code: int, content: bytes) -> dict:
+    """Decode a JSON-RPC response.
+
+    Args:
+        host (str): switch endpoint
+        status_code (int): HTTP status code
+        content (bytes): response body
+
+    Returns:
+        dict: decoded response, a list for batches
+
+    Raises:
+        SRClientError: server error or undecodable response.
+    """
+    if status_code >= 500:  # noqa: PLR2004
+        raise SRClientError(host, f"HTTP {status_code}", retryable=True)
+    try:
+        return from_json(content)
+    except ValueError as exc:
+        raise SRClientError(host, f"invalid response, HTTP {status_code}") from exc
+
+
+def _results(host: str, response: dict) -> list:
+    """Get results of a response.
+
+    Args:
+        host (str): switch endpoint
+        response (dict): decoded response
+
+    Returns:
+        list: result of each command
+
+    Raises:
+        SRClientError: the switch returned an error.
+    """
+    if "result" not in response:
+        raise SRClientError(host, response.get("error", {}).get("message", "no result in response"))
+    return response["result"]
+
+
+@dataclass
+class ConnectionStats:
+    """Connection usage of a client."""
+
+    requests: int = 0
+    connections: int = 0
+
+    @property
+    def reused(self: Self) -> int:
+        """Get number of requests sent over an already opened connection.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            int: number of reused connections
+        """
+        return max(self.requests - self.connections, 0)
 
 
 class SRClient:
-    """Define srclient."""
+    """Define srclient.
+
+    Calls are sent through the guard of the switch, see ``resilience``: they fail with SRClientError
+    once their timeouts, retries or the run deadline are exhausted.
+    """
 
     def __init__(self: Self, host: str, username: str, password: str) -> None:
         """Constructor.
@@ -18,9 +170,119 @@ class SRClient:
             username (str): username
             password (str): password
         """
+        self._host = host
         self._url = f"http://{host}/jsonrpc"
-        self._client = Session()
+        self._client = requests.Session()
         self._client.auth = (username, password)
+        self._client.headers["Content-Type"] = "application/json"
+        self._guard = rpc_guard.device(host)
+        self._requests = 0
+
+    def _post(self: Self, query: dict | list[dict]) -> dict:
+        """Post a JSON-RPC query.
+
+        Args:
+            self (Self): self
+            query (dict | list[dict]): query or batch of queries to post
+
+        Returns:
+            dict: decoded response
+        """
+        payload = json.dumps(query).encode()
+        return self._guard.call(query, partial(self._attempt, query, payload))
+
+    def _attempt(self: Self, query: dict | list[dict], payload: bytes, timeout: float) -> dict:
+        """Send an encoded JSON-RPC query once.
+
+        Args:
+            self (Self): self
+            query (dict | list[dict]): query or batch of queries
+            payload (bytes): encoded query
+            timeout (float): timeout, in seconds
+
+        Returns:
+            dict: decoded response
+        """
+        self._requests += 1
+        if not tracer.enabled:
+            response = self._send(payload, timeout)
+            return _decode_response(self._host, response.status_code, response.content)
+        with tracer.span(self._host, query, len(payload)) as span:
+            response = self._send(payload, timeout)
+            span.response_bytes = len(response.content)
+            result = _decode_response(self._host, response.status_code, response.content)
+            span.status = response_status(response.status_code, result)
+        return result
+
+    def _send(self: Self, payload: bytes, timeout: float) -> requests.Response:
+        """Post an encoded JSON-RPC query.
+
+        Args:
+            self (Self): self
+            payload (bytes): encoded query
+            timeout (float): timeout, in seconds
+
+        Returns:
+            requests.Response: response
+
+        Raises:
+            RPCTimeoutError: no response received in time.
+            SRClientError: the switch cannot be reached.
+        """
+        try:
+            return self._client.post(self._url, data=payload, timeout=timeout)
+        except requests.Timeout as exc:
+            raise RPCTimeoutError(self._host, f"no response after {timeout:.1f}s", retryable=True) from exc
+        except requests.RequestException as exc:
+            raise SRClientError(self._host, str(exc), retryable=True) from exc
+
+    def batch(self: Self, calls: list[tuple[str, list[dict]]]) -> list[dict]:
+        """Send several methods in a single request.
+
+        Args:
+            self (Self): self
+            calls (list[tuple[str, list[dict]]]): method and commands of each query
+
+        Returns:
+            list[dict]: responses, in the same order than the calls
+        """
+        queries = _build_batch(calls)
+        return _demux_batch(queries, self._post(queries))
+
+    @property
+    def stats(self: Self) -> ConnectionStats:
+        """Get connection usage of this client.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            ConnectionStats: number of requests sent and connections opened
+        """
+        pools = self._client.get_adapter(self._url).poolmanager.pools  # type: ignore[attr-defined]
+        connections = sum(pools[key].num_connections for key in pools.keys())  # noqa: SIM118
+        return ConnectionStats(self._requests, connections)
+
+    def close(self: Self) -> None:
+        """Close opened connections.
+
+        Args:
+            self (Self): self
+        """
+        self._client.close()
+
+    def execute(self: Self, method: str, commands: list[dict]) -> dict:
+        """Execute commands.
+
+        Args:
+            self (Self): self
+            method (str): JSON-RPC method, ``diff``, ``validate`` or ``set``
+            commands (list[dict]): commands to execute
+
+        Returns:
+            dict: response
+        """
+        return self._post(_build_query(method, commands))
 
     def diff(self: Self, path: str, data: dict) -> dict:
         """Get diff from command and path.
@@ -30,14 +292,7 @@ class SRClient:
             path (str): path to where performing the diff
             data (dict): data to compare
         """
-        query = {
-            "jsonrpc": "2.0",
-            "id": datetime.now(tz=UTC).isoformat(),
-            "method": "diff",
-            "params": {"commands": [{"action": "replace", "path": path, "value": data}]},
-        }
-        response = self._client.post(self._url, json=query)
-        return response.json()
+        return self._post(_build_query("diff", _replace_command(path, data)))
 
     def validate(self: Self, path: str, data: dict) -> dict:
         """Validate from command and path.
@@ -47,14 +302,7 @@ class SRClient:
             path (str): path to where performing the diff
             data (dict): data to compare
         """
-        query = {
-            "jsonrpc": "2.0",
-            "id": datetime.now(tz=UTC).isoformat(),
-            "method": "validate",
-            "params": {"commands": [{"action": "replace", "path": path, "value": data}]},
-        }
-        response = self._client.post(self._url, json=query)
-        return response.json()
+        return self._post(_build_query("validate", _replace_command(path, data)))
 
     def commit(self: Self, path: str, data: dict) -> dict:
         """Commit from command and path.
@@ -64,14 +312,7 @@ class SRClient:
             path (str): path to where performing the diff
             data (dict): data to compare
         """
-        query = {
-            "jsonrpc": "2.0",
-            "id": datetime.now(tz=UTC).isoformat(),
-            "method": "set",
-            "params": {"commands": [{"action": "replace", "path": path, "value": data}]},
-        }
-        response = self._client.post(self._url, json=query)
-        return response.json()
+        return self._post(_build_query("set", _replace_command(path, data)))
 
     def get_running_config(self: Self, path: str) -> dict:
         """Get running config.
@@ -83,11 +324,398 @@ class SRClient:
         Returns:
             dict: running_config
         """
-        query = {
-            "jsonrpc": "2.0",
-            "id": datetime.now(tz=UTC).isoformat(),
-            "method": "get",
-            "params": {"commands": [{"path": path, "datastore": "running"}]},
-        }
-        response = self._client.post(self._url, json=query)
-        return response.json()["result"][0]
+        return _results(self._host, self._post(_build_query("get", _get_command(path))))[0]
+
+    def get_running_configs(self: Self, paths: list[str]) -> list[dict]:
+        """Get running config of several paths in a single request.
+
+        Args:
+            self (Self): self
+            paths (list[str]): paths to get
+
+        Returns:
+            list[dict]: running config of each path
+        """
+        commands = [command for path in paths for command in _get_command(path)]
+        return _results(self._host, self._post(_build_query("get", commands)))
+
+    def get_state(self: Self, path: str) -> dict:
+        """Get state of a path.
+
+        Args:
+            self (Self): self
+            path (str): path to get
+
+        Returns:
+            dict: response, with the state in result if the path exists
+        """
+        return self._post(_build_query("get", _get_command(path, "state")))
+
+    def diff_and_validate(self: Self, path: str, data: dict) -> tuple[dict, dict]:
+        """Get diff and validate in a single request.
+
+        The data is sent once per method, this saves a round trip at the cost of uploading it twice.
+
+        Args:
+            self (Self): self
+            path (str): path to where performing the diff
+            data (dict): data to compare
+
+        Returns:
+            tuple[dict, dict]: diff and validate responses
+        """
+        commands = _replace_command(path, data)
+        diff, validate = self.batch([("diff", commands), ("validate", commands)])
+        return diff, validate
+
+
+class SRClientRegistry:
+    """Keep one SRClient per switch so that connections are reused between phases."""
+
+    def __init__(self: Self) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+        """
+        self._clients: dict[tuple[str, str, str], SRClient] = {}
+        self._lock = Lock()
+
+    def get(self: Self, host: str, username: str, password: str) -> SRClient:
+        """Get client associated with a switch, create it if needed.
+
+        Args:
+            self (Self): self
+            host (str): host
+            username (str): username
+            password (str): password
+
+        Returns:
+            SRClient: client
+        """
+        key = (host, username, password)
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = SRClient(host, username, password)
+            return self._clients[key]
+
+    def stats(self: Self) -> dict[str, ConnectionStats]:
+        """Get connection usage per host.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            dict[str, ConnectionStats]: connection usage indexed by host
+        """
+        stats: dict[str, ConnectionStats] = {}
+        with self._lock:
+            for (host, _username, _password), client in self._clients.items():
+                client_stats = client.stats
+                host_stats = stats.setdefault(host, ConnectionStats())
+                host_stats.requests += client_stats.requests
+                host_stats.connections += client_stats.connections
+        return stats
+
+    def close(self: Self) -> None:
+        """Close every client.
+
+        Args:
+            self (Self): self
+        """
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+srclients = SRClientRegistry()
+atexit.register(srclients.close)
+
+
+class AsyncSRSession:
+    """Connection pool shared between several AsyncSRClient.
+
+    A single pool is meant to be shared by every switch driven from the same event loop. Connections are
+    kept alive between calls, and the number of requests in flight toward a host, hence of connections
+    it uses, is bounded.
+    """
+
+    def __init__(
+        self: Self,
+        *,
+        max_connections: int = 512,
+        max_connections_per_host: int = 2,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            max_connections (int, optional): maximum number of opened connections. Defaults to 512.
+            max_connections_per_host (int, optional): maximum number of connections used at once toward
+                a host. Defaults to 2.
+            keepalive_expiry (float, optional): idle time before closing a kept alive connection.
+                Defaults to 30.0.
+            http2 (bool, optional): negotiate HTTP/2, the h2 package must be installed. Defaults to False.
+        """
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client = httpx.AsyncClient(limits=limits, http2=http2)
+        self._max_connections_per_host = max_connections_per_host
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self.requests = 0
+
+    async def post(self: Self, host: str, auth: tuple[str, str], query: dict | list[dict]) -> dict:
+        """Post a JSON-RPC query.
+
+        Args:
+            self (Self): self
+            host (str): switch endpoint
+            auth (tuple[str, str]): credentials
+            query (dict | list[dict]): query or batch of queries to post
+
+        Returns:
+            dict: decoded response
+        """
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self._max_connections_per_host)
+        payload = json.dumps(query).encode()
+        return await rpc_guard.device(host).acall(query, partial(self._attempt, host, auth, query, payload))
+
+    async def _attempt(
+        self: Self,
+        host: str,
+        auth: tuple[str, str],
+        query: dict | list[dict],
+        payload: bytes,
+        timeout: float,  # noqa: ASYNC109
+    ) -> dict:
+        """Send an encoded JSON-RPC query once, the host slot is released between attempts.
+
+        Args:
+            self (Self): self
+            host (str): switch endpoint
+            auth (tuple[str, str]): credentials
+            query (dict | list[dict]): query or batch of queries
+            payload (bytes): encoded query
+            timeout (float): timeout, in seconds
+
+        Returns:
+            dict: decoded response
+        """
+        async with self._host_slots[host]:
+            self.requests += 1
+            if not tracer.enabled:
+                response = await self._send(host, auth, payload, timeout)
+                return _decode_response(host, response.status_code, response.content)
+            with tracer.span(host, query, len(payload)) as span:
+                response = await self._send(host, auth, payload, timeout)
+                span.response_bytes = len(response.content)
+                result = _decode_response(host, response.status_code, response.content)
+                span.status = response_status(response.status_code, result)
+        return result
+
+    async def _send(
+        self: Self,
+        host: str,
+        auth: tuple[str, str],
+        payload: bytes,
+        timeout: float,  # noqa: ASYNC109
+    ) -> httpx.Response:
+        """Post an encoded JSON-RPC query.
+
+        Args:
+            self (Self): self
+            host (str): switch endpoint
+            auth (tuple[str, str]): credentials
+            payload (bytes): encoded query
+            timeout (float): timeout, in seconds
+
+        Returns:
+            httpx.Response: response
+
+        Raises:
+            RPCTimeoutError: no response received in time.
+            SRClientError: the switch cannot be reached.
+        """
+        try:
+            return await self._client.post(
+                f"http://{host}/jsonrpc",
+                content=payload,
+                headers={"Content-Type": "application/json"},
+                auth=auth,
+                timeout=timeout,
+            )
+        except httpx.TimeoutException as exc:
+            raise RPCTimeoutError(host, f"no response after {timeout:.1f}s", retryable=True) from exc
+        except httpx.TransportError as exc:
+            raise SRClientError(host, str(exc), retryable=True) from exc
+
+    async def aclose(self: Self) -> None:
+        """Close every pooled connection.
+
+        Args:
+            self (Self): self
+        """
+        await self._client.aclose()
+
+    async def __aenter__(self: Self) -> Self:
+        """Enter context.
+
+        Args:
+            self (Self): self
+
+        Returns:
+            Self: session
+        """
+        return self
+
+    async def __aexit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit context and close connections.
+
+        Args:
+            self (Self): self
+            exc_type (type[BaseException] | None): exception type
+            exc_value (BaseException | None): exception
+            traceback (TracebackType | None): traceback
+        """
+        await self.aclose()
+
+
+class AsyncSRClient:
+    """Define asynchronous srclient, same API than SRClient.
+
+    Calls are sent through the same guard of the switch than SRClient calls.
+    """
+
+    def __init__(self: Self, host: str, username: str, password: str, session: AsyncSRSession) -> None:
+        """Constructor.
+
+        Args:
+            self (Self): self
+            host (str): host
+            username (str): username
+            password (str): password
+            session (AsyncSRSession): connection pool shared with the other switches
+        """
+        self._host = host
+        self._auth = (username, password)
+        self._session = session
+
+    async def _post(self: Self, query: dict | list[dict]) -> dict:
+        """Post a JSON-RPC query.
+
+        Args:
+            self (Self): self
+            query (dict | list[dict]): query or batch of queries to post
+
+        Returns:
+            dict: decoded response
+        """
+        return await self._session.post(self._host, self._auth, query)
+
+    async def batch(self: Self, calls: list[tuple[str, list[dict]]]) -> list[dict]:
+        """Send several methods in a single request.
+
+        Args:
+            self (Self): self
+            calls (list[tuple[str, list[dict]]]): method and commands of each query
+
+        Returns:
+            list[dict]: responses, in the same order than the calls
+        """
+        queries = _build_batch(calls)
+        return _demux_batch(queries, await self._post(queries))
+
+    async def execute(self: Self, method: str, commands: list[dict]) -> dict:
+        """Execute commands.
+
+        Args:
+            self (Self): self
+            method (str): JSON-RPC method, ``diff``, ``validate`` or ``set``
+            commands (list[dict]): commands to execute
+
+        Returns:
+            dict: response
+        """
+        return await self._post(_build_query(method, commands))
+
+    async def diff(self: Self, path: str, data: dict) -> dict:
+        """Get diff from command and path.
+
+        Args:
+            self (Self): self
+            path (str): path to where performing the diff
+            data (dict): data to compare
+        """
+        return await self._post(_build_query("diff", _replace_command(path, data)))
+
+    async def validate(self: Self, path: str, data: dict) -> dict:
+        """Validate from command and path.
+
+        Args:
+            self (Self): self
+            path (str): path to where performing the diff
+            data (dict): data to compare
+        """
+        return await self._post(_build_query("validate", _replace_command(path, data)))
+
+    async def commit(self: Self, path: str, data: dict) -> dict:
+        """Commit from command and path.
+
+        Args:
+            self (Self): self
+            path (str): path to where performing the diff
+            data (dict): data to compare
+        """
+        return await self._post(_build_query("set", _replace_command(path, data)))
+
+    async def get_running_config(self: Self, path: str) -> dict:
+        """Get running config.
+
+        Args:
+            self (Self): self
+            path (str): path to get
+
+        Returns:
+            dict: running_config
+        """
+        return _results(self._host, await self._post(_build_query("get", _get_command(path))))[0]
+
+    async def get_running_configs(self: Self, paths: list[str]) -> list[dict]:
+        """Get running config of several paths in a single request.
+
+        Args:
+            self (Self): self
+            paths (list[str]): paths to get
+
+        Returns:
+            list[dict]: running config of each path
+        """
+        commands = [command for path in paths for command in _get_command(path)]
+        return _results(self._host, await self._post(_build_query("get", commands)))
+
+    async def diff_and_validate(self: Self, path: str, data: dict) -> tuple[dict, dict]:
+        """Get diff and validate in a single request.
+
+        Args:
+            self (Self): self
+            path (str): path to where performing the diff
+            data (dict): data to compare
+
+        Returns:
+            tuple[dict, dict]: diff and validate responses
+        """
+        commands = _replace_command(path, data)
+        diff, validate = await self.batch([("diff", commands), ("validate", commands)])
+        return diff, validate
@@ -1,7 +1,12 @@
-"""Define vendor specific yang models."""
+"""Define vendor specific yang models.
+
+Vendor models are imported by model_from_kind, only when a switch is computed.
+"""
+
+from yang_srlab.manifest import TemplateManifest
 
 from .interface import YangInterafece
-from .srlinux import SRLinuxYang, srlinux_templates
+from .registry import srlinux_templates
 
 
 def model_from_kind(kind: str) -> type[YangInterafece]:
@@ -13,15 +18,18 @@ def model_from_kind(kind: str) -> type[YangInterafece]:
     Returns:
         type[YangInterafece]: yang interface
     """
+    from .srlinux import SRLinuxYang
+
     if kind == "srlinux":
         return SRLinuxYang
     return SRLinuxYang
 
 
-def scan_yang(module: str) -> None:
+def scan_yang(module: str, manifest: TemplateManifest | None = None) -> None:
     """Scan modules for all vendors.
 
     Args:
         module (str): module to scan
+        manifest (TemplateManifest | None, optional): manifest of template packages. Defaults to None.
     """
-    srlinux_templates.scan(f"{module}.srlinux")
+    srlinux_templates.scan(f"{module}.srlinux", manifest)
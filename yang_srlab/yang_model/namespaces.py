@@ -0,0 +1,91 @@
+"""Strip YANG module prefixes from srlinux documents.
+
+Module names are collected once from the field aliases and identities of the pydantic_srlinux models,
+every prefix is then stripped by a single compiled pattern. The models are imported on the first strip.
+"""
+
+import re
+from enum import Enum
+from functools import cache
+from typing import get_args
+
+from pydantic import BaseModel
+
+
+def _module_name(name: object) -> str | None:
+    """Get YANG module of a prefixed name.
+
+    Args:
+        name (object): node name or identity, ``srl_nokia-interfaces:interface`` for example.
+
+    Returns:
+        str | None: module name, None if the name is not prefixed.
+    """
+    if not isinstance(name, str) or ":" not in name:
+        return None
+    return name.split(":", 1)[0]
+
+
+def _collect_modules(annotation: object, modules: set[str], seen: set[type]) -> None:
+    """Collect YANG modules used by a type annotation.
+
+    Args:
+        annotation (object): type annotation
+        modules (set[str]): module names to complete
+        seen (set[type]): classes already visited
+    """
+    for arg in get_args(annotation):
+        _collect_modules(arg, modules, seen)
+    if not isinstance(annotation, type) or annotation in seen:
+        return
+    seen.add(annotation)
+    if issubclass(annotation, Enum):
+        modules.update(module for member in annotation if (module := _module_name(member.value)))
+    elif issubclass(annotation, BaseModel):
+        for field in annotation.model_fields.values():
+            if module := _module_name(field.alias):
+                modules.add(module)
+            _collect_modules(field.annotation, modules, seen)
+
+
+@cache
+def module_names() -> frozenset[str]:
+    """Get YANG modules of the srlinux models.
+
+    Returns:
+        frozenset[str]: module names
+    """
+    from pydantic_srlinux.models.interfaces import Model as InterfacesModel
+    from pydantic_srlinux.models.network_instance import Model as NEModel
+    from pydantic_srlinux.models.routing_policy import Model as RPModel
+    from pydantic_srlinux.models.system import Model as SysModel
+    from pydantic_srlinux.models.tunnel_interfaces import Model as TunnelModel
+
+    modules: set[str] = set()
+    seen: set[type] = set()
+    for model in (NEModel, TunnelModel, InterfacesModel, RPModel, SysModel):
+        _collect_modules(model, modules, seen)
+    return frozenset(modules)
+
+
+@cache
+def _prefix_pattern() -> re.Pattern[str]:
+    """Get pattern matching every module prefix.
+
+    Returns:
+        re.Pattern[str]: compiled pattern
+    """
+    alternatives = "|".join(re.escape(module) for module in sorted(module_names(), key=len, reverse=True))
+    return re.compile(f"(?:{alternatives}):")
+
+
+def strip_module_prefixes(text: str) -> str:
+    """Strip every YANG module prefix from a text.
+
+    Args:
+        text (str): JSON document or diff
+
+    Returns:
+        str: text without module prefixes
+    """
+    return _prefix_pattern().sub("", text)
@@ -0,0 +1,16 @@
+"""Define template groups of the vendor yang models.
+
+Groups are kept apart from the models, so that they are filled and scanned without importing the
+pydantic_srlinux models.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .templates import TemplateGroup
+
+if TYPE_CHECKING:
+    from .srlinux import SRLinuxYang
+
+srlinux_templates: TemplateGroup[SRLinuxYang] = TemplateGroup()
@@ -5,6 +5,8 @@ import pkgutil
 from collections.abc import Callable
 from typing import Generic, Self, TypeVar
 
+from yang_srlab.manifest import TemplateManifest, function_ref, resolve_ref
+from yang_srlab.timings import timings
 from yang_srlab.yang_model.interface import YangInterafece
 
 T = TypeVar("T", bound=YangInterafece)
@@ -20,6 +22,9 @@ class TemplateGroup(Generic[T]):
             self (Self): self.
         """
         self.functions: list[Callable[[T], None]] = []
+        self.packages: list[str] = []
+        # function references read from the manifest, imported on first run.
+        self._lazy_functions: list[str] = []
 
     def register(self: Self, func: Callable[[T], None]) -> Callable[[T], None]:
         """Register callback.
@@ -39,19 +44,35 @@ class TemplateGroup(Generic[T]):
         Args:
             instance (T): _description_
         """
-        for func in self.functions:
-            func(instance)
+        if self._lazy_functions:
+            refs, self._lazy_functions = self._lazy_functions, []
+            functions = [resolve_ref(ref) for ref in refs]
+            # importing the modules registered their functions again through the decorator.
+            self.functions = [func for func in self.functions if function_ref(func) not in refs] + functions
+        timings.run(self.functions, instance)
 
-    def scan(self: Self, package_name: str) -> None:
+    def scan(self: Self, package_name: str, manifest: TemplateManifest | None = None) -> None:
         """Scan module for decorator.
 
         Args:
             self (Self): self
             package_name (str): package to scan
+            manifest (TemplateManifest | None, optional): manifest of template packages, modules are not
+                imported if the package is up to date in the manifest. Defaults to None.
         """
+        if package_name not in self.packages:
+            self.packages.append(package_name)
+        functions = manifest.get(package_name) if manifest is not None else None
+        if functions is not None:
+            self._lazy_functions += functions.get("default", [])
+            return
+
+        registered = len(self.functions)
         package = importlib.import_module(package_name)
         for _loader, module_name, _is_pkg in pkgutil.walk_packages(
             package.__path__,
             package.__name__ + ".",
         ):
             importlib.import_module(module_name)
+        if manifest is not None:
+            manifest.set(package_name, {"default": [function_ref(func) for func in self.functions[registered:]]})